@@ -0,0 +1,261 @@
+# backend/admission.py - Rate limits, concurrency limits and body size caps for expensive routes
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from metrics import ADMISSION_REJECTED
+
+
+class RateLimitedError(Exception):
+    """Raised when a client has used up its request budget for a route."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OverloadedError(Exception):
+    """Raised when a route's concurrency limit is already reached."""
+
+
+class RequestTooLargeError(Exception):
+    """Raised when a declared request body is over the route's size cap."""
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+def _refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class RateLimit:
+    """Up to `burst` requests at once, refilled at `per_minute` requests a minute."""
+
+    def __init__(self, per_minute: float, burst: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst if burst is not None else max(1, math.ceil(per_minute)))
+
+
+class MemoryBucketStore:
+    """
+    Token buckets held in this process, keyed by route and client. Once
+    max_keys clients are tracked the least recently seen are dropped; a
+    dropped bucket comes back full, which only ever errs towards admitting.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit, now: Optional[float] = None) -> float:
+        """Spends one token. Returns 0 if admitted, else the seconds until one is available."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            tokens = _refill(tokens, updated, now, limit.rate, limit.burst)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / limit.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a local SQLite file, so every worker process on the host
+    (gunicorn workers, app.py next to app_async.py) draws from one budget per
+    client. Each take is one short write transaction. If the file stays
+    locked past `timeout`, the bucket is taken from an in-process store
+    instead of failing the request.
+    """
+
+    blocking = True          # take() waits on file I/O; async callers run it in a thread
+    PURGE_EVERY = 1000       # takes between sweeps of idle buckets
+    IDLE_SECONDS = 3600      # a bucket untouched this long is full again and can go
+
+    def __init__(self, db_path: str, timeout: float = 0.05):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._fallback = MemoryBucketStore()
+        self._takes = 0
+        conn = sqlite3.connect(db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        return conn
+
+    def take(self, key: str, limit: RateLimit, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+                tokens = _refill(row[0], row[1], now, limit.rate, limit.burst) if row else limit.burst
+                wait = 0.0
+                if tokens >= 1.0:
+                    tokens -= 1.0
+                else:
+                    wait = (1.0 - tokens) / limit.rate
+                conn.execute('INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                             (key, tokens, now))
+                self._takes += 1
+                if self._takes % self.PURGE_EVERY == 0:
+                    conn.execute('DELETE FROM rate_buckets WHERE updated < ?', (now - self.IDLE_SECONDS,))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.OperationalError as e:
+            print(f"Rate limit store unavailable, using in-process buckets: {e}")
+            return self._fallback.take(key, limit, now)
+        return wait
+
+
+class ConcurrencyLimit:
+    """At most `limit` requests in flight; the rest are turned away rather than queued."""
+
+    def __init__(self, limit: int, name: str = 'default'):
+        self.limit = limit
+        self.name = name
+        self._slots = threading.BoundedSemaphore(limit)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+class AdmissionController:
+    """
+    Decides, before an expensive route does any work, whether to serve it.
+    Per-route settings are keyed by endpoint name:
+
+    - rate_limits: a token bucket per client (user, or IP when signed out);
+      over-budget clients get 429 with Retry-After.
+    - concurrency: routes sharing one ConcurrencyLimit, e.g. every resume
+      analysis route; when it is full new requests get 503 with Retry-After
+      instead of piling up behind the NLP workers.
+    - max_body_bytes: requests declaring a larger Content-Length get 413
+      before the body is read.
+
+    Rejections are cheap and happen up front, so a client hammering one
+    route doesn't lengthen the queue everyone else waits in.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, RateLimit]] = None,
+                 concurrency: Optional[Dict[str, ConcurrencyLimit]] = None,
+                 max_body_bytes: Optional[Dict[str, int]] = None,
+                 store=None, busy_retry_after: float = 2.0, enabled: bool = True):
+        self.rate_limits = rate_limits or {}
+        self.concurrency = concurrency or {}
+        self.max_body_bytes = max_body_bytes or {}
+        self.store = store or MemoryBucketStore()
+        self.busy_retry_after = busy_retry_after
+        self.enabled = enabled
+
+    def admit(self, endpoint: Optional[str], client: str,
+              content_length: Optional[int] = None) -> Optional[ConcurrencyLimit]:
+        """
+        Admits one request or raises RequestTooLargeError, RateLimitedError or
+        OverloadedError. Returns the ConcurrencyLimit slot taken, which the
+        caller must release when the response is finished, or None.
+        """
+        if not self.enabled or endpoint is None:
+            return None
+        max_body = self.max_body_bytes.get(endpoint)
+        if max_body is not None and content_length is not None and content_length > max_body:
+            ADMISSION_REJECTED.labels(endpoint, 'too_large').inc()
+            raise RequestTooLargeError(f"Request body too large (limit {max_body} bytes)")
+        limit = self.rate_limits.get(endpoint)
+        if limit is not None:
+            wait = self.store.take(f"{endpoint}:{client}", limit)
+            if wait > 0:
+                ADMISSION_REJECTED.labels(endpoint, 'rate_limited').inc()
+                raise RateLimitedError("Too many requests, please slow down", wait)
+        slots = self.concurrency.get(endpoint)
+        if slots is not None:
+            if not slots.try_acquire():
+                ADMISSION_REJECTED.labels(endpoint, 'busy').inc()
+                raise OverloadedError("Server is busy, please retry shortly")
+            return slots
+        return None
+
+    def rejection(self, e: Exception) -> Tuple[dict, int, Dict[str, str]]:
+        """(body, status, headers) for an error raised by admit."""
+        if isinstance(e, RequestTooLargeError):
+            return {"error": str(e)}, 413, {}
+        if isinstance(e, RateLimitedError):
+            return {"error": str(e)}, 429, retry_after_header(e.retry_after)
+        return {"error": str(e)}, 503, retry_after_header(self.busy_retry_after)
+
+    def stats(self) -> dict:
+        # Routes sharing a limit are reported once, under the limit's name
+        return {slots.name: {"limit": slots.limit, "in_flight": slots.in_flight}
+                for slots in self.concurrency.values()}
+
+
+ADMISSION_ERRORS = (RequestTooLargeError, RateLimitedError, OverloadedError)
+
+
+def protect_app(app, controller: AdmissionController, client_key: Callable[[], str]):
+    """
+    Runs controller.admit before each Flask request and releases its
+    concurrency slot when the request ends (for streamed responses, once the
+    stream is finished). Register after any before_request that client_key
+    depends on, e.g. the session check that sets g.user_email.
+    """
+    from flask import g, jsonify, request
+
+    @app.before_request
+    def _admit_request():
+        try:
+            g.admission_slot = controller.admit(request.endpoint, client_key(), request.content_length)
+        except ADMISSION_ERRORS as e:
+            body, status, headers = controller.rejection(e)
+            return jsonify(body), status, headers
+        return None
+
+    @app.teardown_request
+    def _release_request(exc):
+        slot = g.pop('admission_slot', None)
+        if slot is not None:
+            slot.release()
@@ -0,0 +1,270 @@
+# backend/api_routes.py - Internship, recommendation, admin and health routes shared by the apps
+#
+# app.py and app_sqlite.py register the Flask routes below with
+# register_shared_routes, passing their own connection getter and
+# placeholder. app_async.py serves the same requests on Starlette and calls
+# the framework-neutral helpers (list_internships, search_internships, ...)
+# so the three apps answer them identically.
+
+import hashlib
+import hmac
+import os
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import metrics
+from bulk_profiles import (FORMATS, ImportBusyError, detect_format, encode_rows, export_columns, export_rows,
+                           read_rows)
+from catalog import query_from_args
+from extractor import current_rss_bytes, model_stats
+from matcher import get_matching_index, split_list_field
+from responses import encode_json, encoded_etag, parse_fields, select_fields
+from search import search_from_args
+
+# The profile columns a live ranking needs
+RANKING_COLUMNS = ('skills', 'internship_mode', 'preferred_industries', 'stipend_requirement')
+
+
+class ApiError(Exception):
+    """An error response: {"error": message} with the given status."""
+
+    def __init__(self, message: str, status: int, headers: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class CatalogBody(NamedTuple):
+    """A catalog response before encoding: build() returns the JSON body for etag."""
+    snapshot: object
+    etag: str
+    build: Callable[[], bytes]
+    total: Optional[int] = None
+
+
+# --- Framework-neutral handling ---
+
+def load_snapshot(catalog):
+    try:
+        return catalog.snapshot()
+    except FileNotFoundError:
+        raise ApiError("Internships data not found", 404)
+    except Exception as e:
+        raise ApiError(f"An error occurred: {str(e)}", 500)
+
+def requested_fields(args, known):
+    # Optional ?fields=id,title,... or ?fields=summary for the card grid
+    try:
+        return parse_fields(args.get('fields'), known)
+    except ValueError as e:
+        raise ApiError(f"Invalid query parameter: {str(e)}", 400)
+
+def query_etag(snapshot, query_string: bytes) -> str:
+    return f"{snapshot.etag}-{hashlib.sha1(query_string).hexdigest()[:16]}"
+
+def list_internships(catalog, args, query_string: bytes) -> CatalogBody:
+    try:
+        query = query_from_args(args)
+    except ValueError as e:
+        raise ApiError(f"Invalid query parameter: {str(e)}", 400)
+    snapshot = load_snapshot(catalog)
+    fields = requested_fields(args, snapshot.fields)
+    if query is None and fields is None:
+        # Unfiltered listing: the bytes serialized when the catalog was loaded
+        return CatalogBody(snapshot, snapshot.etag, lambda: snapshot.body, len(snapshot.internships))
+    items, total = snapshot.query(**(query or {}))
+    return CatalogBody(snapshot, query_etag(snapshot, query_string),
+                       lambda: encode_json(select_fields(items, fields)), total)
+
+def get_internship(catalog, internship_id: int, args, query_string: bytes) -> CatalogBody:
+    snapshot = load_snapshot(catalog)
+    internship = snapshot.by_id.get(internship_id)
+    if internship is None:
+        raise ApiError("Internship not found", 404)
+    fields = requested_fields(args, snapshot.fields)
+    return CatalogBody(snapshot, f"{query_etag(snapshot, query_string)}-{internship_id}",
+                       lambda: encode_json(select_fields([internship], fields)[0]))
+
+def search_internships(catalog, args, query_string: bytes) -> CatalogBody:
+    snapshot = load_snapshot(catalog)
+    fields = requested_fields(args, snapshot.fields | {'searchScore'})
+    try:
+        items, total = search_from_args(snapshot, args)
+    except ValueError as e:
+        raise ApiError(f"Invalid query parameter: {str(e)}", 400)
+    return CatalogBody(snapshot, query_etag(snapshot, query_string),
+                       lambda: encode_json(select_fields(items, fields)), total)
+
+def recommendation_args(args) -> Tuple[str, int, Optional[list]]:
+    """(email, k, skills) from /api/internships/recommended's query string."""
+    user_email = args.get('email')
+    if not user_email:
+        raise ApiError("User email is required", 400)
+    try:
+        k = int(args.get('k', 20))
+    except ValueError:
+        raise ApiError("k must be an integer", 400)
+    # Optional override, e.g. skills just extracted from an uploaded resume
+    return user_email, k, split_list_field(args.get('skills')) or None
+
+def ranking_profile_query(placeholder: str) -> str:
+    return f'SELECT {", ".join(RANKING_COLUMNS)} FROM users WHERE email = {placeholder}'
+
+def rank_live(catalog, profile_row, k: int, skills: Optional[list]) -> list:
+    """Ranks the catalog for a row of ranking_profile_query, when there is no stored ranking to serve."""
+    if not profile_row:
+        raise ApiError("User not found", 404)
+    try:
+        index = get_matching_index(catalog.snapshot())
+    except FileNotFoundError:
+        raise ApiError("Internships data not found", 404)
+    return index.top_k(dict(zip(RANKING_COLUMNS, profile_row)), k=k, skills=skills)
+
+def process_health(startup_seconds: Optional[float], admission) -> dict:
+    return {
+        "pid": os.getpid(),
+        "startup_seconds": startup_seconds,
+        "rss_bytes": current_rss_bytes(),
+        "model": model_stats(),
+        "analyses": admission.stats()
+    }
+
+
+# --- Flask routes ---
+
+def register_shared_routes(app, *, catalog, response_bodies, get_connection: Callable, placeholder: str,
+                           recommendation_store, profile_importer, admission,
+                           pool_health: Callable[[], dict], startup_seconds: Callable[[], Optional[float]]):
+    """
+    Adds the routes below to a Flask app under the same endpoint names the
+    apps' PUBLIC_ENDPOINTS and rate limits refer to. ADMIN_API_TOKEN,
+    IMPORT_MAX_REPORTED_ERRORS and IMPORT_RETRY_AFTER are read from app.config
+    on each request.
+    """
+    from flask import Response, jsonify, request, stream_with_context
+
+    @app.errorhandler(ApiError)
+    def api_error_response(e: ApiError):
+        return jsonify({"error": str(e)}), e.status, e.headers
+
+    def token_required():
+        if not request.headers.get('Authorization'):
+            raise ApiError("Authorization token is missing", 401)
+
+    def catalog_response(result: CatalogBody) -> Response:
+        # Encoded once per ETag and encoding; later requests are served from response_bodies
+        body, encoding = response_bodies.body(result.etag, result.build, request.headers.get('Accept-Encoding'))
+        response = Response(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(encoded_etag(result.etag, encoding))
+        response.last_modified = result.snapshot.last_modified
+        if result.total is not None:
+            response.headers['X-Total-Count'] = str(result.total)
+        return response.make_conditional(request)
+
+    def route(rule, endpoint=None, **options):
+        def register(view):
+            app.add_url_rule(rule, endpoint=endpoint or view.__name__, view_func=view, **options)
+            return view
+        return register
+
+    # --- Internships ---
+
+    @route('/api/internships')
+    def get_internships():
+        token_required()
+        return catalog_response(list_internships(catalog, request.args, request.query_string))
+
+    @route('/api/internships/<int:internship_id>', endpoint='get_internship')
+    def get_internship_route(internship_id):
+        token_required()
+        return catalog_response(get_internship(catalog, internship_id, request.args, request.query_string))
+
+    @route('/api/internships/search', endpoint='search_internships')
+    def search_internships_route():
+        token_required()
+        return catalog_response(search_internships(catalog, request.args, request.query_string))
+
+    @route('/api/internships/recommended')
+    def get_recommended_internships():
+        token_required()
+        user_email, k, skills = recommendation_args(request.args)
+        if skills is None:
+            try:
+                # Precomputed ranking kept fresh by the background refresher
+                stored = recommendation_store.get(user_email, k=k)
+            except FileNotFoundError:
+                raise ApiError("Internships data not found", 404)
+            except ConnectionError as e:
+                raise ApiError(str(e), 500)
+            if stored is not None:
+                return jsonify(stored), 200
+
+        # No stored ranking yet, or a one-off skills override: rank live
+        conn = get_connection()
+        if conn is None:
+            raise ApiError("Database connection failed", 500)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(ranking_profile_query(placeholder), (user_email,))
+            profile = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+        return jsonify(rank_live(catalog, profile, k, skills)), 200
+
+    # --- Bulk profile import / export ---
+
+    def admin_token_required():
+        expected = app.config['ADMIN_API_TOKEN']
+        if not expected:
+            raise ApiError("Admin API is disabled", 404)
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), expected.encode()):
+            raise ApiError("Invalid admin token", 403)
+
+    @route('/api/admin/profiles/import', methods=['POST'])
+    def import_profiles():
+        admin_token_required()
+        upload = request.files.get('file')
+        if upload is None or upload.filename == '':
+            raise ApiError("No file part", 400)
+        try:
+            fmt = detect_format(upload.filename, request.args.get('format'))
+            report = profile_importer.import_rows(read_rows(upload.stream, fmt),
+                                                  max_errors=app.config['IMPORT_MAX_REPORTED_ERRORS'])
+        except ValueError as e:
+            raise ApiError(str(e), 400)
+        except ImportBusyError as e:
+            raise ApiError(str(e), 503, {"Retry-After": str(app.config['IMPORT_RETRY_AFTER'])})
+        except ConnectionError as e:
+            raise ApiError(str(e), 500)
+        return jsonify(report.to_dict()), 200
+
+    @route('/api/admin/profiles/export')
+    def export_profiles():
+        admin_token_required()
+        fmt = request.args.get('format', 'csv')
+        if fmt not in FORMATS:
+            raise ApiError("format must be csv or jsonl", 400)
+        try:
+            columns = export_columns(request.args.get('fields'))
+        except ValueError as e:
+            raise ApiError(str(e), 400)
+        body = encode_rows(export_rows(get_connection, columns, placeholder=placeholder), columns, fmt)
+        return Response(stream_with_context(body), mimetype=FORMATS[fmt],
+                        headers={"Content-Disposition": f"attachment; filename=profiles.{fmt}"})
+
+    # --- Health and metrics ---
+
+    @route('/api/health/db')
+    def get_db_pool_health():
+        return jsonify(pool_health()), 200
+
+    @route('/api/health/nlp')
+    def get_nlp_health():
+        return jsonify(process_health(startup_seconds(), admission)), 200
+
+    @route('/metrics')
+    def get_metrics():
+        return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
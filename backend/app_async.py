@@ -0,0 +1,432 @@
+# backend/app_async.py - ASGI serving mode for app_sqlite.py
+#
+# Run with:  uvicorn app_async:app --host 0.0.0.0 --port 5001
+#
+# Account, quiz, profile, internship and health routes run on the event loop
+# against SQLite through aiosqlite, so a waiting query no longer holds a
+# thread. Single-resume analysis is CPU bound and runs in a process pool.
+# Every other route (batch uploads, background jobs) falls through to
+# app_sqlite's Flask app, which shares the same database, catalog and
+# recommendation store. Requests and responses match app_sqlite.py.
+
+import asyncio
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial, wraps
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+
+import api_routes
+import app_sqlite
+import metrics
+from app_sqlite import (DATABASE, admission, catalog, password_hasher, profile_index, recommendation_store,
+                        response_bodies, resume_caps, sessions)
+from admission import ADMISSION_ERRORS
+from api_routes import (ApiError, CatalogBody, list_internships, process_health, rank_live, ranking_profile_query,
+                        recommendation_args)
+from auth import AuthBusyError, bearer_token, token_hash
+from db_pool import AsyncSQLitePool
+from jobs import _init_worker
+from main import ALL_FIELDS, analyze_resume
+from profiles import preference_tags
+from responses import encode_json, encoded_etag
+
+flask_app = app_sqlite.app
+
+# --- Event loop settings ---
+DB_POOL_SIZE = 8                 # aiosqlite connections, i.e. queries in progress at once
+DB_TIMEOUT = flask_app.config['DB_TIMEOUT']
+RESUME_ANALYSIS_WORKERS = 2      # processes for /api/resume/upload, each loads spaCy once
+SLOW_REQUEST_SECONDS = flask_app.config['SLOW_REQUEST_SECONDS']
+
+db = AsyncSQLitePool(DATABASE, size=DB_POOL_SIZE, timeout=DB_TIMEOUT)
+analysis_pool = None  # created by lifespan, in the process that serves requests
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return encode_json(content)
+
+def jsonify(data, status: int = 200, headers=None) -> JSONResponse:
+    return FastJSONResponse(data, status_code=status, headers=headers)
+
+async def get_json(request: Request):
+    # Like Flask's get_json(silent=True): None instead of an error for a bad body
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+async def json_body(request: Request):
+    # Like Flask's get_json(): 415 unless the body is declared JSON, 400 if it doesn't decode
+    mimetype = request.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if not (mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))):
+        raise ApiError("Request body must be JSON", 415)
+    try:
+        return await request.json()
+    except ValueError:
+        raise ApiError("Failed to decode JSON body", 400)
+
+def auth_busy_response(e: AuthBusyError) -> JSONResponse:
+    return jsonify({"error": str(e)}, 503, {"Retry-After": str(flask_app.config['AUTH_RETRY_AFTER'])})
+
+async def session_email(token: str):
+    hit, email = sessions.cached(token)
+    if hit:
+        return email
+    async with db.connection() as conn:
+        row = await conn.fetchone(sessions.lookup_query, (token_hash(token),))
+    return sessions.remember(token, tuple(row) if row else None)
+
+def session_checked(handler):
+    """app_sqlite's check_session for a route served here."""
+    @wraps(handler)
+    async def wrapper(request: Request):
+        auth_header = request.headers.get('Authorization')
+        if auth_header:
+            token = bearer_token(auth_header)
+            if not token or await session_email(token) is None:
+                return jsonify({"error": "Invalid or expired token"}, 401)
+        return await handler(request)
+    return wrapper
+
+def admitted(handler):
+    """app_sqlite's admission control for a route served here, keyed the same way."""
+    @wraps(handler)
+    async def wrapper(request: Request):
+        token = bearer_token(request.headers.get('Authorization'))
+        email = await session_email(token) if token else None
+        client = f"user:{email}" if email else f"ip:{request.client.host if request.client else None}"
+        length = request.headers.get('Content-Length')
+        admit = partial(admission.admit, handler.__name__, client,
+                        int(length) if length and length.isdigit() else None)
+        try:
+            # A shared SQLiteBucketStore takes a file lock; keep that off the event loop
+            slot = await asyncio.to_thread(admit) if admission.store.blocking else admit()
+        except ADMISSION_ERRORS as e:
+            body, status, headers = admission.rejection(e)
+            return jsonify(body, status, headers)
+        try:
+            return await handler(request)
+        finally:
+            if slot is not None:
+                slot.release()
+    return wrapper
+
+async def sync_profile(conn, email: str):
+    """profile_index.sync for an aiosqlite connection, inside the caller's transaction."""
+    row = await conn.fetchone(profile_index.source_query, (email,))
+    if row is None:
+        return
+    for sql, rows in profile_index.sync_statements(tuple(row)):
+        if rows:
+            await conn.executemany(sql, rows)
+
+
+# --- AUTHENTICATION ENDPOINTS ---
+@admitted
+async def signup(request: Request):
+    data = await get_json(request)
+    if not data or not all(k in data for k in ('name', 'email', 'password')):
+        return jsonify({"error": "Missing required fields"}, 400)
+
+    try:
+        password_hash = await asyncio.wrap_future(password_hasher.hash_async(data['password']))
+    except AuthBusyError as e:
+        return auth_busy_response(e)
+    async with db.connection() as conn:
+        try:
+            await conn.execute(
+                'INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)',
+                (data['name'], data['email'], password_hash)
+            )
+            await sync_profile(conn, data['email'])
+            await conn.execute(*recommendation_store.dirty_statement(data['email']))
+            await conn.commit()
+        except sqlite3.IntegrityError:
+            return jsonify({"error": "User with this email already exists"}, 409)
+    return jsonify({"message": "User created successfully"}, 201)
+
+@admitted
+async def login(request: Request):
+    data = await get_json(request)
+    if not data or not all(k in data for k in ('email', 'password')):
+        return jsonify({"error": "Missing email or password"}, 400)
+
+    async with db.connection() as conn:
+        user = await conn.fetchone('SELECT * FROM users WHERE email = ?', (data['email'],))
+
+    if not user:
+        return jsonify({"error": "Invalid credentials"}, 401)
+    try:
+        valid, new_hash = await asyncio.wrap_future(password_hasher.verify_async(user['password_hash'], data['password']))
+    except AuthBusyError as e:
+        return auth_busy_response(e)
+    if not valid:
+        return jsonify({"error": "Invalid credentials"}, 401)
+
+    token, expires_at, sql, params = sessions.new_session(user['email'])
+    async with db.connection() as conn:
+        if new_hash:
+            await conn.execute('UPDATE users SET password_hash = ? WHERE email = ?', (new_hash, user['email']))
+        await conn.execute(sql, params)
+        await conn.commit()
+    sessions.remember(token, (user['email'], expires_at))
+    return jsonify({
+        "message": "Login successful",
+        "token": token,
+        "name": user['name'],
+        "profile_complete": bool(user['profile_complete']),
+        "quiz_taken": bool(user['internship_mode'])
+    })
+
+@session_checked
+async def submit_quiz(request: Request):
+    if not request.headers.get('Authorization'):
+        return jsonify({"error": "Authorization token is missing"}, 401)
+
+    data = await json_body(request)
+    user_email = data.pop('email', None)
+    if not user_email:
+        return jsonify({"error": "User email is missing"}, 400)
+
+    update_fields = []
+    values = []
+    for key, value in data.items():
+        update_fields.append(f"{key} = ?")
+        values.append(", ".join(value) if isinstance(value, list) else value)
+    update_fields.append("profile_complete = TRUE")
+    values.append(user_email)
+
+    sql_query = f"UPDATE users SET {', '.join(update_fields)} WHERE email = ?"
+    async with db.connection() as conn:
+        try:
+            await conn.execute(sql_query, tuple(values))
+            await sync_profile(conn, user_email)
+            await conn.execute(*recommendation_store.dirty_statement(user_email))
+            await conn.commit()
+        except Exception as e:
+            return jsonify({"error": str(e)}, 500)
+    return jsonify({"message": "Profile updated successfully!"})
+
+# --- PROFILE ENDPOINTS ---
+async def get_profile(request: Request):
+    if not request.headers.get('Authorization'):
+        return jsonify({"error": "Authorization token missing"}, 401)
+
+    user_email = request.query_params.get('email')
+    if not user_email:
+        return jsonify({"error": "User email is required"}, 400)
+
+    async with db.connection() as conn:
+        profile = await conn.fetchone('''SELECT name, email, skills, highest_qualification, field_of_study,
+                     work_experience, work_experience_details, internet_access, languages,
+                     internship_mode, commitment, preferred_industries, preferred_tasks,
+                     stipend_requirement, stay_away, relocation, special_support,
+                     document_readiness, contact_consent, preference_tags FROM users WHERE email = ?''', (user_email,))
+    if not profile:
+        return jsonify({"error": "User not found"}, 404)
+
+    profile_dict = dict(profile)
+    # Computed when the profile was written
+    if profile_dict['preference_tags'] is None:
+        profile_dict['preference_tags'] = preference_tags(profile_dict)
+    return jsonify(profile_dict)
+
+async def update_profile(request: Request):
+    if not request.headers.get('Authorization'):
+        return jsonify({"error": "Authorization token missing"}, 401)
+
+    data = await json_body(request)
+    user_email = data.get('email')
+
+    update_fields = []
+    values = []
+    for key, value in data.items():
+        if key not in ['email', 'preference_tags']:
+            update_fields.append(f"{key} = ?")
+            values.append(value)
+    if not update_fields:
+        return jsonify({"message": "No fields to update"})
+
+    values.append(user_email)
+    sql_query = f"UPDATE users SET {', '.join(update_fields)} WHERE email = ?"
+    async with db.connection() as conn:
+        try:
+            await conn.execute(sql_query, tuple(values))
+            await sync_profile(conn, user_email)
+            await conn.execute(*recommendation_store.dirty_statement(user_email))
+            await conn.commit()
+        except Exception as e:
+            return jsonify({"error": str(e)}, 500)
+    return jsonify({"message": "Profile updated successfully"})
+
+@session_checked
+async def profile(request: Request):
+    if request.method == 'PUT':
+        return await update_profile(request)
+    return await get_profile(request)
+
+# --- RESUME ANALYSIS ENDPOINT ---
+@session_checked
+@admitted
+async def upload_and_analyze_resume(request: Request):
+    if not request.headers.get('Authorization'):
+        return jsonify({"error": "Authorization token is missing"}, 401)
+
+    form = await request.form()
+    if 'resume' not in form:
+        return jsonify({"error": "No file part in the request"}, 400)
+    file = form['resume']
+    if not isinstance(file, UploadFile) or not file.filename:
+        return jsonify({"error": "No selected file"}, 400)
+
+    fields = request.query_params.get('fields')
+    fields = {f.strip() for f in fields.split(',') if f.strip()} if fields else None
+    if fields and not fields <= ALL_FIELDS:
+        return jsonify({"error": f"Unknown fields: {', '.join(sorted(fields - ALL_FIELDS))}"}, 400)
+
+    content = await file.read()
+    loop = asyncio.get_running_loop()
+    try:
+        with metrics.stage('analysis_pool'):
+            data = await loop.run_in_executor(
+                analysis_pool,
+                partial(analyze_resume, content, filename=file.filename, fields=fields, **resume_caps())
+            )
+    except Exception as e:
+        return jsonify({"error": "An error occurred during analysis.", "details": str(e)}, 500)
+    return jsonify(data)
+
+# --- INTERNSHIPS ENDPOINTS ---
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    # Same rules as werkzeug's make_conditional: If-None-Match wins over If-Modified-Since
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        return parse_etags(if_none_match).contains_weak(etag)
+    modified_since = parse_date(request.headers.get('If-Modified-Since'))
+    return modified_since is not None and int(last_modified) <= modified_since.timestamp()
+
+def catalog_response(request: Request, result: CatalogBody) -> Response:
+    """The Flask apps' catalog_response: cached, negotiated encoding plus conditional GET."""
+    body, encoding = response_bodies.body(result.etag, result.build, request.headers.get('Accept-Encoding'))
+    etag = encoded_etag(result.etag, encoding)
+    last_modified = result.snapshot.last_modified
+    headers = {
+        'ETag': quote_etag(etag),
+        'Last-Modified': http_date(last_modified),
+        'Vary': 'Accept-Encoding'
+    }
+    if result.total is not None:
+        headers['X-Total-Count'] = str(result.total)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, media_type='application/json', headers=headers)
+
+def token_required(request: Request):
+    if not request.headers.get('Authorization'):
+        raise ApiError("Authorization token is missing", 401)
+
+@session_checked
+async def get_internships(request: Request):
+    token_required(request)
+    # In memory except right after internships.json changes
+    return catalog_response(request, list_internships(catalog, request.query_params, request.scope['query_string']))
+
+@session_checked
+async def get_internship(request: Request):
+    token_required(request)
+    return catalog_response(request, api_routes.get_internship(
+        catalog, request.path_params['internship_id'], request.query_params, request.scope['query_string']))
+
+@session_checked
+async def search_internships(request: Request):
+    token_required(request)
+    # Off the loop: the first search after a catalog reload re-indexes the changed postings
+    result = await asyncio.to_thread(api_routes.search_internships, catalog, request.query_params,
+                                     request.scope['query_string'])
+    return catalog_response(request, result)
+
+# --- RECOMMENDATIONS ---
+@session_checked
+async def get_recommended_internships(request: Request):
+    token_required(request)
+    user_email, k, skills = recommendation_args(request.query_params)
+
+    async with db.connection() as conn:
+        stored = None
+        if skills is None:
+            stored = await conn.fetchone(recommendation_store.items_query, (user_email,))
+        if stored is None:
+            profile = await conn.fetchone(ranking_profile_query('?'), (user_email,))
+
+    if stored is not None:
+        try:
+            return jsonify(recommendation_store.resolve(stored[0], k))
+        except FileNotFoundError:
+            raise ApiError("Internships data not found", 404)
+    return jsonify(rank_live(catalog, profile, k, skills))
+
+# --- HEALTH AND METRICS ---
+async def get_db_pool_health(request: Request):
+    return jsonify({"pool_size": db.pool_size, **db.metrics.snapshot()})
+
+async def get_nlp_health(request: Request):
+    return jsonify(process_health(app_sqlite.STARTUP_SECONDS, admission))
+
+async def get_metrics(request: Request):
+    return Response(metrics.render(), headers={'Content-Type': metrics.CONTENT_TYPE})
+
+async def api_error_response(request: Request, e: ApiError) -> JSONResponse:
+    return jsonify({"error": str(e)}, e.status, e.headers)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global analysis_pool
+    # Background work starts here rather than when app_sqlite is imported, so
+    # each worker of a pre-fork server starts its own after the fork
+    analysis_pool = ProcessPoolExecutor(max_workers=RESUME_ANALYSIS_WORKERS, initializer=_init_worker)
+    recommendation_store.start()
+    app_sqlite.resume_jobs.start()
+    yield
+    await db.close()
+    analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/signup', signup, methods=['POST']),
+        Route('/api/login', login, methods=['POST']),
+        Route('/api/onboarding', submit_quiz, methods=['POST']),
+        Route('/api/quiz/submit', submit_quiz, methods=['POST']),
+        Route('/api/profile', profile, methods=['GET', 'PUT']),
+        Route('/api/resume/upload', upload_and_analyze_resume, methods=['POST']),
+        Route('/api/internships', get_internships, methods=['GET']),
+        Route('/api/internships/search', search_internships, methods=['GET']),
+        Route('/api/internships/{internship_id:int}', get_internship, methods=['GET']),
+        Route('/api/internships/recommended', get_recommended_internships, methods=['GET']),
+        Route('/api/health/db', get_db_pool_health, methods=['GET']),
+        Route('/api/health/nlp', get_nlp_health, methods=['GET']),
+        Route('/metrics', get_metrics, methods=['GET']),
+        # Everything else is served by the Flask app on a worker thread
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*']),
+        Middleware(metrics.ASGIMetricsMiddleware, slow_request_seconds=SLOW_REQUEST_SECONDS),
+    ],
+    exception_handlers={ApiError: api_error_response},
+    lifespan=lifespan,
+)
@@ -1,76 +1,203 @@
 # backend/app_sqlite.py - Alternative version using SQLite for easier setup
 
-from flask import Flask, jsonify, request
+import time
+startup_started = time.perf_counter()
+
+from flask import Flask, g, jsonify, request, Request, Response, stream_with_context
 from flask_cors import CORS
 import sqlite3
 import uuid
-import hashlib
 import json
-import time
 import os
-from main import analyze_resume
+import tempfile
+from main import ALL_FIELDS, ANALYSIS_TIME_LIMIT, MAX_CHARS, MAX_PAGES, analyze_resume, analyze_resumes
+from extractor import preload_models
+from jobs import ResumeJobQueue, QueueFullError
+from catalog import InternshipCatalog
+from recommendations import RecommendationStore
+from responses import BodyCache, install_json_provider
+import metrics
+from db_pool import PoolTimeoutError, SQLiteConnectionPool, release_after_request
+from auth import AuthBusyError, PasswordHasher, SessionStore, bearer_token
+from admission import AdmissionController, ConcurrencyLimit, RateLimit, SQLiteBucketStore, protect_app
+from bulk_profiles import ProfileImporter
+from api_routes import register_shared_routes
+from profiles import ProfileIndex, preference_tags
+
+class SpooledUploadRequest(Request):
+    # Keep uploads in memory up to UPLOAD_SPOOL_MAX_MEMORY, then spill to an anonymous temp file
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_MAX_MEMORY'], mode='rb+')
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
+install_json_provider(app)
 
 # --- Configuration for file uploads ---
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['UPLOAD_SPOOL_MAX_MEMORY'] = 2 * 1024 * 1024  # bytes held in memory before spilling to disk
+
+# --- Bulk resume analysis tuning ---
+app.config['NLP_BATCH_SIZE'] = 32     # documents per nlp.pipe batch
+app.config['NLP_N_PROCESS'] = 1       # spaCy worker processes
+app.config['PARSE_WORKERS'] = None    # PDF/DOCX parser processes (None = one per core)
+
+# --- Long document caps (longer resumes are analyzed in part and flagged "truncated") ---
+app.config['RESUME_MAX_PAGES'] = MAX_PAGES
+app.config['RESUME_MAX_CHARS'] = MAX_CHARS
+app.config['RESUME_ANALYSIS_TIME_LIMIT'] = ANALYSIS_TIME_LIMIT  # seconds of NLP per resume
+
+# --- Background resume jobs ---
+app.config['RESUME_JOB_WORKERS'] = 2      # analysis processes, each loads spaCy once
+app.config['RESUME_JOB_MAX_PENDING'] = 100
+app.config['RESUME_JOB_RETRY_AFTER'] = 5  # seconds suggested to clients when the queue is full
+
+# --- Request metrics (served on /metrics) ---
+app.config['SLOW_REQUEST_SECONDS'] = 2.0  # log a stage breakdown for slower requests; None disables
+metrics.instrument_app(app, slow_request_seconds=app.config['SLOW_REQUEST_SECONDS'])
+
+def unique_upload_path(filename):
+    # Prefix saved files so identical client filenames can't overwrite each other
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{os.path.basename(filename)}")
 
 # --- SQLite DATABASE CONFIGURATION ---
 DATABASE = 'internship_navigator.db'
+RESUME_JOBS_DATABASE = DATABASE
 
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# A bounded set of reusable WAL-mode connections instead of a fresh connect() per request
+app.config['DB_POOL_SIZE'] = 10
+app.config['DB_TIMEOUT'] = 5.0   # seconds to wait on a locked database or for a free connection
+db_pool = SQLiteConnectionPool(DATABASE, pool_size=app.config['DB_POOL_SIZE'], timeout=app.config['DB_TIMEOUT'])
 
-def init_db():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            profile_complete BOOLEAN DEFAULT FALSE,
-            skills TEXT,
-            highest_qualification TEXT,
-            field_of_study TEXT,
-            work_experience TEXT,
-            work_experience_details TEXT,
-            internet_access TEXT,
-            languages TEXT,
-            internship_mode TEXT,
-            commitment TEXT,
-            preferred_industries TEXT,
-            preferred_tasks TEXT,
-            stipend_requirement TEXT,
-            stay_away TEXT,
-            relocation TEXT,
-            special_support TEXT,
-            document_readiness TEXT,
-            contact_consent TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+# Connections a request left checked out (e.g. it raised first) go back to the pool when it ends
+get_db_connection = release_after_request(app, db_pool.get_connection)
 
-def generate_password_hash(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+@app.errorhandler(PoolTimeoutError)
+def pool_timeout_response(e):
+    # Every pooled connection stayed busy for DB_TIMEOUT seconds
+    return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
 
-def check_password_hash(password_hash, password):
-    return password_hash == hashlib.sha256(password.encode()).hexdigest()
+def init_db():
+    with get_db_connection() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                profile_complete BOOLEAN DEFAULT FALSE,
+                skills TEXT,
+                highest_qualification TEXT,
+                field_of_study TEXT,
+                work_experience TEXT,
+                work_experience_details TEXT,
+                internet_access TEXT,
+                languages TEXT,
+                internship_mode TEXT,
+                commitment TEXT,
+                preferred_industries TEXT,
+                preferred_tasks TEXT,
+                stipend_requirement TEXT,
+                stay_away TEXT,
+                relocation TEXT,
+                special_support TEXT,
+                document_readiness TEXT,
+                contact_consent TEXT,
+                preference_tags TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
 
 # Initialize database on startup
 init_db()
 
+# user_skills / user_preferences mirror the profile columns; sync users written before they existed
+profile_index = ProfileIndex(placeholder='?')
+profile_index.init_tables(get_db_connection)
+profile_index.backfill(get_db_connection)
+
+# --- PASSWORDS AND SESSIONS ---
+app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'  # werkzeug method string; older hashes upgrade on login
+app.config['PASSWORD_HASH_WORKERS'] = 2       # threads running the KDF
+app.config['PASSWORD_HASH_MAX_PENDING'] = 32  # queued hashes before sign-ins get a 503
+app.config['AUTH_RETRY_AFTER'] = 1            # seconds suggested to clients when hashing is saturated
+app.config['SESSION_TTL_SECONDS'] = 7 * 24 * 3600
+
+password_hasher = PasswordHasher(
+    method=app.config['PASSWORD_HASH_METHOD'],
+    workers=app.config['PASSWORD_HASH_WORKERS'],
+    max_pending=app.config['PASSWORD_HASH_MAX_PENDING']
+)
+sessions = SessionStore(get_db_connection, placeholder='?', ttl=app.config['SESSION_TTL_SECONDS'])
+sessions.init_tables()
+sessions.purge_expired()
+
+def auth_busy_response(e):
+    return jsonify({"error": str(e)}), 503, {"Retry-After": str(app.config['AUTH_RETRY_AFTER'])}
+
+# Routes that don't take a session token; the admin routes check X-Admin-Token themselves
+PUBLIC_ENDPOINTS = {'signup', 'login', 'get_db_pool_health', 'get_nlp_health', 'get_metrics', 'static',
+                    'import_profiles', 'export_profiles'}
+
+@app.before_request
+def check_session():
+    # A missing header is still answered by each route; a present one must be a live session
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or request.endpoint is None or request.endpoint in PUBLIC_ENDPOINTS:
+        return None
+    token = bearer_token(auth_header)
+    try:
+        g.user_email = sessions.email_for(token) if token else None
+    except (ConnectionError, sqlite3.Error) as e:
+        return jsonify({"error": str(e)}), 500
+    if g.user_email is None:
+        return jsonify({"error": "Invalid or expired token"}), 401
+
+# --- Admission control for the expensive routes (password KDF, resume NLP) ---
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', '1') != '0'
+# SQLite file shared by every worker process on this host; unset keeps buckets per process
+app.config['RATE_LIMIT_DATABASE'] = os.environ.get('RATE_LIMIT_DATABASE')
+app.config['RATE_LIMITS'] = {            # endpoint -> (requests per minute, burst), per user or per IP
+    'login': (20, 10),
+    'signup': (5, 5),
+    'upload_and_analyze_resume': (10, 5),
+    'upload_and_analyze_resumes': (2, 2),
+    'submit_resume_job': (10, 5),
+}
+app.config['MAX_CONCURRENT_ANALYSES'] = 4   # synchronous resume analyses in flight; more get a 503
+app.config['ANALYSIS_RETRY_AFTER'] = 2      # seconds suggested to clients when analyses are saturated
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024  # any request body, including admin imports
+app.config['MAX_BODY_BYTES'] = {            # tighter per-route caps, checked before the body is read
+    'login': 16 * 1024,
+    'signup': 16 * 1024,
+    'upload_and_analyze_resume': 10 * 1024 * 1024,
+    'upload_and_analyze_resumes': 50 * 1024 * 1024,
+    'submit_resume_job': 10 * 1024 * 1024,
+}
+
+analysis_slots = ConcurrencyLimit(app.config['MAX_CONCURRENT_ANALYSES'], name='resume_analysis')
+admission = AdmissionController(
+    rate_limits={endpoint: RateLimit(*limit) for endpoint, limit in app.config['RATE_LIMITS'].items()},
+    concurrency={'upload_and_analyze_resume': analysis_slots, 'upload_and_analyze_resumes': analysis_slots},
+    max_body_bytes=app.config['MAX_BODY_BYTES'],
+    store=SQLiteBucketStore(app.config['RATE_LIMIT_DATABASE']) if app.config['RATE_LIMIT_DATABASE'] else None,
+    busy_retry_after=app.config['ANALYSIS_RETRY_AFTER'],
+    enabled=app.config['RATE_LIMIT_ENABLED']
+)
+
+def client_key() -> str:
+    # Signed-in users get their own budget; everyone else shares one per address
+    email = g.get('user_email')
+    return f"user:{email}" if email else f"ip:{request.remote_addr}"
+
+# Registered after check_session so client_key sees g.user_email
+protect_app(app, admission, client_key)
+
 # --- AUTHENTICATION ENDPOINTS ---
 @app.route('/api/signup', methods=['POST'])
 def signup():
@@ -78,21 +205,23 @@ def signup():
     if not data or not all(k in data for k in ('name', 'email', 'password')):
         return jsonify({"error": "Missing required fields"}), 400
     
-    password_hash = generate_password_hash(data['password'])
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute(
-            'INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)',
-            (data['name'], data['email'], password_hash)
-        )
-        conn.commit()
-        return jsonify({"message": "User created successfully"}), 201
-    except sqlite3.IntegrityError:
-        return jsonify({"error": "User with this email already exists"}), 409
-    finally:
-        conn.close()
+        password_hash = password_hasher.hash(data['password'])
+    except AuthBusyError as e:
+        return auth_busy_response(e)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                'INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)',
+                (data['name'], data['email'], password_hash)
+            )
+            profile_index.sync(cursor, data['email'])
+            recommendation_store.mark_dirty(cursor, data['email'])
+            conn.commit()
+        except sqlite3.IntegrityError:
+            return jsonify({"error": "User with this email already exists"}), 409
+    return jsonify({"message": "User created successfully"}), 201
 
 @app.route('/api/login', methods=['POST'])
 def login():
@@ -100,22 +229,45 @@ def login():
     if not data or not all(k in data for k in ('email', 'password')):
         return jsonify({"error": "Missing email or password"}), 400
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM users WHERE email = ?', (data['email'],))
-    user = cursor.fetchone()
-    conn.close()
-    
-    if user and check_password_hash(user['password_hash'], data['password']):
-        token = str(uuid.uuid4())
-        return jsonify({
-            "message": "Login successful",
-            "token": token,
-            "name": user['name'],
-            "profile_complete": bool(user['profile_complete']),
-            "quiz_taken": bool(user['internship_mode'])
-        }), 200
-    return jsonify({"error": "Invalid credentials"}), 401
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM users WHERE email = ?', (data['email'],))
+        user = cursor.fetchone()
+
+    if not user:
+        return jsonify({"error": "Invalid credentials"}), 401
+    # The slow KDF runs on the hasher's own threads with no DB connection held
+    try:
+        valid, new_hash = password_hasher.verify(user['password_hash'], data['password'])
+    except AuthBusyError as e:
+        return auth_busy_response(e)
+    if not valid:
+        return jsonify({"error": "Invalid credentials"}), 401
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if new_hash:
+            # Legacy SHA-256 or outdated KDF parameters: store the upgraded hash
+            cursor.execute('UPDATE users SET password_hash = ? WHERE email = ?', (new_hash, user['email']))
+        token, expires_at, sql, params = sessions.new_session(user['email'])
+        cursor.execute(sql, params)
+        conn.commit()
+    sessions.remember(token, (user['email'], expires_at))
+    return jsonify({
+        "message": "Login successful",
+        "token": token,
+        "name": user['name'],
+        "profile_complete": bool(user['profile_complete']),
+        "quiz_taken": bool(user['internship_mode'])
+    }), 200
+
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    token = bearer_token(request.headers.get('Authorization'))
+    if not token:
+        return jsonify({"error": "Authorization token is missing"}), 401
+    sessions.revoke(token)
+    return jsonify({"message": "Logged out"}), 200
 
 # --- ONBOARDING & QUIZ SUBMISSION ---
 @app.route('/api/onboarding', methods=['POST'])
@@ -133,9 +285,6 @@ def submit_quiz():
     if not user_email: 
         return jsonify({"error": "User email is missing"}), 400
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     # Build update query dynamically
     update_fields = []
     values = []
@@ -150,14 +299,16 @@ def submit_quiz():
     
     sql_query = f"UPDATE users SET {', '.join(update_fields)} WHERE email = ?"
     
-    try:
-        cursor.execute(sql_query, tuple(values))
-        conn.commit()
-        return jsonify({"message": "Profile updated successfully!"}), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql_query, tuple(values))
+            profile_index.sync(cursor, user_email)
+            recommendation_store.mark_dirty(cursor, user_email)
+            conn.commit()
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+    return jsonify({"message": "Profile updated successfully!"}), 200
 
 # --- PROFILE ENDPOINTS ---
 @app.route('/api/profile', methods=['GET'])
@@ -170,35 +321,20 @@ def get_profile():
     if not user_email: 
         return jsonify({"error": "User email is required"}), 400
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute('''SELECT name, email, skills, highest_qualification, field_of_study, 
-                     work_experience, work_experience_details, internet_access, languages, 
-                     internship_mode, commitment, preferred_industries, preferred_tasks, 
-                     stipend_requirement, stay_away, relocation, special_support, 
-                     document_readiness, contact_consent FROM users WHERE email = ?''', (user_email,))
-    
-    profile = cursor.fetchone()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''SELECT name, email, skills, highest_qualification, field_of_study, 
+                         work_experience, work_experience_details, internet_access, languages, 
+                         internship_mode, commitment, preferred_industries, preferred_tasks, 
+                         stipend_requirement, stay_away, relocation, special_support, 
+                         document_readiness, contact_consent, preference_tags FROM users WHERE email = ?''', (user_email,))
+        profile = cursor.fetchone()
     
     if profile:
-        preference_tags = []
         profile_dict = dict(profile)
-        
-        if profile_dict.get('internship_mode'): 
-            preference_tags.append(profile_dict['internship_mode'].replace('_', '-'))
-        if profile_dict.get('commitment'): 
-            preference_tags.append(profile_dict['commitment'].replace('_', '-'))
-        if profile_dict.get('preferred_industries'): 
-            preference_tags.extend([tag.strip().replace('_', '-') for tag in profile_dict['preferred_industries'].split(',')])
-        if profile_dict.get('preferred_tasks'): 
-            preference_tags.extend([tag.strip().replace('_', '-') for tag in profile_dict['preferred_tasks'].split(',')])
-        if profile_dict.get('stipend_requirement'): 
-            preference_tags.append(profile_dict['stipend_requirement'].replace('_', '-'))
-        if profile_dict.get('relocation'): 
-            preference_tags.append(profile_dict['relocation'].replace('_', '-'))
-        
-        profile_dict['preference_tags'] = ", ".join(filter(None, preference_tags))
+        # Computed when the profile was written
+        if profile_dict['preference_tags'] is None:
+            profile_dict['preference_tags'] = preference_tags(profile_dict)
         return jsonify(profile_dict), 200
     
     return jsonify({"error": "User not found"}), 404
@@ -226,17 +362,23 @@ def update_profile():
     values.append(user_email)
     sql_query = f"UPDATE users SET {', '.join(update_fields)} WHERE email = ?"
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute(sql_query, tuple(values))
-        conn.commit()
-        return jsonify({"message": "Profile updated successfully"}), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql_query, tuple(values))
+            profile_index.sync(cursor, user_email)
+            recommendation_store.mark_dirty(cursor, user_email)
+            conn.commit()
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+    return jsonify({"message": "Profile updated successfully"}), 200
+
+def resume_caps() -> dict:
+    return {
+        "max_pages": app.config['RESUME_MAX_PAGES'],
+        "max_chars": app.config['RESUME_MAX_CHARS'],
+        "time_limit": app.config['RESUME_ANALYSIS_TIME_LIMIT'],
+    }
 
 # --- RESUME ANALYSIS ENDPOINT ---
 @app.route('/api/resume/upload', methods=['POST'])
@@ -253,40 +395,162 @@ def upload_and_analyze_resume():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
         
+    # Optional ?fields=email,phone,skills limits the work to what the caller needs
+    fields = request.args.get('fields')
+    fields = {f.strip() for f in fields.split(',') if f.strip()} if fields else None
+    if fields and not fields <= ALL_FIELDS:
+        return jsonify({"error": f"Unknown fields: {', '.join(sorted(fields - ALL_FIELDS))}"}), 400
+
     if file:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-        file.save(filepath)
-        
         try:
-            # Call your actual analysis function
-            data = analyze_resume(filepath)
+            # Analyze straight from the upload stream; nothing is written to uploads/
+            data = analyze_resume(file.stream, filename=file.filename, fields=fields, **resume_caps())
         except Exception as e:
             # Provide more specific error details if in debug mode
             return jsonify({"error": "An error occurred during analysis.", "details": str(e)}), 500
-        finally:
-            # Ensure the temporary file is always removed
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        
+
         return jsonify(data)
 
     return jsonify({"error": "An unexpected error occurred."}), 500
 
-# --- INTERNSHIPS ENDPOINT ---
-@app.route('/api/internships')
-def get_internships():
+# --- BULK RESUME ANALYSIS ENDPOINT ---
+@app.route('/api/resume/upload/batch', methods=['POST'])
+def upload_and_analyze_resumes():
     auth_header = request.headers.get('Authorization')
-    if not auth_header: 
+    if not auth_header:
         return jsonify({"error": "Authorization token is missing"}), 401
-    
+
+    files = [f for f in request.files.getlist('resumes') if f.filename]
+    if not files:
+        return jsonify({"error": "No files in the request"}), 400
+
+    # Uploads are handed to the parser pool as bytes, never written to uploads/
+    sources = [(file.filename, file.read()) for file in files]
+
+    def generate():
+        for filename, result in analyze_resumes(
+            sources,
+            batch_size=app.config['NLP_BATCH_SIZE'],
+            n_process=app.config['NLP_N_PROCESS'],
+            parse_workers=app.config['PARSE_WORKERS'],
+            max_pages=app.config['RESUME_MAX_PAGES'],
+            max_chars=app.config['RESUME_MAX_CHARS']
+        ):
+            yield json.dumps({"filename": filename, "result": result}) + "\n"
+
+    # Newline-delimited JSON, one line per resume as soon as it is analyzed
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# --- ASYNC RESUME ANALYSIS JOBS ---
+resume_jobs = ResumeJobQueue(
+    RESUME_JOBS_DATABASE,
+    max_workers=app.config['RESUME_JOB_WORKERS'],
+    max_pending=app.config['RESUME_JOB_MAX_PENDING'],
+    analysis_options=resume_caps()
+)
+
+@app.route('/api/resume/jobs', methods=['POST'])
+def submit_resume_job():
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return jsonify({"error": "Authorization token is missing"}), 401
+
+    if 'resume' not in request.files:
+        return jsonify({"error": "No file part in the request"}), 400
+
+    file = request.files['resume']
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    filepath = unique_upload_path(file.filename)
+    with metrics.stage('upload_save'):
+        file.save(filepath)
     try:
-        with open('internships.json', 'r', encoding='utf-8') as f:
-            internships_data = json.load(f)
-        return jsonify(internships_data)
-    except FileNotFoundError:
-        return jsonify({"error": "Internships data not found"}), 404
-    except Exception as e:
-        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+        job_id = resume_jobs.submit(filepath, file.filename)
+    except QueueFullError as e:
+        os.remove(filepath)
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(app.config['RESUME_JOB_RETRY_AFTER'])}
+
+    return jsonify({"job_id": job_id, "status": "queued"}), 202
+
+@app.route('/api/resume/jobs/<job_id>', methods=['GET'])
+def get_resume_job(job_id):
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return jsonify({"error": "Authorization token is missing"}), 401
+
+    job = resume_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+# --- INTERNSHIPS ENDPOINTS ---
+catalog = InternshipCatalog('internships.json')
+
+app.config['RESPONSE_CACHE_BYTES'] = 32 * 1024 * 1024  # serialized and compressed catalog bodies kept in memory
+response_bodies = BodyCache(app.config['RESPONSE_CACHE_BYTES'])
+
+# --- RECOMMENDATIONS ---
+app.config['RECOMMENDATION_TOP_N'] = 50
+app.config['RECOMMENDATION_BATCH_SIZE'] = 200
+app.config['RECOMMENDATION_REFRESH_INTERVAL'] = 5.0  # seconds between refresher passes
+
+recommendation_store = RecommendationStore(
+    get_db_connection,
+    catalog,
+    placeholder='?',
+    top_n=app.config['RECOMMENDATION_TOP_N'],
+    batch_size=app.config['RECOMMENDATION_BATCH_SIZE'],
+    interval=app.config['RECOMMENDATION_REFRESH_INTERVAL']
+)
+recommendation_store.init_tables()
+
+@app.before_request
+def start_background_work():
+    # In the process serving requests, i.e. after a pre-fork server has forked its workers;
+    # both calls return at once when this process already started them
+    recommendation_store.start()
+    resume_jobs.start()
+
+# --- BULK PROFILE IMPORT / EXPORT ---
+app.config['ADMIN_API_TOKEN'] = os.environ.get('ADMIN_API_TOKEN')  # sent as X-Admin-Token; unset disables /api/admin
+app.config['IMPORT_CHUNK_SIZE'] = 500           # rows per transaction
+app.config['IMPORT_MAX_REPORTED_ERRORS'] = 1000  # per-row errors returned in the response
+app.config['IMPORT_RETRY_AFTER'] = 30           # seconds suggested when another import is running
+
+# No hasher: plaintext passwords are rejected per row and go through bulk_profiles.py instead
+profile_importer = ProfileImporter(
+    get_db_connection,
+    None,
+    profile_index,
+    recommendation_store,
+    placeholder='?',
+    chunk_size=app.config['IMPORT_CHUNK_SIZE']
+)
+
+# --- INTERNSHIP, RECOMMENDATION, ADMIN AND HEALTH ROUTES (shared with app.py, see api_routes.py) ---
+def db_pool_health():
+    return {"pool_size": db_pool.pool_size, **db_pool.metrics.snapshot()}
+
+register_shared_routes(
+    app,
+    catalog=catalog,
+    response_bodies=response_bodies,
+    get_connection=get_db_connection,
+    placeholder='?',
+    recommendation_store=recommendation_store,
+    profile_importer=profile_importer,
+    admission=admission,
+    pool_health=db_pool_health,
+    startup_seconds=lambda: STARTUP_SECONDS
+)
+
+# spaCy loads lazily on the first resume. With PRELOAD_NLP=1 it loads here instead,
+# so a pre-fork server (gunicorn --preload) shares the model with its workers.
+if os.environ.get('PRELOAD_NLP') == '1':
+    preload_models()
+STARTUP_SECONDS = round(time.perf_counter() - startup_started, 3)
+metrics.STARTUP_DURATION.set(STARTUP_SECONDS)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,251 @@
+# backend/auth.py - Password hashing and session tokens shared by the apps
+
+import hashlib
+import hmac
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from schema import ensure_index, is_mysql, run_migration
+
+# werkzeug method string: "scrypt:N:r:p" or "pbkdf2:sha256:iterations"
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+# app_sqlite.py used to store a bare, unsalted SHA-256 hex digest
+_LEGACY_SHA256 = re.compile(r'[0-9a-f]{64}')
+# What generate_password_hash produces: "method$salt$hexdigest"
+_WERKZEUG_HASH = re.compile(r'(scrypt|pbkdf2):[\w:]+\$[^$]+\$[0-9a-f]+')
+
+
+class AuthBusyError(Exception):
+    """Raised when too many password hashes are already queued."""
+
+
+def token_hash(token: str) -> str:
+    # Only a digest of each token is stored, so a leaked table holds no usable tokens
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def is_password_hash(value: str) -> bool:
+    """True for hashes PasswordHasher can verify, e.g. when importing already-hashed passwords."""
+    return bool(_WERKZEUG_HASH.fullmatch(value) or _LEGACY_SHA256.fullmatch(value))
+
+def bearer_token(auth_header: Optional[str]) -> Optional[str]:
+    if not auth_header:
+        return None
+    scheme, _, token = auth_header.partition(' ')
+    return token.strip() if scheme.lower() == 'bearer' and token.strip() else None
+
+
+class PasswordHasher:
+    """
+    Runs the password KDF on a small dedicated thread pool. hashlib's scrypt
+    and PBKDF2 release the GIL, so hashing does not stall request threads, and
+    at most `workers + max_pending` hashes are admitted at once: a login storm
+    gets AuthBusyError instead of every worker thread and a CPU per request.
+    """
+
+    def __init__(self, method: str = DEFAULT_HASH_METHOD, workers: int = 2, max_pending: int = 32):
+        self.method = method
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise AuthBusyError("Too many sign-ins in progress, please retry shortly")
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _hash(self, password: str) -> str:
+        return generate_password_hash(password, method=self.method)
+
+    def _verify(self, stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+        if _LEGACY_SHA256.fullmatch(stored_hash or ''):
+            digest = hashlib.sha256(password.encode()).hexdigest()
+            ok = hmac.compare_digest(stored_hash, digest)
+        else:
+            try:
+                ok = check_password_hash(stored_hash, password)
+            except ValueError:
+                # A malformed or unsupported stored hash can't match; it must not turn a login into a 500
+                return False, None
+        # Legacy digests and hashes made with older parameters are replaced on login
+        needs_rehash = ok and stored_hash.split('$', 1)[0] != self.method
+        return ok, (self._hash(password) if needs_rehash else None)
+
+    def hash_async(self, password: str) -> Future:
+        return self.submit(self._hash, password)
+
+    def verify_async(self, stored_hash: str, password: str) -> Future:
+        """Future of (matches, new_hash); new_hash is set when the stored hash should be replaced."""
+        return self.submit(self._verify, stored_hash, password)
+
+    def hash(self, password: str) -> str:
+        return self.hash_async(password).result()
+
+    def verify(self, stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+        return self.verify_async(stored_hash, password).result()
+
+
+class SessionStore:
+    """
+    Opaque bearer tokens stored as SHA-256 digests in `user_sessions`. Lookups
+    go through an in-memory LRU, so repeat requests with the same token skip the
+    database. Unknown tokens are cached too, briefly, in a separate and smaller
+    LRU, so a client sending random tokens can only churn that one and never
+    evicts live sessions. A cached entry is re-read after at most `cache_ttl`
+    seconds, which bounds how long a token revoked by another process keeps
+    working here.
+
+    Works against SQLite and MySQL like RecommendationStore: pass the app's
+    get_db_connection and the driver's placeholder.
+    """
+
+    def __init__(self, get_connection: Callable, placeholder: str = '?', ttl: float = 7 * 24 * 3600,
+                 cache_size: int = 10000, miss_cache_size: int = 1000, cache_ttl: float = 60.0):
+        self.get_connection = get_connection
+        self.ph = placeholder
+        self.mysql = is_mysql(placeholder)
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.miss_cache_size = miss_cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = self.get_connection()
+        if conn is None:
+            raise ConnectionError("Database connection failed")
+        return conn
+
+    def init_tables(self):
+        """Creates user_sessions and its index where missing, on SQLite or MySQL."""
+        text, key, real = ('VARCHAR(255)', 'CHAR(64)', 'DOUBLE') if self.mysql else ('TEXT', 'TEXT', 'REAL')
+
+        def migrate(cursor):
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS user_sessions (
+                    token_hash {key} PRIMARY KEY,
+                    email {text} NOT NULL,
+                    created_at {real} NOT NULL,
+                    expires_at {real} NOT NULL
+                )
+            ''')
+            ensure_index(cursor, self.mysql, 'idx_user_sessions_expires_at', 'user_sessions', 'expires_at')
+        run_migration(self._connect, migrate)
+
+    # --- Statements, for callers with their own (async) driver ---
+
+    def new_session(self, email: str) -> Tuple[str, float, str, tuple]:
+        """
+        A fresh token plus the INSERT that stores it: (token, expires_at, sql,
+        params). Once committed, pass (email, expires_at) to remember().
+        """
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+        expires_at = now + self.ttl
+        sql = (f'INSERT INTO user_sessions (token_hash, email, created_at, expires_at) '
+               f'VALUES ({self.ph}, {self.ph}, {self.ph}, {self.ph})')
+        return token, expires_at, sql, (token_hash(token), email, now, expires_at)
+
+    @property
+    def lookup_query(self) -> str:
+        """Takes token_hash(token) as its one parameter."""
+        return f'SELECT email, expires_at FROM user_sessions WHERE token_hash = {self.ph}'
+
+    def delete_statement(self, token: str) -> Tuple[str, tuple]:
+        return f'DELETE FROM user_sessions WHERE token_hash = {self.ph}', (token_hash(token),)
+
+    # --- Cache ---
+
+    def cached(self, token: str) -> Tuple[bool, Optional[str]]:
+        """(hit, email). On a hit, email is None for an unknown or expired token."""
+        key = token_hash(token)
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                email, valid_until = entry
+                if valid_until > now:
+                    self._cache.move_to_end(key)
+                    return True, email
+                del self._cache[key]
+            valid_until = self._misses.get(key)
+            if valid_until is not None:
+                if valid_until > now:
+                    return True, None
+                del self._misses[key]
+            return False, None
+
+    @staticmethod
+    def _put(cache: OrderedDict, key: str, value, max_size: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def remember(self, token: str, row) -> Optional[str]:
+        """Caches the result of lookup_query (row may be None) and returns the email it grants."""
+        now = time.time()
+        key = token_hash(token)
+        with self._lock:
+            if row is None or row[1] <= now:
+                self._cache.pop(key, None)
+                self._put(self._misses, key, now + self.cache_ttl, self.miss_cache_size)
+                return None
+            self._misses.pop(key, None)
+            self._put(self._cache, key, (row[0], min(row[1], now + self.cache_ttl)), self.cache_size)
+        return row[0]
+
+    def forget(self, token: str):
+        key = token_hash(token)
+        with self._lock:
+            self._cache.pop(key, None)
+            self._misses.pop(key, None)
+
+    # --- Synchronous helpers for the Flask apps ---
+
+    def email_for(self, token: str) -> Optional[str]:
+        hit, email = self.cached(token)
+        if hit:
+            return email
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(self.lookup_query, (token_hash(token),))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+        return self.remember(token, tuple(row) if row else None)
+
+    def revoke(self, token: str):
+        sql, params = self.delete_statement(token)
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        self.forget(token)
+
+    def purge_expired(self) -> int:
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'DELETE FROM user_sessions WHERE expires_at <= {self.ph}', (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+            conn.close()
@@ -0,0 +1,254 @@
+# backend/bench_resume.py - Resume analysis benchmark with a synthetic corpus
+#
+# Usage:
+#   python bench_resume.py --pages 1 5 20 --densities 0.05 0.2 --docs 20 \
+#       --concurrency 1 2 4 --output bench_results.json
+#
+# Runs fully offline: resumes are generated locally as PDF and DOCX files and
+# the only model needed is the installed en_core_web_sm.
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import docx
+
+from parser import extract_text_from_file
+from taxonomy import get_taxonomy
+from extractor import MODEL_NAME, get_nlp, extract_skills_with_spacy, skill_matcher
+from main import analyze_resume, ner_inputs
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya", "Ishaan", "Sneha"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Das", "Joshi", "Menon"]
+UNIVERSITIES = ["University of Mumbai", "Delhi Technological University", "Indian Institute of Technology Madras",
+                "Pune Institute of Computer Technology", "Anna University"]
+FILLER = [
+    "Collaborated with a cross-functional team to deliver features on schedule.",
+    "Improved reporting accuracy by automating a manual reconciliation process.",
+    "Presented weekly progress updates to stakeholders and incorporated feedback.",
+    "Mentored two junior interns and documented onboarding steps for the team.",
+    "Analysed customer feedback to prioritise the product roadmap for the quarter.",
+    "Designed and maintained internal tools used by the operations department.",
+]
+LINES_PER_PAGE = 40
+
+
+# --- Synthetic corpus ---
+
+def synthetic_resume(rng: random.Random, pages: int, skill_density: float) -> List[List[str]]:
+    """Lines of text per page. skill_density is the fraction of body lines that mention skills."""
+    skills = get_taxonomy().names
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    header = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +91 98765 {rng.randint(10000, 99999)}",
+        "Education",
+        f"B.Tech, {rng.choice(UNIVERSITIES)}, 2021 - 2025",
+        "Experience",
+    ]
+    result = []
+    for page in range(pages):
+        lines = list(header) if page == 0 else []
+        while len(lines) < LINES_PER_PAGE:
+            if rng.random() < skill_density:
+                lines.append("Worked with " + ", ".join(rng.sample(skills, 3)) + ".")
+            else:
+                lines.append(rng.choice(FILLER))
+        result.append(lines)
+    return result
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(pages: List[List[str]], path: str):
+    """A minimal multi-page PDF with one Helvetica text stream per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        text = "\n".join(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td\n{text}\nET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(out)
+
+def write_docx(pages: List[List[str]], path: str):
+    document = docx.Document()
+    for page, lines in enumerate(pages):
+        if page:
+            document.add_page_break()
+        for line in lines:
+            document.add_paragraph(line)
+    document.save(path)
+
+def generate_corpus(directory: str, pages_options: List[int], densities: List[float], docs: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    corpus = []
+    for pages in pages_options:
+        for density in densities:
+            for n in range(docs):
+                content = synthetic_resume(rng, pages, density)
+                for kind, writer in (("pdf", write_pdf), ("docx", write_docx)):
+                    path = os.path.join(directory, f"resume_p{pages}_d{density}_{n}.{kind}")
+                    writer(content, path)
+                    corpus.append({"path": path, "kind": kind, "pages": pages, "density": density})
+    return corpus
+
+
+# --- Measurement ---
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {
+        "count": len(ordered),
+        "mean_ms": round(1000 * sum(ordered) / len(ordered), 3),
+        "p50_ms": round(1000 * pick(0.50), 3),
+        "p95_ms": round(1000 * pick(0.95), 3),
+        "p99_ms": round(1000 * pick(0.99), 3),
+    }
+
+def peak_rss_bytes(who=resource.RUSAGE_SELF) -> int:
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(who).ru_maxrss * 1024
+
+def measure_stages(corpus: List[dict]) -> Dict[str, dict]:
+    """Per-stage latency for every document, grouped by file kind and page count."""
+    nlp = get_nlp()
+    skill_matcher()
+    groups: Dict[str, Dict[str, List[float]]] = {}
+    for item in corpus:
+        stages = groups.setdefault(f"{item['kind']}_p{item['pages']}", {
+            "parse": [], "tokenize": [], "ner": [], "ner_sections": [], "skill_match": [], "chars": [],
+            "ner_token_share": []
+        })
+        started = time.perf_counter()
+        text = extract_text_from_file(item["path"])
+        stages["parse"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        doc = nlp.make_doc(text)
+        stages["tokenize"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for _, component in nlp.pipeline:
+            doc = component(doc)
+        stages["ner"].append(time.perf_counter() - started)
+
+        # What analyze_resume does: NER over the header and education sections only
+        started = time.perf_counter()
+        section_docs = list(nlp.pipe(dict.fromkeys(ner_inputs(text).values())))
+        stages["ner_sections"].append(time.perf_counter() - started)
+        stages["ner_token_share"].append(sum(len(d) for d in section_docs) / max(len(doc), 1))
+
+        started = time.perf_counter()
+        extract_skills_with_spacy(doc)
+        stages["skill_match"].append(time.perf_counter() - started)
+        stages["chars"].append(len(text))
+
+    report = {}
+    for group, stages in groups.items():
+        chars = stages.pop("chars")
+        share = stages.pop("ner_token_share")
+        report[group] = {stage: percentiles(samples) for stage, samples in stages.items()}
+        report[group]["mean_chars"] = round(sum(chars) / len(chars))
+        report[group]["mean_ner_token_share"] = round(sum(share) / len(share), 3)
+    return report
+
+def _timed_analysis(path: str) -> float:
+    started = time.perf_counter()
+    analyze_resume(path, use_cache=False)
+    return time.perf_counter() - started
+
+def _warm_worker():
+    get_nlp()
+    skill_matcher()
+
+def measure_throughput(corpus: List[dict], concurrency: List[int]) -> Dict[str, dict]:
+    """End-to-end analyze_resume latency and docs/sec at each worker count."""
+    paths = [item["path"] for item in corpus]
+    report = {}
+    for workers in concurrency:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+            # Warm every worker before the clock starts
+            list(pool.map(_timed_analysis, paths[:workers]))
+            started = time.perf_counter()
+            latencies = list(pool.map(_timed_analysis, paths))
+            elapsed = time.perf_counter() - started
+        report[str(workers)] = {
+            "docs_per_sec": round(len(paths) / elapsed, 2),
+            "latency": percentiles(latencies),
+        }
+    return report
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing and analysis on a synthetic corpus.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20], help="page counts to generate")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.05, 0.2],
+                        help="fraction of lines that mention skills")
+    parser.add_argument("--docs", type=int, default=10, help="documents per page count, density and format")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4], help="worker counts for throughput")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    with tempfile.TemporaryDirectory(prefix="resume_bench_") as directory:
+        corpus = generate_corpus(directory, args.pages, args.densities, args.docs, args.seed)
+        print(f"Generated {len(corpus)} documents in {directory}")
+        stages = measure_stages(corpus)
+        throughput = measure_throughput(corpus, args.concurrency)
+
+    report = {
+        "commit": git_commit(),
+        "started_at": started,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "model": MODEL_NAME,
+        "config": vars(args),
+        "stages": stages,
+        "throughput": throughput,
+        "peak_rss_bytes": {"main": peak_rss_bytes(), "workers": peak_rss_bytes(resource.RUSAGE_CHILDREN)},
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({"stages": stages, "throughput": throughput}, indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# backend/bench_search.py - Catalog search benchmark with a synthetic catalog
+#
+# Usage:
+#   python bench_search.py --postings 10000 100000 --queries 500 --output bench_search_results.json
+#
+# Reports index build time, incremental update time after editing 1% of the
+# postings, and p50/p95/p99 query latency for plain and search-as-you-type
+# queries at each catalog size. "cold" is the first pass over the queries,
+# which compiles each term's postings on first use; "warm" repeats them.
+
+import argparse
+import json
+import platform
+import random
+import time
+from typing import List
+
+from bench_resume import percentiles
+from search import SearchIndex, tokenize
+from taxonomy import get_taxonomy
+
+TITLES = ["Intern", "Analyst Intern", "Developer Intern", "Research Intern", "Associate", "Trainee"]
+AREAS = ["Data Science", "Backend", "Frontend", "Marketing", "Finance", "Product", "Design", "Operations",
+         "Machine Learning", "Cloud", "Sales", "Agritech", "Hardware", "Content", "Security"]
+WORDS = ("build maintain analyze design deploy support research improve automate document test review "
+         "customers dashboards pipelines models reports campaigns systems services tools teams users data "
+         "platform mobile web api growth quality process insights experiments infrastructure").split()
+COMPANIES = ["Innovate", "Nimbus", "Kisan", "Vertex", "Bluefin", "Orbit", "Saffron", "Quanta", "Helix", "Monsoon"]
+
+
+def synthetic_posting(rng: random.Random, posting_id: int, skills: List[str]) -> dict:
+    area = rng.choice(AREAS)
+    company = f"{rng.choice(COMPANIES)} {rng.choice(['Labs', 'Corp', 'Tech', 'Foundation'])}"
+    sentence = lambda n: ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+    return {
+        "id": posting_id,
+        "title": f"{area} {rng.choice(TITLES)}",
+        "company": company,
+        "yourSkills": rng.sample(skills, 3),
+        "missingSkills": rng.sample(skills, 2),
+        "description": ' '.join(sentence(rng.randint(8, 16)) for _ in range(3)),
+        "responsibilities": [sentence(rng.randint(6, 12)) for _ in range(3)],
+        "qualifications": [sentence(rng.randint(6, 12)) for _ in range(3)],
+        "companyInfo": f"{company} works on {area.lower()}. " + sentence(12),
+    }
+
+def synthetic_queries(rng: random.Random, postings: List[dict], count: int) -> List[str]:
+    queries = []
+    for _ in range(count):
+        terms = tokenize(rng.choice(postings)['title'] + ' ' + ' '.join(rng.choice(postings)['yourSkills']))
+        queries.append(' '.join(rng.sample(terms, min(len(terms), rng.randint(1, 3)))))
+    return queries
+
+def time_queries(index: SearchIndex, queries: List[str], prefix: bool) -> List[float]:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, limit=20, prefix=prefix)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def bench_size(size: int, query_count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    skills = list(get_taxonomy().names)
+    postings = [synthetic_posting(rng, posting_id, skills) for posting_id in range(1, size + 1)]
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    index.update(postings)
+    build_seconds = time.perf_counter() - started
+
+    queries = synthetic_queries(rng, postings, query_count)
+    # Search-as-you-type: the query cut off partway through its last word
+    typed = [query[:max(len(query) - 3, 2)] for query in queries]
+    cold = time_queries(index, queries, False) + time_queries(index, typed, True)
+
+    edited = list(postings)
+    for position in rng.sample(range(size), max(1, size // 100)):
+        edited[position] = dict(edited[position], description=edited[position]['description'] + ' Remote friendly.')
+    update = index.update(edited)
+
+    return {
+        "postings": size,
+        "terms": len(index._postings),
+        "build_seconds": round(build_seconds, 3),
+        "update_1pct": update,
+        "cold_query": percentiles(cold),
+        "query": percentiles(time_queries(index, queries, False)),
+        "prefix_query": percentiles(time_queries(index, typed, True)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog search benchmark")
+    parser.add_argument('--postings', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default='bench_search_results.json')
+    args = parser.parse_args()
+
+    results = {"python": platform.python_version(), "sizes": []}
+    for size in args.postings:
+        result = bench_size(size, args.queries, args.seed)
+        results["sizes"].append(result)
+        print(f"{size} postings, {result['terms']} terms: built in {result['build_seconds']}s, "
+              f"1% update in {result['update_1pct']['seconds']}s")
+        for label in ('cold_query', 'query', 'prefix_query'):
+            stats = result[label]
+            print(f"  {label:13s} p50 {stats['p50_ms']:.2f}ms  p95 {stats['p95_ms']:.2f}ms  p99 {stats['p99_ms']:.2f}ms")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+# backend/bulk_profiles.py - Bulk profile import and export (CSV / JSONL)
+#
+# Usage:
+#   python bulk_profiles.py import students.csv --errors import_errors.jsonl
+#   python bulk_profiles.py export --format jsonl --output profiles.jsonl
+#
+# The command line works on the SQLite database directly (start app_sqlite.py
+# once first so the schema exists). The apps expose the same import and export
+# as /api/admin/profiles/import and /api/admin/profiles/export, except that the
+# API only takes rows with a password_hash: hashing plaintext passwords costs
+# about 170ms of CPU per row with the default scrypt settings, which belongs in
+# this separate process rather than in a web worker.
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from auth import DEFAULT_HASH_METHOD, PasswordHasher, is_password_hash
+from metrics import PROFILE_IMPORT_ROWS, stage
+
+# Columns of `users` an import may set, besides name, email and the password
+PROFILE_COLUMNS = ['skills', 'highest_qualification', 'field_of_study', 'work_experience',
+                   'work_experience_details', 'internet_access', 'languages', 'internship_mode', 'commitment',
+                   'preferred_industries', 'preferred_tasks', 'stipend_requirement', 'stay_away', 'relocation',
+                   'special_support', 'document_readiness', 'contact_consent']
+IMPORT_COLUMNS = ['name', 'email', 'password', 'password_hash', 'profile_complete'] + PROFILE_COLUMNS
+INSERT_COLUMNS = ['name', 'email', 'password_hash', 'profile_complete'] + PROFILE_COLUMNS
+# Never includes password_hash
+EXPORT_COLUMNS = ['id', 'name', 'email', 'profile_complete'] + PROFILE_COLUMNS + \
+                 ['preference_tags', 'created_at', 'updated_at']
+# Present in exports and ignored on import, so an export can be edited and loaded elsewhere
+EXPORT_ONLY_COLUMNS = set(EXPORT_COLUMNS) - set(IMPORT_COLUMNS)
+
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+_EMAIL = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+_TRUE = {'1', 'true', 'yes', 'y'}
+_FALSE = {'0', 'false', 'no', 'n'}
+
+# (line number, row, error): row is None when the line could not be read
+SourceRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportBusyError(Exception):
+    """Raised when another import is already writing in this process."""
+
+
+# --- Reading ---
+
+def detect_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    fmt = requested or _EXTENSIONS.get(os.path.splitext(filename or '')[1].lower())
+    if fmt not in FORMATS:
+        raise ValueError("Unsupported format, expected .csv or .jsonl (or ?format=csv|jsonl)")
+    return fmt
+
+def read_csv(stream) -> Iterator[SourceRow]:
+    """Rows of a CSV file with a header line. Unknown header columns reject the whole file."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = [name.strip() for name in reader.fieldnames or []]
+    unknown = sorted(set(header) - set(IMPORT_COLUMNS) - EXPORT_ONLY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown column(s) in header: {', '.join(unknown)}")
+    reader.fieldnames = header
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, "More values than header columns"
+        else:
+            yield reader.line_num, row, None
+
+def read_jsonl(stream) -> Iterator[SourceRow]:
+    """One JSON object per line; blank lines are skipped."""
+    for line_no, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+
+def read_rows(stream, fmt: str) -> Iterator[SourceRow]:
+    """stream is a binary file object."""
+    return read_csv(stream) if fmt == 'csv' else read_jsonl(stream)
+
+
+def _clean(value) -> Optional[str]:
+    if isinstance(value, list):
+        # Same ", "-joined form submit_quiz stores
+        value = ", ".join(str(item).strip() for item in value if str(item).strip())
+    elif value is not None:
+        value = str(value).strip()
+    return value or None
+
+def validate_row(row) -> Tuple[Optional[dict], Optional[str]]:
+    """(record with one value per IMPORT_COLUMNS entry, None) or (None, error)."""
+    if not isinstance(row, dict):
+        return None, "Row must be an object"
+    unknown = sorted(set(row) - set(IMPORT_COLUMNS) - EXPORT_ONLY_COLUMNS)
+    if unknown:
+        return None, f"Unknown column(s): {', '.join(unknown)}"
+
+    record = {column: _clean(row.get(column)) for column in IMPORT_COLUMNS}
+    if not record['name'] or not record['email']:
+        return None, "Missing required fields: name and email"
+    if not _EMAIL.fullmatch(record['email']):
+        return None, "Invalid email address"
+    if bool(record['password']) == bool(record['password_hash']):
+        return None, "Exactly one of password or password_hash is required"
+    if record['password_hash'] and not is_password_hash(record['password_hash']):
+        return None, "password_hash is not a supported hash format"
+
+    complete = (record['profile_complete'] or '').lower()
+    if not complete:
+        # Rows carrying quiz answers count as onboarded, like after /api/quiz/submit
+        record['profile_complete'] = any(record[column] for column in PROFILE_COLUMNS if column != 'skills')
+    elif complete in _TRUE or complete in _FALSE:
+        record['profile_complete'] = complete in _TRUE
+    else:
+        return None, "profile_complete must be true or false"
+    return record, None
+
+
+# --- Import ---
+
+class ImportReport:
+    def __init__(self, max_errors: Optional[int] = None):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def add_imported(self, count: int):
+        self.imported += count
+        PROFILE_IMPORT_ROWS.labels('imported').inc(count)
+
+    def add_error(self, line: int, email: Optional[str], message: str):
+        self.failed += 1
+        PROFILE_IMPORT_ROWS.labels('failed').inc()
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "email": email, "error": message})
+
+    def finish(self) -> 'ImportReport':
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round((self.imported + self.failed) / self.seconds, 1) if self.seconds else None,
+            "errors": self.errors,
+            "errors_truncated": len(self.errors) < self.failed,
+        }
+
+
+class ProfileImporter:
+    """
+    Loads validated rows into `users` in chunks: one existence check, one
+    executemany INSERT, the profile index and recommendation dirty marks, then
+    one commit per chunk. If a chunk's INSERT fails (e.g. an email taken since
+    the check) it is retried row by row to find the bad rows.
+
+    Plaintext passwords in a chunk are hashed together on the importer's own
+    PasswordHasher. Without a hasher (hasher=None, as in the apps) rows with
+    a plaintext password are rejected and only password_hash rows load.
+
+    Works against SQLite and MySQL like RecommendationStore: pass the app's
+    get_db_connection and the driver's placeholder.
+    """
+
+    def __init__(self, get_connection: Callable, hasher: Optional[PasswordHasher], profile_index, recommendation_store,
+                 placeholder: str = '?', chunk_size: int = 500):
+        self.get_connection = get_connection
+        self.hasher = hasher
+        self.profile_index = profile_index
+        self.recommendation_store = recommendation_store
+        self.ph = placeholder
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = self.get_connection()
+        if conn is None:
+            raise ConnectionError("Database connection failed")
+        return conn
+
+    def import_rows(self, rows: Iterable[SourceRow], max_errors: Optional[int] = None) -> ImportReport:
+        # One import at a time: SQLite has a single writer, and the hasher is sized for one chunk
+        if not self._lock.acquire(blocking=False):
+            raise ImportBusyError("Another import is in progress")
+        try:
+            report = ImportReport(max_errors)
+            seen = set()
+            chunk = []
+            for line, row, error in rows:
+                record = None
+                if error is None:
+                    record, error = validate_row(row)
+                if error is None and record['password'] and self.hasher is None:
+                    error = "Plaintext passwords are only accepted by the command line import; send password_hash"
+                if error is None and record['email'] in seen:
+                    error = "Duplicate email in file"
+                if error is not None:
+                    report.add_error(line, row.get('email') if isinstance(row, dict) else None, error)
+                    continue
+                seen.add(record['email'])
+                chunk.append((line, record))
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(chunk, report)
+                    chunk = []
+            if chunk:
+                self._write_chunk(chunk, report)
+            return report.finish()
+        finally:
+            self._lock.release()
+
+    def _write_chunk(self, chunk: List[Tuple[int, dict]], report: ImportReport):
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            marks = ', '.join([self.ph] * len(chunk))
+            cursor.execute(f'SELECT email FROM users WHERE email IN ({marks})',
+                           tuple(record['email'] for _, record in chunk))
+            existing = {row[0] for row in cursor.fetchall()}
+            pending = []
+            for line, record in chunk:
+                if record['email'] in existing:
+                    report.add_error(line, record['email'], "User with this email already exists")
+                else:
+                    pending.append((line, record))
+
+            ready = self._hash_passwords(pending, report)
+            try:
+                self._insert(cursor, [record for _, record in ready])
+                conn.commit()
+                report.add_imported(len(ready))
+            except Exception:
+                conn.rollback()
+                for line, record in ready:
+                    try:
+                        self._insert(cursor, [record])
+                        conn.commit()
+                        report.add_imported(1)
+                    except Exception as e:
+                        conn.rollback()
+                        report.add_error(line, record['email'], str(e))
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _hash_passwords(self, pending: List[Tuple[int, dict]], report: ImportReport) -> List[Tuple[int, dict]]:
+        with stage('import_hash'):
+            futures = [(line, record, self.hasher.hash_async(record['password']) if record['password'] else None)
+                       for line, record in pending]
+            ready = []
+            for line, record, future in futures:
+                if future is not None:
+                    try:
+                        record['password_hash'] = future.result()
+                    except Exception as e:
+                        report.add_error(line, record['email'], f"Password hashing failed: {e}")
+                        continue
+                ready.append((line, record))
+            return ready
+
+    def _insert(self, cursor, records: List[dict]):
+        if not records:
+            return
+        marks = ', '.join([self.ph] * len(INSERT_COLUMNS))
+        cursor.executemany(f'INSERT INTO users ({", ".join(INSERT_COLUMNS)}) VALUES ({marks})',
+                           [tuple(record[column] for column in INSERT_COLUMNS) for record in records])
+        emails = [record['email'] for record in records]
+        self.profile_index.sync_many(cursor, emails)
+        dirty = [self.recommendation_store.dirty_statement(email) for email in emails]
+        cursor.executemany(dirty[0][0], [params for _, params in dirty])
+
+
+# --- Export ---
+
+def export_columns(fields: Optional[str] = None) -> List[str]:
+    """EXPORT_COLUMNS, or the requested comma-separated subset in that order."""
+    if not fields:
+        return list(EXPORT_COLUMNS)
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = sorted(set(requested) - set(EXPORT_COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return [column for column in EXPORT_COLUMNS if column in requested]
+
+def export_rows(get_connection: Callable, columns: Sequence[str], placeholder: str = '?',
+                batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Every user as a dict, in id order. Pages by id with a fresh query per
+    batch, so a slow reader never holds a long-running read transaction open.
+    """
+    selected = ['id'] + [column for column in columns if column != 'id']
+    last_id = 0
+    while True:
+        conn = get_connection()
+        if conn is None:
+            raise ConnectionError("Database connection failed")
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'SELECT {", ".join(selected)} FROM users WHERE id > {placeholder} '
+                           f'ORDER BY id LIMIT {int(batch_size)}', (last_id,))
+            batch = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+        for row in batch:
+            profile = dict(zip(selected, row))
+            if 'profile_complete' in profile:
+                profile['profile_complete'] = bool(profile['profile_complete'])
+            yield {column: profile[column] for column in columns}
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1][0]
+
+def encode_rows(rows: Iterable[dict], columns: Sequence[str], fmt: str, rows_per_chunk: int = 500) -> Iterator[str]:
+    """Serialized output in chunks of text, for a streaming response or a file."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        if writer:
+            writer.writerow([row[column] for column in columns])
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# --- Command line ---
+
+def _sqlite_connection_factory(database: str):
+    from db_pool import SQLiteConnectionPool
+    pool = SQLiteConnectionPool(database)
+    conn = pool.get_connection()
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone() is None:
+            sys.exit(f"{database} has no users table; start app_sqlite.py once to create the schema")
+    finally:
+        conn.close()
+    return pool.get_connection
+
+def run_import(args):
+    from catalog import InternshipCatalog
+    from profiles import ProfileIndex
+    from recommendations import RecommendationStore
+
+    get_connection = _sqlite_connection_factory(args.db)
+    recommendation_store = RecommendationStore(get_connection, InternshipCatalog(args.catalog))
+    recommendation_store.init_tables()
+    hasher = PasswordHasher(method=args.hash_method, workers=args.workers, max_pending=args.chunk_size)
+    importer = ProfileImporter(get_connection, hasher, ProfileIndex('?'), recommendation_store,
+                               chunk_size=args.chunk_size)
+    with open(args.file, 'rb') as stream:
+        report = importer.import_rows(read_rows(stream, detect_format(args.file, args.format)))
+
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8') as f:
+            for error in report.errors:
+                f.write(json.dumps(error) + '\n')
+    else:
+        for error in report.errors:
+            print(f"line {error['line']} ({error['email']}): {error['error']}", file=sys.stderr)
+    summary = report.to_dict()
+    print(f"Imported {summary['imported']}, failed {summary['failed']} in {summary['seconds']}s "
+          f"({summary['rows_per_second']} rows/s)")
+
+def run_export(args):
+    columns = export_columns(args.fields)
+    get_connection = _sqlite_connection_factory(args.db)
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        for text in encode_rows(export_rows(get_connection, columns), columns, args.format):
+            out.write(text)
+    finally:
+        if args.output:
+            out.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk profile import and export")
+    parser.add_argument('--db', default='internship_navigator.db', help="SQLite database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help="Load users from a CSV or JSONL file")
+    importer.add_argument('file')
+    importer.add_argument('--format', choices=sorted(FORMATS), help="Default: from the file extension")
+    importer.add_argument('--chunk-size', type=int, default=500, help="Rows per transaction")
+    importer.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 2),
+                          help="Password hashing threads (default: up to 4)")
+    importer.add_argument('--hash-method', default=DEFAULT_HASH_METHOD)
+    importer.add_argument('--catalog', default='internships.json')
+    importer.add_argument('--errors', help="Write per-row errors here as JSONL instead of stderr")
+
+    exporter = commands.add_parser('export', help="Write every user's profile as CSV or JSONL")
+    exporter.add_argument('--format', choices=sorted(FORMATS), default='csv')
+    exporter.add_argument('--fields', help=f"Comma-separated subset of: {', '.join(EXPORT_COLUMNS)}")
+    exporter.add_argument('--output', '-o', help="Default: stdout")
+
+    args = parser.parse_args()
+    try:
+        run_import(args) if args.command == 'import' else run_export(args)
+    except ValueError as e:
+        sys.exit(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# backend/catalog.py - In-memory, indexed internship catalog
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from responses import encode_json
+
+
+def parse_stipend(stipend: Optional[str]) -> int:
+    """'₹12,000/month' -> 12000. Unpaid or unparseable stipends count as 0."""
+    digits = re.sub(r'[^\d]', '', (stipend or '').split('/')[0])
+    return int(digits) if digits else 0
+
+def internship_skills(internship: dict) -> List[str]:
+    return list(internship.get('yourSkills') or []) + list(internship.get('missingSkills') or [])
+
+def _location_keys(location: Optional[str]) -> List[str]:
+    # "Bengaluru, IN" is indexed under both the full string and the city
+    if not location:
+        return []
+    full = location.strip().lower()
+    city = full.split(',')[0].strip()
+    return [full] if city == full else [full, city]
+
+
+class CatalogSnapshot:
+    """
+    One immutable, fully indexed version of the catalog. Reloading builds a new
+    snapshot and swaps it in, so readers never see a half-built index.
+    """
+
+    def __init__(self, raw: bytes, mtime: float):
+        self.internships = json.loads(raw)
+        self.etag = hashlib.sha1(raw).hexdigest()
+        self.last_modified = mtime
+        self.loaded_at = time.monotonic()  # orders snapshots even if the file's mtime went backwards
+        self.by_id = {item.get('id'): item for item in self.internships}
+        self.fields = {field for item in self.internships for field in item}
+        self.body = encode_json(self.internships)
+
+        self.mode_index = {}
+        self.location_index = {}
+        self.skill_index = {}
+        stipends = []
+        for position, item in enumerate(self.internships):
+            if item.get('mode'):
+                self.mode_index.setdefault(item['mode'].lower(), set()).add(position)
+            for key in _location_keys(item.get('location')):
+                self.location_index.setdefault(key, set()).add(position)
+            for skill in internship_skills(item):
+                self.skill_index.setdefault(skill.lower(), set()).add(position)
+            stipends.append((parse_stipend(item.get('stipend')), position))
+        stipends.sort()
+        self._stipend_values = [value for value, _ in stipends]
+        self._stipend_positions = [position for _, position in stipends]
+
+    def _stipend_range(self, minimum: Optional[int], maximum: Optional[int]) -> set:
+        lo = bisect.bisect_left(self._stipend_values, minimum) if minimum is not None else 0
+        hi = bisect.bisect_right(self._stipend_values, maximum) if maximum is not None else len(self._stipend_values)
+        return set(self._stipend_positions[lo:hi])
+
+    def query(self, mode: Optional[str] = None, location: Optional[str] = None,
+              min_stipend: Optional[int] = None, max_stipend: Optional[int] = None,
+              skills: Optional[Iterable[str]] = None, offset: int = 0,
+              limit: Optional[int] = None) -> Tuple[List[dict], int]:
+        """
+        Filters combine with AND; a posting matches `skills` if it lists any of
+        them. Returns the requested page and the total number of matches.
+        """
+        candidates = []
+        if mode:
+            candidates.append(self.mode_index.get(mode.lower(), set()))
+        if location:
+            candidates.append(self.location_index.get(location.strip().lower(), set()))
+        if min_stipend is not None or max_stipend is not None:
+            candidates.append(self._stipend_range(min_stipend, max_stipend))
+        if skills:
+            candidates.append(set().union(*(self.skill_index.get(s.lower(), set()) for s in skills)))
+
+        if candidates:
+            candidates.sort(key=len)
+            matches = sorted(candidates[0].intersection(*candidates[1:]))
+        else:
+            matches = range(len(self.internships))
+        total = len(matches)
+        page = matches[offset:offset + limit] if limit is not None else matches[offset:]
+        return [self.internships[position] for position in page], total
+
+
+class InternshipCatalog:
+    """
+    Loads internships.json once and reloads it only when the file's mtime or
+    size changes. The file is stat'ed at most once per check_interval seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> CatalogSnapshot:
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+                self._snapshot = CatalogSnapshot(raw, stat.st_mtime)
+                self._signature = signature
+            self._checked_at = now
+            return self._snapshot
+
+
+def query_from_args(args) -> Optional[dict]:
+    """
+    Reads filter and pagination parameters from request args. Returns None
+    when there are none, meaning the full pre-serialized catalog can be sent.
+    Raises ValueError on malformed numbers.
+    """
+    query = {}
+    if args.get('mode'):
+        query['mode'] = args['mode']
+    if args.get('location'):
+        query['location'] = args['location']
+    if args.get('min_stipend'):
+        query['min_stipend'] = int(args['min_stipend'])
+    if args.get('max_stipend'):
+        query['max_stipend'] = int(args['max_stipend'])
+    if args.get('skills'):
+        query['skills'] = [s.strip() for s in args['skills'].split(',') if s.strip()]
+    if args.get('page') or args.get('per_page'):
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 20))
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive")
+        query['offset'] = (page - 1) * per_page
+        query['limit'] = per_page
+    return query or None
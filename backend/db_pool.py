@@ -0,0 +1,412 @@
+# backend/db_pool.py - Pooled database connections for the Flask apps
+
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional
+
+from metrics import stage
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.in_use = 0
+        self.connections_opened = 0
+        self.health_check_failures = 0
+
+    def incr(self, name: str, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "connections_opened": self.connections_opened,
+                "health_check_failures": self.health_check_failures
+            }
+
+
+class TimedCursor:
+    """Cursor proxy that times statements and fetches into the "db" stage."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, *args):
+        with stage('db'):
+            return self._cursor.execute(*args)
+
+    def executemany(self, *args):
+        with stage('db'):
+            return self._cursor.executemany(*args)
+
+    def fetchone(self):
+        with stage('db'):
+            return self._cursor.fetchone()
+
+    def fetchall(self):
+        with stage('db'):
+            return self._cursor.fetchall()
+
+
+class PooledConnection:
+    """
+    Hands out the real connection's API unchanged, but close() gives the
+    connection back to its pool instead of tearing it down. Statements, fetches
+    and commits are timed into the "db" stage.
+
+    Use it as `with pool.get_connection() as conn:` so the connection goes back
+    even when a statement raises. Unlike sqlite3's own context manager, leaving
+    the block does not commit; uncommitted work is rolled back on release.
+    """
+
+    def __init__(self, conn, release):
+        self._conn = conn
+        self._release = release
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs))
+
+    def execute(self, *args):
+        # sqlite3 shortcut; returns a plain cursor, so its fetches are not timed
+        with stage('db'):
+            return self._conn.execute(*args)
+
+    def commit(self):
+        with stage('db'):
+            return self._conn.commit()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._release(self._conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def release_after_request(app, get_connection: Callable) -> Callable:
+    """
+    Wraps a Flask app's get_connection so every connection checked out during
+    a request is also closed when the request ends. Handlers still close their
+    own; this is the backstop for one that raised first, which would otherwise
+    keep its connection out of the pool for good.
+    """
+    from flask import g, has_request_context
+
+    def get_request_connection():
+        conn = get_connection()
+        if conn is not None and has_request_context():
+            g.setdefault('db_connections', []).append(conn)
+        return conn
+
+    @app.teardown_request
+    def _release_request_connections(exc):
+        # close() is a no-op for connections the handler already gave back
+        for conn in g.pop('db_connections', []):
+            conn.close()
+
+    return get_request_connection
+
+
+class MySQLConnectionPool:
+    """
+    mysql.connector's pool fails immediately when it is exhausted, so checkouts
+    go through a semaphore that waits up to `timeout` seconds for a free slot.
+    Connections are pinged on checkout and reconnected if the server dropped them.
+    """
+
+    def __init__(self, db_config: dict, pool_size: int = 10, timeout: float = 5.0,
+                 health_check: bool = True, pool_name: str = 'internship_navigator'):
+        # Imported here so the SQLite app does not need the MySQL driver
+        from mysql.connector import pooling
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.metrics = PoolMetrics()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name=pool_name, pool_size=pool_size, pool_reset_session=True, **db_config
+        )
+        self.metrics.incr('connections_opened', pool_size)
+
+    def _acquire_slot(self):
+        if self._slots.acquire(blocking=False):
+            return
+        self.metrics.incr('waits')
+        started = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        self.metrics.incr('wait_seconds', time.perf_counter() - started)
+        if not acquired:
+            self.metrics.incr('timeouts')
+            raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+
+    def get_connection(self) -> PooledConnection:
+        with stage('db_pool_wait'):
+            self._acquire_slot()
+        try:
+            conn = self._pool.get_connection()
+            if self.health_check:
+                try:
+                    conn.ping(reconnect=True, attempts=1)
+                except Exception:
+                    self.metrics.incr('health_check_failures')
+                    raise
+        except Exception:
+            self._slots.release()
+            raise
+        self.metrics.incr('checkouts')
+        self.metrics.incr('in_use')
+        return PooledConnection(conn, self._release)
+
+    def _release(self, conn):
+        try:
+            # The pooled connection's own close() returns it to mysql.connector's pool
+            conn.close()
+        finally:
+            self.metrics.incr('in_use', -1)
+            self._slots.release()
+
+
+def sqlite_pragmas(timeout: float, cache_size_kb: int, mmap_size: int) -> List[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA cache_size=-{cache_size_kb}",
+        f"PRAGMA mmap_size={mmap_size}",
+        f"PRAGMA busy_timeout={int(timeout * 1000)}"
+    ]
+
+
+class SQLiteConnectionPool:
+    """
+    Up to `pool_size` connections shared by every thread. A checkout takes an
+    idle connection, opens a new one while under the limit, or waits up to
+    `timeout` seconds and raises PoolTimeoutError. The PRAGMAs run once, when
+    a connection is opened, so servers that start a thread per request (the
+    Flask dev server) still reuse warm connections. Connections run in WAL
+    mode so readers don't block the writer, and a busy timeout makes
+    concurrent writers wait instead of failing with "database is locked".
+    """
+
+    def __init__(self, database: str, pool_size: int = 10, timeout: float = 5.0, health_check: bool = True,
+                 cache_size_kb: int = 8192, mmap_size: int = 64 * 1024 * 1024):
+        self.database = database
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.pragmas = sqlite_pragmas(timeout, cache_size_kb, mmap_size)
+        self.metrics = PoolMetrics()
+        # LIFO, so the most recently used connection (and its page cache) goes out first
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        # Each connection is used by one thread at a time, but not always the same one
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        self.metrics.incr('connections_opened')
+        return conn
+
+    def _open_slot(self) -> bool:
+        with self._lock:
+            if self._opened >= self.pool_size:
+                return False
+            self._opened += 1
+            return True
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._opened -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        if self._open_slot():
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        self.metrics.incr('waits')
+        started = time.perf_counter()
+        try:
+            with stage('db_pool_wait'):
+                return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            self.metrics.incr('timeouts')
+            raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+        finally:
+            self.metrics.incr('wait_seconds', time.perf_counter() - started)
+
+    def get_connection(self) -> PooledConnection:
+        conn = self._checkout()
+        if self.health_check:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error:
+                self.metrics.incr('health_check_failures')
+                self._discard(conn)
+                conn = self._checkout()
+        self.metrics.incr('checkouts')
+        self.metrics.incr('in_use')
+        return PooledConnection(conn, self._release)
+
+    def _release(self, conn):
+        self.metrics.incr('in_use', -1)
+        try:
+            # Never hand a half-finished transaction to the next borrower
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+
+class AsyncPooledConnection:
+    """aiosqlite connection whose statements and commits are timed into the "db" stage."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    async def execute(self, sql: str, params=()):
+        with stage('db'):
+            return await self._conn.execute(sql, params)
+
+    async def executemany(self, sql: str, rows):
+        with stage('db'):
+            return await self._conn.executemany(sql, rows)
+
+    async def fetchone(self, sql: str, params=()):
+        with stage('db'):
+            cursor = await self._conn.execute(sql, params)
+            try:
+                return await cursor.fetchone()
+            finally:
+                await cursor.close()
+
+    async def commit(self):
+        with stage('db'):
+            await self._conn.commit()
+
+
+class AsyncSQLitePool:
+    """
+    A fixed set of aiosqlite connections for the event loop. Each aiosqlite
+    connection runs its statements on its own thread, so `size` bounds how many
+    queries are in progress at once; waiting for a free connection never blocks
+    the loop. Same WAL pragmas and metrics as SQLiteConnectionPool.
+    """
+
+    def __init__(self, database: str, size: int = 4, timeout: float = 5.0,
+                 cache_size_kb: int = 8192, mmap_size: int = 64 * 1024 * 1024):
+        self.database = database
+        self.pool_size = size
+        self.timeout = timeout
+        self.pragmas = sqlite_pragmas(timeout, cache_size_kb, mmap_size)
+        self.metrics = PoolMetrics()
+        self._idle: Optional[asyncio.Queue] = None
+        self._opened = 0
+
+    async def _open(self):
+        # Imported here so the WSGI apps do not need aiosqlite
+        import aiosqlite
+
+        conn = await aiosqlite.connect(self.database, timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            await conn.execute(pragma)
+        self.metrics.incr('connections_opened')
+        return conn
+
+    async def _checkout(self):
+        if self._idle is None:
+            # Created lazily so the queue belongs to the running event loop
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._opened < self.pool_size:
+            self._opened += 1
+            try:
+                return await self._open()
+            except Exception:
+                self._opened -= 1
+                raise
+        if self._idle.empty():
+            self.metrics.incr('waits')
+        started = time.perf_counter()
+        try:
+            with stage('db_pool_wait'):
+                return await asyncio.wait_for(self._idle.get(), self.timeout)
+        except asyncio.TimeoutError:
+            self.metrics.incr('timeouts')
+            raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+        finally:
+            self.metrics.incr('wait_seconds', time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self._checkout()
+        self.metrics.incr('checkouts')
+        self.metrics.incr('in_use')
+        try:
+            yield AsyncPooledConnection(conn)
+        finally:
+            try:
+                # Same rule as the sync pool: no half-finished transaction goes back
+                if conn.in_transaction:
+                    await conn.rollback()
+            finally:
+                self.metrics.incr('in_use', -1)
+                self._idle.put_nowait(conn)
+
+    async def close(self):
+        while self._idle is not None and not self._idle.empty():
+            await self._idle.get_nowait().close()
+            self._opened -= 1
@@ -1,62 +1,240 @@
 # backend/extractor.py
 
+import gc
+import os
 import re
+import threading
+import time
 import spacy
-from typing import Optional, List
-
-# Load models once at the module level
-nlp = spacy.load('en_core_web_sm')
-skill_nlp = spacy.load('en_core_web_sm')
-
-# Prepare the skills ruler once
-SKILLS_LIST = [
-    "Python", "Java", "C++", "JavaScript", "React", "Node.js", "SQL", "Git",
-    "Docker", "Kubernetes", "AWS", "Azure", "GCP", "TensorFlow", "PyTorch",
-    "Scikit-learn", "Pandas", "Numpy", "Machine Learning", "Deep Learning",
-    "Data Analysis", "Project Management", "Agile", "Scrum", "Team Leadership"
-]
-patterns = [{"label": "SKILL", "pattern": [{"LOWER": skill.lower()}]} for skill in SKILLS_LIST]
-ruler = skill_nlp.add_pipe("entity_ruler", before="ner")
-ruler.add_patterns(patterns)
-
-
-def extract_email(text: str) -> Optional[str]:
-    match = re.search(r'[\w\.-]+@[\w\.-]+', text)
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+from typing import Optional, List, Tuple, Union
+
+from sections import SEGMENTER_VERSION
+from taxonomy import SkillTaxonomy, get_taxonomy
+
+MODEL_NAME = 'en_core_web_sm'
+
+# Components the extractors never read from. Excluding them means each resume
+# only goes through tokenization and NER.
+EXCLUDED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+TextOrDoc = Union[str, Doc]
+# (label, text) pairs, e.g. merged from the windows of a long document
+Entities = List[Tuple[str, str]]
+
+# Texts longer than this go through the pipeline in overlapping windows, so no
+# single Doc grows with the document and spaCy's max_length is never reached.
+# The overlap must be longer than any entity or skill phrase.
+WINDOW_CHARS = 20000
+WINDOW_OVERLAP_CHARS = 400
+
+# Contact fields are plain regexes and never need the pipeline
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+')
+PHONE_RE = re.compile(r'(\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+
+# A single pipeline per process, loaded on first use rather than at import so
+# that processes which never analyze a resume never pay for it. Skills are not
+# entities: they are matched on the same Doc's tokens by a PhraseMatcher
+# compiled from the taxonomy.
+_nlp: Optional[Language] = None
+_nlp_lock = threading.Lock()
+_model_stats = {"loaded": False, "load_seconds": None, "rss_before_bytes": None, "rss_after_bytes": None}
+
+_skill_matcher: Optional[Tuple[SkillTaxonomy, PhraseMatcher]] = None
+_skill_matcher_lock = threading.Lock()
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def get_nlp() -> Language:
+    """Loads the pipeline once per process; safe to call from any thread."""
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            rss_before = current_rss_bytes()
+            started = time.perf_counter()
+            nlp = spacy.load(MODEL_NAME, exclude=EXCLUDED_COMPONENTS)
+            _model_stats.update(
+                loaded=True,
+                load_seconds=round(time.perf_counter() - started, 3),
+                rss_before_bytes=rss_before,
+                rss_after_bytes=current_rss_bytes()
+            )
+            _nlp = nlp
+        return _nlp
+
+def preload_models():
+    """
+    Loads the pipeline and skill matcher up front. Call it in a pre-fork master
+    (e.g. gunicorn --preload) so workers share the model pages copy-on-write;
+    objects are then frozen out of the GC so collections in the workers don't
+    touch, and therefore copy, those pages.
+    """
+    get_nlp()
+    skill_matcher()
+    gc.collect()
+    gc.freeze()
+
+def model_stats() -> dict:
+    return dict(_model_stats)
+
+def skill_matcher() -> Tuple[SkillTaxonomy, PhraseMatcher]:
+    """
+    The PhraseMatcher for the current taxonomy, recompiled when the taxonomy
+    file is reloaded. Each canonical skill is its own match key, so a hit maps
+    back to its canonical name without scanning the skill list.
+    """
+    global _skill_matcher
+    taxonomy = get_taxonomy()
+    current = _skill_matcher
+    if current is not None and current[0] is taxonomy:
+        return current
+    with _skill_matcher_lock:
+        if _skill_matcher is None or _skill_matcher[0] is not taxonomy:
+            nlp = get_nlp()
+            matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            for name, terms in taxonomy.terms.items():
+                matcher.add(name, list(nlp.tokenizer.pipe(terms)))
+            _skill_matcher = (taxonomy, matcher)
+        return _skill_matcher
+
+def analysis_version() -> str:
+    """
+    Identifies the model, skill taxonomy and section rules behind a result.
+    Cached analyses are keyed on this, so changing any of them invalidates them. Reads the
+    installed package version so a cache hit never has to load the model.
+    """
+    taxonomy = get_taxonomy()
+    model_version = spacy.util.get_package_version(MODEL_NAME)
+    return f"{MODEL_NAME}-{model_version}-{taxonomy.version}-{taxonomy.digest}-s{SEGMENTER_VERSION}"
+
+
+def make_doc(text: str) -> Doc:
+    """Runs the shared pipeline once; pass the result to every extractor."""
+    return get_nlp()(text)
+
+def _as_doc(text_or_doc: TextOrDoc) -> Doc:
+    return text_or_doc if isinstance(text_or_doc, Doc) else make_doc(text_or_doc)
+
+def _as_text(text_or_doc: TextOrDoc) -> str:
+    return text_or_doc.text if isinstance(text_or_doc, Doc) else text_or_doc
+
+def _entities(source: Union[TextOrDoc, Entities]) -> Entities:
+    if isinstance(source, list):
+        return source
+    return [(ent.label_, ent.text) for ent in _as_doc(source).ents]
+
+
+# --- Windowed processing for long texts ---
+
+def text_windows(text: str, size: int = WINDOW_CHARS,
+                 overlap: int = WINDOW_OVERLAP_CHARS) -> List[Tuple[int, int, int, int]]:
+    """
+    Overlapping windows covering text as (start, end, own_start, own_end)
+    offsets, cut at line breaks or spaces where possible. Each position is
+    owned by exactly one window, the boundary falling mid-overlap, so an
+    entity is kept from the one window that sees it with context on both sides.
+    """
+    bounds = []
+    start = 0
+    while True:
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = max(text.rfind('\n', start + size // 2, end), text.rfind(' ', start + size // 2, end))
+            if cut != -1:
+                end = cut + 1
+        bounds.append((start, end))
+        if end >= len(text):
+            break
+        next_start = max(end - overlap, start + 1)
+        space = text.find(' ', next_start, end)
+        start = space + 1 if space != -1 else next_start
+    windows = []
+    for i, (start, end) in enumerate(bounds):
+        own_start = 0 if i == 0 else (bounds[i - 1][1] + start) // 2
+        own_end = len(text) if i == len(bounds) - 1 else (end + bounds[i + 1][0]) // 2
+        windows.append((start, end, own_start, own_end))
+    return windows
+
+def owned_entities(doc: Doc, window: Tuple[int, int, int, int]) -> Entities:
+    """The entities of one window's Doc that start in the span the window owns."""
+    start, _, own_start, own_end = window
+    return [(ent.label_, ent.text) for ent in doc.ents if own_start <= start + ent.start_char < own_end]
+
+def ner_entities(text: str, deadline: Optional[float] = None) -> Tuple[Entities, int, bool]:
+    """
+    Entities of a text of any length, one window at a time: each window's Doc
+    is dropped before the next is processed. Stops early once
+    time.perf_counter() passes deadline. Returns (entities, tokens, timed_out).
+    """
+    windows = text_windows(text)
+    entities: Entities = []
+    tokens = 0
+    docs = get_nlp().pipe((text[start:end] for start, end, _, _ in windows), batch_size=1)
+    for position, (window, doc) in enumerate(zip(windows, docs)):
+        entities.extend(owned_entities(doc, window))
+        tokens += len(doc)
+        if deadline is not None and time.perf_counter() > deadline and position < len(windows) - 1:
+            return entities, tokens, True
+    return entities, tokens, False
+
+def match_skills(text: str, deadline: Optional[float] = None) -> Tuple[List[str], int, bool]:
+    """extract_skills_with_spacy window by window. Returns (skills, tokens, timed_out)."""
+    nlp = get_nlp()
+    windows = text_windows(text)
+    skills = set()
+    tokens = 0
+    for position, (start, end, _, _) in enumerate(windows):
+        doc = nlp.make_doc(text[start:end])
+        skills.update(extract_skills_with_spacy(doc))
+        tokens += len(doc)
+        if deadline is not None and time.perf_counter() > deadline and position < len(windows) - 1:
+            return list(skills), tokens, True
+    return list(skills), tokens, False
+
+
+def extract_email(text: TextOrDoc) -> Optional[str]:
+    match = EMAIL_RE.search(_as_text(text))
     return match.group(0) if match else None
 
-def extract_phone(text: str) -> Optional[str]:
-    pattern = r'(\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'
-    match = re.search(pattern, text)
+def extract_phone(text: TextOrDoc) -> Optional[str]:
+    match = PHONE_RE.search(_as_text(text))
     return match.group(0) if match else None
 
-def extract_name(text: str) -> Optional[str]:
-    doc = nlp(text)
-    for ent in doc.ents:
-        if ent.label_ == 'PERSON':
-            return ent.text
+def extract_name(text: Union[TextOrDoc, Entities]) -> Optional[str]:
+    for label, ent_text in _entities(text):
+        if label == 'PERSON':
+            return ent_text
     return None
 
-def extract_skills_with_spacy(text: str) -> List[str]:
-    # The model is already loaded and the ruler is configured
-    doc = skill_nlp(text)
-    
+def extract_skills_with_spacy(text: TextOrDoc) -> List[str]:
+    # Matching only needs tokens, so plain text skips the statistical pipeline
+    doc = text if isinstance(text, Doc) else get_nlp().make_doc(text)
+    _, matcher = skill_matcher()
+
     found_skills = set()
-    for ent in doc.ents:
-        if ent.label_ == "SKILL":
-            # Find the original case from the list for consistency
-            original_skill = next((s for s in SKILLS_LIST if s.lower() == ent.text.lower()), ent.text)
-            found_skills.add(original_skill)
-            
+    for match_id, _, _ in matcher(doc):
+        found_skills.add(doc.vocab.strings[match_id])
+
     return list(found_skills)
 
-def extract_education(text: str) -> List[str]:
-    doc = nlp(text)
+def extract_education(text: Union[TextOrDoc, Entities]) -> List[str]:
     universities = set()
     edu_keywords = ['university', 'college', 'institute', 'school']
-    
-    for ent in doc.ents:
-        if ent.label_ == 'ORG':
-            if any(keyword in ent.text.lower() for keyword in edu_keywords):
-                universities.add(ent.text)
-                
-    return list(universities)
\ No newline at end of file
+
+    for label, ent_text in _entities(text):
+        if label == 'ORG':
+            if any(keyword in ent_text.lower() for keyword in edu_keywords):
+                universities.add(ent_text)
+
+    return list(universities)
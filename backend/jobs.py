@@ -0,0 +1,235 @@
+# backend/jobs.py - Background resume-analysis jobs
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from main import analyze_resume
+from extractor import get_nlp
+from schema import ensure_column, run_migration
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue already holds its maximum number of pending jobs."""
+
+
+def _init_worker():
+    # Load the spaCy pipeline once per worker process, before its first job
+    get_nlp()
+
+def _run_job(filepath: str, options: dict) -> dict:
+    return analyze_resume(filepath, **options)
+
+
+class ResumeJobQueue:
+    """
+    Runs analyze_resume in a bounded pool of worker processes. Job state is kept
+    in a SQLite table so queued and finished jobs survive a restart; uploads that
+    were still pending when the process stopped are resubmitted on startup.
+
+    Several app processes can share the table (gunicorn workers, app.py next
+    to app_async.py). A process only dispatches a job after claiming it, which
+    moves the row from queued to running under its owner id in one UPDATE, so
+    each job runs once. On startup running rows are taken back only when their
+    owner process is gone.
+
+    Nothing starts when the queue is created: the worker pool is made, and
+    pending jobs resumed, by start() on first use in the serving process.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2, max_pending: int = 100,
+                 analysis_options: Optional[dict] = None):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.owner = None
+        # Extra keyword arguments for analyze_resume, e.g. the document caps
+        self.analysis_options = analysis_options or {}
+        self._executor = None
+        self._pid = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """
+        Creates this process's worker pool and resubmits jobs a stopped
+        process left pending. Called on first use, so importing an app starts
+        no processes and each worker of a pre-fork server gets its own pool.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._init_table()
+                self.owner = f"{socket.gethostname()}:{os.getpid()}"
+                self._futures = {}
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+                self._pid = os.getpid()
+                self._resume_pending()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_table(self):
+        def migrate(cursor):
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS resume_jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT,
+                    filepath TEXT,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Which process is running the job, as host:pid
+            ensure_column(cursor, False, 'resume_jobs', 'owner', 'TEXT')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_jobs_status ON resume_jobs(status)')
+        run_migration(self._connect, migrate)
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        host, _, pid = (owner or '').rpartition(':')
+        # Our own id on a row we haven't dispatched means an earlier process had our pid
+        if owner == self.owner or not pid.isdigit():
+            return False
+        if host != socket.gethostname():
+            return True  # can't check another machine; leave its jobs alone
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # exists, owned by another user
+        return True
+
+    def _claim(self, job_id: str, status: str, owner: Optional[str]) -> bool:
+        """Takes a job still in (status, owner) for this process. False if another process got there first."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                'UPDATE resume_jobs SET status = ?, owner = ?, updated_at = CURRENT_TIMESTAMP '
+                'WHERE id = ? AND status = ? AND owner IS ?',
+                (RUNNING, self.owner, job_id, status, owner)
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def _resume_pending(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT id, filepath, status, owner FROM resume_jobs WHERE status IN (?, ?)', (QUEUED, RUNNING)
+            ).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            if row['status'] == RUNNING and self._owner_alive(row['owner']):
+                continue
+            if not self._claim(row['id'], row['status'], row['owner']):
+                continue
+            if row['filepath'] and os.path.exists(row['filepath']):
+                self._dispatch(row['id'], row['filepath'])
+            else:
+                self._set_status(row['id'], FAILED, error="Upload was lost before analysis")
+
+    def _set_status(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                'UPDATE resume_jobs SET status = ?, result = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                (status, json.dumps(result) if result is not None else None, error, job_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _dispatch(self, job_id: str, filepath: str):
+        future = self._executor.submit(_run_job, filepath, self.analysis_options)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, filepath, f))
+
+    def _finish(self, job_id: str, filepath: str, future):
+        try:
+            self._set_status(job_id, DONE, result=future.result())
+        except Exception as e:
+            self._set_status(job_id, FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    @staticmethod
+    def _count_pending(conn) -> int:
+        return conn.execute(
+            'SELECT COUNT(*) FROM resume_jobs WHERE status IN (?, ?)', (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    def pending_count(self) -> int:
+        """Jobs queued or running in any process sharing the table."""
+        self.start()
+        conn = self._connect()
+        try:
+            return self._count_pending(conn)
+        finally:
+            conn.close()
+
+    def submit(self, filepath: str, filename: str) -> str:
+        """Queues an already-saved upload and returns its job id."""
+        self.start()
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            # The count and the insert share one write lock, so concurrent
+            # uploads can't all pass the check and overshoot max_pending
+            conn.execute('BEGIN IMMEDIATE')
+            if self._count_pending(conn) >= self.max_pending:
+                raise QueueFullError("Too many resumes are waiting to be analyzed")
+            # A new job is ours from the start, so it is inserted already claimed
+            conn.execute(
+                'INSERT INTO resume_jobs (id, filename, filepath, status, owner) VALUES (?, ?, ?, ?, ?)',
+                (job_id, filename, filepath, RUNNING, self.owner)
+            )
+            conn.commit()
+        finally:
+            # Rolls back whatever was not committed
+            conn.close()
+        self._dispatch(job_id, filepath)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self.start()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT id, filename, status, result, error, created_at, updated_at FROM resume_jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        with self._lock:
+            future = self._futures.get(job_id)
+        # Claimed jobs are running as far as other processes are concerned, but
+        # may still be waiting for a free worker here
+        if job['status'] == RUNNING and future is not None and not (future.running() or future.done()):
+            job['status'] = QUEUED
+        return job
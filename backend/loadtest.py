@@ -0,0 +1,279 @@
+# backend/loadtest.py - Load generator and latency SLO report for the Flask API
+#
+# Usage:
+#   python loadtest.py --concurrency 1 4 16 64 --duration 20 --output loadtest_results.json
+#   python loadtest.py --url http://127.0.0.1:5000 ...   # an already running app.py (MySQL)
+#
+# Without --url, app_sqlite.py (or app_async.py with --app async) is started in
+# a subprocess against a fresh SQLite database in a temporary directory, seeded
+# with synthetic users.
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from bench_resume import percentiles
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Route mix: (name, weight). Weights roughly follow dashboard traffic; logins
+# are rare since a session token is reused across requests.
+ROUTE_MIX = [
+    ("login", 2),
+    ("get_profile", 25),
+    ("update_profile", 5),
+    ("quiz_submit", 5),
+    ("internships", 35),
+    ("recommended", 15),
+]
+
+QUIZ_ANSWERS = {
+    "internship_mode": ["In-office", "Hybrid", "Fully remote", "No preference"],
+    "preferred_industries": [["IT / Computers"], ["Business / Accounts / Finance", "Sales / Retail"], ["NGO / Social impact"]],
+    "stipend_requirement": ["Yes — stipend is necessary", "Prefer stipend but can consider otherwise", "No — I can do without stipend"],
+    "skills": [["Python", "SQL"], ["React", "JavaScript", "CSS"], ["Excel", "Communication"], ["Machine Learning", "Pandas"]],
+}
+
+
+class Client:
+    """One simulated user on its own keep-alive connection."""
+
+    def __init__(self, host: str, port: int, email: str, password: str, rng: random.Random):
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.token = "loadtest"
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> (int, bytes):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            return 0, b""
+
+    def login(self) -> int:
+        status, body = self.request("POST", "/api/login", {"email": self.email, "password": self.password})
+        if status == 200:
+            self.token = json.loads(body).get("token") or self.token
+        return status
+
+    def quiz_body(self) -> dict:
+        body = {key: self.rng.choice(options) for key, options in QUIZ_ANSWERS.items()}
+        body["email"] = self.email
+        return body
+
+    def run(self, route: str) -> int:
+        if route == "login":
+            return self.login()
+        if route == "get_profile":
+            status, _ = self.request("GET", f"/api/profile?email={self.email}")
+        elif route == "update_profile":
+            status, _ = self.request("PUT", "/api/profile", {"email": self.email, "commitment": "Yes — I can commit"})
+        elif route == "quiz_submit":
+            status, _ = self.request("POST", "/api/quiz/submit", self.quiz_body())
+        elif route == "internships":
+            status, _ = self.request("GET", "/api/internships")
+        elif route == "recommended":
+            status, _ = self.request("GET", f"/api/internships/recommended?email={self.email}&k=10")
+        else:
+            raise ValueError(route)
+        return status
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_local_server(workdir: str, mode: str = "sqlite", rate_limits: bool = False) -> (subprocess.Popen, str):
+    """
+    Runs app_sqlite.py (threaded Flask) or app_async.py (uvicorn) from workdir
+    so the database and uploads stay there. Every simulated client shares one
+    address, so rate limits are off unless rate_limits is set.
+    """
+    shutil.copy(os.path.join(BACKEND_DIR, "internships.json"), workdir)
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""),
+               RATE_LIMIT_ENABLED="1" if rate_limits else "0")
+    if mode == "async":
+        code = f"import uvicorn; uvicorn.run('app_async:app', host='127.0.0.1', port={port}, log_level='warning')"
+    else:
+        code = f"import app_sqlite; app_sqlite.app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"
+    server = subprocess.Popen([sys.executable, "-c", code], cwd=workdir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server, url
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Server did not start within 60s")
+
+def seed_users(host: str, port: int, count: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    users = []
+    for n in range(count):
+        user = {"email": f"loadtest{n}@example.com", "password": f"pw-{n}"}
+        client = Client(host, port, user["email"], user["password"], rng)
+        client.request("POST", "/api/signup", {"name": f"Load Test {n}", **user})
+        client.login()
+        client.run("quiz_submit")
+        client.conn.close()
+        users.append(user)
+    return users
+
+def run_level(host: str, port: int, users: List[dict], concurrency: int, duration: float, seed: int) -> dict:
+    routes, weights = zip(*ROUTE_MIX)
+    latencies: Dict[str, List[float]] = {route: [] for route in routes}
+    errors: Dict[str, int] = {route: 0 for route in routes}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        user = users[index % len(users)]
+        client = Client(host, port, user["email"], user["password"], rng)
+        client.login()
+        local = {route: [] for route in routes}
+        local_errors = {route: 0 for route in routes}
+        while time.monotonic() < deadline:
+            route = rng.choices(routes, weights)[0]
+            started = time.perf_counter()
+            status = client.run(route)
+            local[route].append(time.perf_counter() - started)
+            if not 200 <= status < 400:
+                local_errors[route] += 1
+        client.conn.close()
+        with lock:
+            for route in routes:
+                latencies[route].extend(local[route])
+                errors[route] += local_errors[route]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(samples) for samples in latencies.values())
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "latency": percentiles(all_samples),
+        "routes": {
+            route: {**percentiles(latencies[route]),
+                    "errors": errors[route],
+                    "error_rate": round(errors[route] / len(latencies[route]), 4) if latencies[route] else 0.0}
+            for route in routes
+        },
+    }
+
+def saturation_point(levels: List[dict], min_gain: float = 0.10) -> Optional[int]:
+    """
+    The first concurrency level beyond which adding clients raises throughput
+    by less than min_gain while p95 latency keeps growing.
+    """
+    for previous, current in zip(levels, levels[1:]):
+        gain = (current["throughput_rps"] - previous["throughput_rps"]) / max(previous["throughput_rps"], 1e-9)
+        if gain < min_gain and current["latency"].get("p95_ms", 0) > previous["latency"].get("p95_ms", 0):
+            return previous["concurrency"]
+    return None
+
+def meets_slo(level: dict, p95_ms: float, error_rate: float) -> bool:
+    """Every route must stay under the p95 target and the error-rate ceiling."""
+    return all(
+        route.get("p95_ms", 0) <= p95_ms and route["error_rate"] <= error_rate
+        for route in level["routes"].values()
+    )
+
+def print_report(levels: List[dict], saturation: Optional[int], max_within_slo: Optional[int]):
+    print(f"{'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8} {'SLO':>5}")
+    for level in levels:
+        latency = level["latency"]
+        print(f"{level['concurrency']:>8} {level['throughput_rps']:>9} {latency.get('p50_ms', 0):>9} "
+              f"{latency.get('p95_ms', 0):>9} {latency.get('p99_ms', 0):>9} {level['error_rate']:>8.2%} "
+              f"{'ok' if level['slo_met'] else 'MISS':>5}")
+    print(f"Saturation point: {saturation if saturation is not None else 'not reached'} concurrent clients")
+    print(f"Highest concurrency within SLO: {max_within_slo if max_within_slo is not None else 'none'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the internship navigator API.")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--app", choices=["sqlite", "async"], default="sqlite",
+                        help="local server to start: app_sqlite.py or the ASGI app_async.py")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="keep the started server's rate limits on, e.g. to watch load shedding")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency level")
+    parser.add_argument("--users", type=int, default=50, help="synthetic users to seed")
+    parser.add_argument("--slo-p95-ms", type=float, default=200.0, help="per-route p95 latency target")
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="per-route error-rate ceiling")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="loadtest_results.json")
+    args = parser.parse_args(argv)
+
+    server = None
+    workdir = tempfile.mkdtemp(prefix="navigator_loadtest_")
+    try:
+        if args.url:
+            url = args.url
+        else:
+            server, url = start_local_server(workdir, args.app, args.rate_limits)
+        target = urlparse(url)
+        host, port = target.hostname, target.port or 80
+        users = seed_users(host, port, args.users, args.seed)
+
+        levels = []
+        for concurrency in args.concurrency:
+            level = run_level(host, port, users, concurrency, args.duration, args.seed)
+            level["slo_met"] = meets_slo(level, args.slo_p95_ms, args.slo_error_rate)
+            levels.append(level)
+            print(f"{concurrency} clients: {level['throughput_rps']} req/s, p95 {level['latency'].get('p95_ms')} ms")
+        saturation = saturation_point(levels)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    within_slo = [level["concurrency"] for level in levels if level["slo_met"]]
+    max_within_slo = max(within_slo) if within_slo else None
+    print_report(levels, saturation, max_within_slo)
+    with open(args.output, "w") as f:
+        json.dump({"target": url, "config": vars(args), "levels": levels,
+                   "saturation_concurrency": saturation, "max_concurrency_within_slo": max_within_slo}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
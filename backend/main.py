@@ -1,36 +1,319 @@
 # main.py
 
 import json
-from parser import extract_text_from_file
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from parser import FileSource, extract_text_capped
+from result_cache import ResumeResultCache, cache_key
+from metrics import NER_TOKENS, OVER_BUDGET, RESULT_CACHE, TOKENS_PROCESSED, stage
+from sections import section_text, segment_resume
 from extractor import (
+    Entities,
+    get_nlp,
+    skill_matcher,
+    analysis_version,
     extract_email,
     extract_phone,
     extract_name,
-    extract_skills_with_spacy,
-    extract_education
+    extract_education,
+    match_skills,
+    ner_entities,
+    owned_entities,
+    text_windows
 )
 
-def analyze_resume(file_path: str) -> dict:
-    text = extract_text_from_file(file_path)
+EXTRACTION_ERROR = {"error": "Failed to extract text from the file."}
+
+# Caps on a single analysis. Longer documents are cut short and the result
+# says so with "truncated": true and "truncated_by" naming the caps that hit.
+MAX_PAGES = 50
+MAX_CHARS = 200_000
+ANALYSIS_TIME_LIMIT = 30.0  # seconds of NLP per document; None for no limit
+
+# Next to this module unless RESUME_CACHE_DATABASE says otherwise, whatever the working directory
+RESULT_CACHE_DATABASE = os.environ.get('RESUME_CACHE_DATABASE',
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_cache.db'))
+_result_cache: Optional[ResumeResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResumeResultCache:
+    """Opens the result cache on first use, so importing main touches no files."""
+    global _result_cache
+    if _result_cache is not None:
+        return _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResumeResultCache(RESULT_CACHE_DATABASE)
+    return _result_cache
+
+
+# A batch item is either a path or a (filename, bytes) pair from an upload
+BatchSource = Union[str, Tuple[str, bytes]]
+
+
+def _cache_key(source: FileSource, max_pages: Optional[int], max_chars: Optional[int]) -> str:
+    # The caps decide how much of a long document is analyzed, so they are part of the key
+    return cache_key(source, f"{analysis_version()}-p{max_pages}-c{max_chars}")
+
+
+# Fields analyze_resume can return. name and education need the statistical
+# NER, skills only need tokens, and email/phone are plain regexes.
+ALL_FIELDS = frozenset({"name", "email", "phone", "education", "skills"})
+NER_FIELDS = frozenset({"name", "education"})
+TOKEN_FIELDS = frozenset({"skills"})
+# The only section each NER field is looked for in. Skills are matched over
+# the whole text: they turn up in projects and experience too, and matching
+# needs no NER.
+NER_SECTIONS = {"name": "header", "education": "education"}
+
+# Seconds allowed per KB of extracted text for each plan; overruns are logged
+LATENCY_BUDGETS = {"regex": 0.001, "rules": 0.005, "full": 0.05}
+
+
+def plan_analysis(fields: AbstractSet[str]) -> str:
+    """The cheapest mode that can produce every requested field."""
+    if fields & NER_FIELDS:
+        return "full"
+    if fields & TOKEN_FIELDS:
+        return "rules"
+    return "regex"
+
+def ner_inputs(text: str, fields: AbstractSet[str] = ALL_FIELDS) -> Dict[str, str]:
+    """
+    The text NER runs on for each requested NER field: its resume section, or
+    the whole text when the resume has no such section or none at all.
+    """
+    wanted = fields & NER_FIELDS
+    if not wanted:
+        return {}
+    with stage('segment'):
+        sections = segment_resume(text)
+    return {field: section_text(sections, text, NER_SECTIONS[field]) for field in wanted}
+
+def _build_resume_data(text: str, fields: AbstractSet[str] = ALL_FIELDS,
+                       entities: Optional[Dict[str, Entities]] = None, skills: Optional[List[str]] = None) -> dict:
+    # entities holds the merged NER entities per NER field; skills the matched skills
+    entities = entities or {}
+    resume_data = {}
+    if "name" in fields:
+        resume_data["name"] = extract_name(entities.get("name", text))
+    contact = {}
+    if "email" in fields:
+        contact["email"] = extract_email(text)
+    if "phone" in fields:
+        contact["phone"] = extract_phone(text)
+    if contact:
+        resume_data["contact"] = contact
+    if "education" in fields:
+        resume_data["education"] = [
+            {"university": org, "degree": None, "major": None}
+            for org in extract_education(entities.get("education", text))
+        ]
+    if "skills" in fields:
+        resume_data["skills"] = skills if skills is not None else match_skills(text)[0]
+    return resume_data
+
+def _assemble(text: str, fields: AbstractSet[str], inputs: Dict[str, str], found: Dict[str, Entities],
+              deadline: Optional[float] = None) -> Tuple[dict, bool]:
+    """
+    _build_resume_data from the entities found in each distinct NER input.
+    Returns the result and whether skill matching ran out of time.
+    """
+    skills = None
+    timed_out = False
+    if fields & TOKEN_FIELDS:
+        skills, tokens, timed_out = match_skills(text, deadline)
+        TOKENS_PROCESSED.inc(tokens)
+    entities = {field: found[part] for field, part in inputs.items()}
+    return _build_resume_data(text, fields, entities, skills), timed_out
+
+def _mark_truncated(resume_data: dict, truncated_by: List[str]) -> dict:
+    resume_data["truncated"] = bool(truncated_by)
+    if truncated_by:
+        resume_data["truncated_by"] = truncated_by
+    return resume_data
+
+def _select_fields(resume_data: dict, fields: AbstractSet[str]) -> dict:
+    if fields == ALL_FIELDS or "error" in resume_data:
+        return resume_data
+    selected = {key: value for key, value in resume_data.items() if key in fields or key.startswith("truncated")}
+    contact = {key: value for key, value in resume_data.get("contact", {}).items() if key in fields}
+    if contact:
+        selected["contact"] = contact
+    return selected
+
+def analyze_resume(
+    source: FileSource,
+    filename: Optional[str] = None,
+    use_cache: bool = True,
+    fields: Optional[Iterable[str]] = None,
+    max_pages: Optional[int] = MAX_PAGES,
+    max_chars: Optional[int] = MAX_CHARS,
+    time_limit: Optional[float] = ANALYSIS_TIME_LIMIT
+) -> dict:
+    """
+    Analyzes a resume given as a path, raw bytes or a seekable upload stream.
+    filename is only used to detect the file type of non-path sources.
+
+    fields limits the result to a subset of ALL_FIELDS and the work to the
+    cheapest plan that covers them: regexes only for email/phone, tokenizer
+    plus skill matcher for skills, the full pipeline for name/education.
+
+    Memory stays bounded whatever the upload: at most max_pages pages and
+    max_chars characters are read, the pipeline sees the text in overlapping
+    windows one at a time, and NLP stops once time_limit seconds have passed.
+    Whatever was found by then is returned, flagged as truncated.
+    """
+    fields = ALL_FIELDS if fields is None else frozenset(fields)
+    unknown = fields - ALL_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    # Identical uploads are answered from the cache without parsing or NLP.
+    # Only complete results are stored; subsets are cut from them.
+    key = None
+    if use_cache:
+        with stage('cache_lookup'):
+            key = _cache_key(source, max_pages, max_chars)
+            cached = get_result_cache().get(key)
+        RESULT_CACHE.labels('hit' if cached is not None else 'miss').inc()
+        if cached is not None:
+            return _select_fields(cached, fields)
+
+    with stage('parse'):
+        text, truncated_by = extract_text_capped(source, filename, max_pages, max_chars)
     if not text:
-        return {"error": "Failed to extract text from the file."}
-        
-    name = extract_name(text)
-    email = extract_email(text)
-    phone = extract_phone(text)
-    skills = extract_skills_with_spacy(text)
-    education_orgs = extract_education(text)
-    
-    resume_data = {
-        "name": name,
-        "contact": {
-            "email": email,
-            "phone": phone
-        },
-        "education": [
-            {"university": org, "degree": None, "major": None} for org in education_orgs
-        ],
-        "skills": skills
-    }
-    
-    return resume_data
\ No newline at end of file
+        return dict(EXTRACTION_ERROR)
+
+    plan = plan_analysis(fields)
+    # Warm up first so a cold model load isn't charged against the budget
+    with stage('model_load'):
+        if plan != "regex":
+            get_nlp()
+        if "skills" in fields:
+            skill_matcher()
+    started = time.perf_counter()
+    deadline = started + time_limit if time_limit else None
+    inputs = ner_inputs(text, fields) if plan == "full" else {}
+    timed_out = False
+    found: Dict[str, Entities] = {}
+    with stage('nlp'):
+        # One pipeline run per distinct section; usually the header and education, not the whole CV
+        for part in dict.fromkeys(inputs.values()):
+            found[part], tokens, part_timed_out = ner_entities(part, deadline)
+            NER_TOKENS.inc(tokens)
+            timed_out = timed_out or part_timed_out
+    with stage('extract'):
+        resume_data, skills_timed_out = _assemble(text, fields, inputs, found, deadline)
+    if timed_out or skills_timed_out:
+        truncated_by.append('time')
+    _mark_truncated(resume_data, truncated_by)
+
+    elapsed = time.perf_counter() - started
+    budget = LATENCY_BUDGETS[plan] * max(len(text) / 1024, 1)
+    if elapsed > budget:
+        OVER_BUDGET.labels(plan).inc()
+
+    # A time-limited result depends on load, so it is never cached
+    if key and fields == ALL_FIELDS and 'time' not in truncated_by:
+        with stage('cache_store'):
+            get_result_cache().put(key, resume_data)
+    return resume_data
+
+def analyze_resumes(
+    sources: Iterable[BatchSource],
+    batch_size: int = 32,
+    n_process: int = 1,
+    parse_workers: Optional[int] = None,
+    use_cache: bool = True,
+    max_pages: Optional[int] = MAX_PAGES,
+    max_chars: Optional[int] = MAX_CHARS
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Analyzes many resumes at once, yielding (name, result) pairs as each one
+    finishes, where name is the path or the filename of a (filename, bytes)
+    pair. Files are parsed concurrently in a process pool and the extracted
+    text is streamed through nlp.pipe in batches, so the order of results
+    follows completion rather than the input order.
+
+    Documents are capped at max_pages and max_chars like analyze_resume, and
+    long sections reach the pipeline as separate windows, so a batch's memory
+    is bounded by batch_size windows rather than by its longest file.
+    """
+    failed = []
+    names = []
+    keys = {}
+    uncached = []
+    # Items are tracked by position so repeated filenames in one batch stay distinct
+    for index, source in enumerate(sources):
+        name, payload = (source, source) if isinstance(source, str) else source
+        names.append(name)
+        if use_cache:
+            try:
+                keys[index] = _cache_key(payload, max_pages, max_chars)
+            except OSError as e:
+                print(f"Error reading {name}: {e}")
+            else:
+                cached = get_result_cache().get(keys[index])
+                RESULT_CACHE.labels('hit' if cached is not None else 'miss').inc()
+                if cached is not None:
+                    yield name, cached
+                    continue
+        uncached.append((index, payload))
+
+    # index -> (text, NER inputs, caps hit, entities per input, windows still to come)
+    pending: Dict[int, Tuple[str, Dict[str, str], List[str], Dict[str, Entities], List[int]]] = {}
+
+    def ner_windows():
+        # Only each resume's relevant sections go through the pipeline, window
+        # by window; pipe preserves order, so a section's windows arrive in turn
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            futures = {
+                pool.submit(extract_text_capped, payload, names[index], max_pages, max_chars): index
+                for index, payload in uncached
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    text, truncated_by = future.result()
+                except Exception as e:
+                    print(f"Error parsing {names[index]}: {e}")
+                    text = ""
+                if not text:
+                    failed.append(index)
+                    continue
+                inputs = ner_inputs(text)
+                parts = {part: text_windows(part) for part in dict.fromkeys(inputs.values())}
+                pending[index] = (text, inputs, truncated_by, {part: [] for part in parts},
+                                  [sum(len(windows) for windows in parts.values())])
+                for part, windows in parts.items():
+                    for start, end, own_start, own_end in windows:
+                        yield part[start:end], (index, part, (start, end, own_start, own_end))
+
+    docs = get_nlp().pipe(ner_windows(), as_tuples=True, batch_size=batch_size, n_process=n_process)
+    for doc, (index, part, window) in docs:
+        text, inputs, truncated_by, found, remaining = pending[index]
+        # Keep only the entities; the Doc is released as soon as the next one arrives
+        found[part].extend(owned_entities(doc, window))
+        NER_TOKENS.inc(len(doc))
+        remaining[0] -= 1
+        if remaining[0]:
+            continue
+        del pending[index]
+        while failed:
+            yield names[failed.pop()], dict(EXTRACTION_ERROR)
+        try:
+            with stage('extract'):
+                result, _ = _assemble(text, ALL_FIELDS, inputs, found)
+            _mark_truncated(result, truncated_by)
+            if index in keys:
+                get_result_cache().put(keys[index], result)
+        except Exception as e:
+            result = {"error": "An error occurred during analysis.", "details": str(e)}
+        yield names[index], result
+    while failed:
+        yield names[failed.pop()], dict(EXTRACTION_ERROR)
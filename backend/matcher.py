@@ -0,0 +1,206 @@
+# backend/matcher.py - Vectorized skill and preference matching of users to internships
+
+import threading
+from typing import Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from catalog import CatalogSnapshot, internship_skills, parse_stipend
+from taxonomy import SkillTaxonomy, get_taxonomy
+
+# Relative weight of each component in the final 0-100 match score
+WEIGHTS = {"skills": 0.7, "mode": 0.15, "industry": 0.1, "stipend": 0.05}
+
+# Quiz answers for internship_mode -> the catalog's `mode` values
+MODE_PREFERENCES = {
+    'In-office': 'on-site',
+    'Hybrid': 'hybrid',
+    'Fully remote': 'remote'
+}
+
+# Postings have no industry field, so industries are inferred from keywords in
+# the title and description. Quiz answers for preferred_industries are the keys.
+INDUSTRY_KEYWORDS = {
+    'IT / Computers': ['software', 'developer', 'web', 'frontend', 'backend', 'data', 'ai', 'ml', 'machine learning', 'computer'],
+    'Business / Accounts / Finance': ['business', 'finance', 'account', 'product', 'market research', 'analyst'],
+    'Sales / Retail': ['sales', 'retail', 'marketing', 'social media', 'customer'],
+    'Agriculture / Agri-tech': ['agri', 'farm', 'crop'],
+    'NGO / Social impact': ['ngo', 'social impact', 'community', 'nonprofit'],
+    'Repair / Technician': ['repair', 'technician', 'maintenance', 'hardware']
+}
+INDUSTRIES = list(INDUSTRY_KEYWORDS)
+
+
+def split_list_field(value) -> List[str]:
+    """Profile list fields arrive as lists or as the ", "-joined strings stored by submit_quiz."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [item.strip() for item in value if item and item.strip()]
+
+def _infer_industries(internship: dict) -> List[int]:
+    text = f" {internship.get('title', '')} {internship.get('description', '')} ".lower()
+    return [
+        column for column, industry in enumerate(INDUSTRIES)
+        if any(f" {keyword}" in text for keyword in INDUSTRY_KEYWORDS[industry])
+    ]
+
+
+class MatchingIndex:
+    """
+    The catalog encoded as arrays: a sparse postings x skills incidence
+    matrix, a mode code per posting, a postings x industries matrix and a
+    stipend vector. Scoring a user against every posting is a handful of
+    matrix-vector products.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, taxonomy: SkillTaxonomy):
+        self.snapshot = snapshot
+        self.taxonomy = taxonomy
+        # Rankings depend on both the postings and the skill taxonomy
+        self.version = f"{snapshot.etag}-{taxonomy.digest}"
+        internships = snapshot.internships
+
+        # Taxonomy skills first, then any skill the catalog mentions that it lacks
+        self.vocabulary = list(taxonomy.names)
+        self.skill_columns = {skill.lower(): column for column, skill in enumerate(self.vocabulary)}
+        rows, cols = [], []
+        for row, item in enumerate(internships):
+            for skill in internship_skills(item):
+                skill = self.canonical_skill(skill)
+                key = skill.lower()
+                if key not in self.skill_columns:
+                    self.skill_columns[key] = len(self.vocabulary)
+                    self.vocabulary.append(skill)
+                rows.append(row)
+                cols.append(self.skill_columns[key])
+        shape = (len(internships), len(self.vocabulary))
+        self.skills = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+        self.skills.sum_duplicates()
+        self.skills.data[:] = 1.0
+        self.skill_counts = np.maximum(np.asarray(self.skills.sum(axis=1)).ravel(), 1.0)
+
+        modes = sorted({(item.get('mode') or '').lower() for item in internships} - {''})
+        self.mode_columns = {mode: column for column, mode in enumerate(modes)}
+        self.mode_codes = np.array(
+            [self.mode_columns.get((item.get('mode') or '').lower(), -1) for item in internships], dtype=np.int32
+        )
+
+        industry_rows, industry_cols = [], []
+        for row, item in enumerate(internships):
+            for column in _infer_industries(item):
+                industry_rows.append(row)
+                industry_cols.append(column)
+        self.industries = sparse.csr_matrix(
+            (np.ones(len(industry_rows), dtype=np.float32), (industry_rows, industry_cols)),
+            shape=(len(internships), len(INDUSTRIES))
+        )
+
+        self.stipends = np.array([parse_stipend(item.get('stipend')) for item in internships], dtype=np.float32)
+        max_stipend = self.stipends.max() if len(self.stipends) else 0.0
+        self.stipend_ratio = self.stipends / max_stipend if max_stipend else np.zeros_like(self.stipends)
+
+    def canonical_skill(self, skill: str) -> str:
+        """Resolves aliases ("k8s" -> "Kubernetes"); unknown skills pass through."""
+        return self.taxonomy.canonical(skill) or skill.strip()
+
+    def _skill_column(self, skill: str) -> Optional[int]:
+        return self.skill_columns.get(self.canonical_skill(skill).lower())
+
+    def user_skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for skill in skills:
+            column = self._skill_column(skill)
+            if column is not None:
+                vector[column] = 1.0
+        return vector
+
+    def scores(self, skills: Iterable[str], internship_mode: Optional[str] = None,
+               preferred_industries: Iterable[str] = (), stipend_requirement: Optional[str] = None) -> np.ndarray:
+        """0-100 match score for every posting, in catalog order."""
+        n = len(self.snapshot.internships)
+        skill_score = (self.skills @ self.user_skill_vector(skills)) / self.skill_counts
+
+        mode = MODE_PREFERENCES.get(internship_mode or '')
+        if mode is None:
+            mode_score = np.ones(n, dtype=np.float32)
+        else:
+            mode_score = (self.mode_codes == self.mode_columns.get(mode, -2)).astype(np.float32)
+
+        industry_vector = np.zeros(len(INDUSTRIES), dtype=np.float32)
+        for industry in preferred_industries:
+            if industry in INDUSTRY_KEYWORDS:
+                industry_vector[INDUSTRIES.index(industry)] = 1.0
+        if industry_vector.any():
+            industry_score = np.minimum(self.industries @ industry_vector, 1.0)
+        else:
+            industry_score = np.ones(n, dtype=np.float32)
+
+        requirement = (stipend_requirement or '').lower()
+        if requirement.startswith('yes'):
+            stipend_score = (self.stipends > 0).astype(np.float32)
+        elif requirement.startswith('prefer'):
+            stipend_score = self.stipend_ratio
+        else:
+            stipend_score = np.ones(n, dtype=np.float32)
+
+        total = (WEIGHTS["skills"] * skill_score + WEIGHTS["mode"] * mode_score
+                 + WEIGHTS["industry"] * industry_score + WEIGHTS["stipend"] * stipend_score)
+        return np.rint(total * 100)
+
+    def top_k(self, profile: dict, k: int = 20, skills: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        Ranks the catalog for a profile row (or any dict with the same keys) and
+        returns the best k postings with matchScore, yourSkills and missingSkills
+        computed for this user. `skills` overrides the profile's skills column,
+        e.g. with the output of extract_skills_with_spacy.
+        """
+        n = len(self.snapshot.internships)
+        if n == 0 or k <= 0:
+            return []
+        user_skills = list(skills) if skills is not None else split_list_field(profile.get('skills'))
+        scores = self.scores(
+            user_skills,
+            internship_mode=profile.get('internship_mode'),
+            preferred_industries=split_list_field(profile.get('preferred_industries')),
+            stipend_requirement=profile.get('stipend_requirement')
+        )
+        k = min(k, n)
+        # Integer scores, so folding the row in breaks ties by catalog order
+        # and the top-k is deterministic even at the cut-off
+        keys = np.arange(n) - scores.astype(np.float64) * n
+        best = np.argpartition(keys, k - 1)[:k]
+        best = best[np.argsort(keys[best])]
+
+        user_columns = {self._skill_column(s) for s in user_skills} - {None}
+        results = []
+        for row in best:
+            columns = self.skills.indices[self.skills.indptr[row]:self.skills.indptr[row + 1]]
+            results.append({
+                **self.snapshot.internships[row],
+                "matchScore": int(scores[row]),
+                "yourSkills": [self.vocabulary[c] for c in columns if c in user_columns],
+                "missingSkills": [self.vocabulary[c] for c in columns if c not in user_columns]
+            })
+        return results
+
+
+_index: Optional[MatchingIndex] = None
+_index_lock = threading.Lock()
+
+def get_matching_index(snapshot: CatalogSnapshot) -> MatchingIndex:
+    """
+    Returns the index for this catalog snapshot and the current skill
+    taxonomy, rebuilding it when either one reloads.
+    """
+    global _index
+    taxonomy = get_taxonomy()
+    index = _index
+    if index is not None and index.snapshot is snapshot and index.taxonomy is taxonomy:
+        return index
+    with _index_lock:
+        if _index is None or _index.snapshot is not snapshot or _index.taxonomy is not taxonomy:
+            _index = MatchingIndex(snapshot, taxonomy)
+        return _index
@@ -0,0 +1,339 @@
+# backend/metrics.py - In-process counters, gauges and histograms with a Prometheus text endpoint
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers sub-millisecond DB calls up to multi-second resume analyses
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric(ABC):
+    """
+    A metric family. Children are created per label combination on first use
+    and then looked up with a single dict access, so the hot path takes only
+    the child's own lock.
+    """
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child for one label combination."""
+
+    def labels(self, *values):
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self):
+        if not self.labelnames and not self._children:
+            self.labels()
+        with self._lock:
+            return sorted(self._children.items())
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+    @contextmanager
+    def track(self):
+        """Gauge of how many callers are inside the block right now."""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+                for values, child in self._items()]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def track(self):
+        return self.labels().track()
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self):
+        lines = []
+        for values, child in self._items():
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {cumulative}")
+        return lines
+
+
+# --- Application metrics ---
+
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP requests served.', ['method', 'route', 'status'])
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'Time to serve an HTTP request.', ['method', 'route'])
+HTTP_IN_FLIGHT = Gauge('http_requests_in_flight', 'HTTP requests currently being served.')
+STARTUP_DURATION = Gauge('app_startup_seconds', 'Time this process took to import and initialise the app.')
+
+STAGE_LATENCY = Histogram('stage_duration_seconds', 'Time spent in one stage of a request or job.', ['stage'])
+STAGES_IN_FLIGHT = Gauge('stages_in_flight', 'Stages currently running.', ['stage'])
+
+DOCS_PARSED = Counter('resume_documents_parsed_total', 'Resume files run through the parser.', ['outcome'])
+PAGES_PARSED = Counter('resume_pages_parsed_total', 'Pages of text extracted from resume files.')
+TOKENS_PROCESSED = Counter('resume_tokens_total', 'Tokens produced by the NLP pipeline for resumes.')
+NER_TOKENS = Counter('resume_ner_tokens_total', 'Resume tokens run through statistical NER.')
+RESULT_CACHE = Counter('resume_result_cache_requests_total', 'Resume result cache lookups.', ['result'])
+OVER_BUDGET = Counter('resume_analysis_over_budget_total',
+                      'Resume analyses slower than the latency budget for their plan.', ['plan'])
+
+PROFILE_IMPORT_ROWS = Counter('profile_import_rows_total', 'Rows processed by the bulk profile import.', ['outcome'])
+
+ADMISSION_REJECTED = Counter('admission_rejected_total', 'Requests turned away by admission control.',
+                             ['endpoint', 'reason'])
+
+
+# --- Per-request stage breakdown ---
+
+# Seconds per stage for the request being served, or None outside a request
+_breakdown: ContextVar[Optional[Dict[str, float]]] = ContextVar('stage_breakdown', default=None)
+
+@contextmanager
+def stage(name: str):
+    """Times a block into stage_duration_seconds and the current request's breakdown."""
+    in_flight = STAGES_IN_FLIGHT.labels(name)
+    histogram = STAGE_LATENCY.labels(name)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        in_flight.dec()
+        histogram.observe(elapsed)
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown[name] = breakdown.get(name, 0.0) + elapsed
+
+
+def _log_slow_request(method: str, route: str, status, elapsed: float, breakdown: Dict[str, float]):
+    stages = ', '.join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in
+                       sorted(breakdown.items(), key=lambda item: -item[1]))
+    logger.warning("Slow request: %s %s %s took %.1fms (%s)", method, route, status, elapsed * 1000,
+                   stages or 'no stages recorded')
+
+
+def instrument_app(app, slow_request_seconds: Optional[float] = None):
+    """
+    Records count, latency and in-flight requests for every Flask route. With
+    slow_request_seconds set, requests slower than that are logged with the
+    time spent in each stage.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        HTTP_IN_FLIGHT.inc()
+        g.metrics_started = time.perf_counter()
+        g.metrics_status = 500
+        _breakdown.set({})
+
+    @app.after_request
+    def _record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request_timer(exc):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        HTTP_IN_FLIGHT.dec()
+        # The URL rule keeps label cardinality bounded (/api/resume/jobs/<job_id>)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = g.pop('metrics_status', 500)
+        HTTP_REQUESTS.labels(request.method, route, status).inc()
+        HTTP_LATENCY.labels(request.method, route).observe(elapsed)
+
+        breakdown = _breakdown.get() or {}
+        _breakdown.set(None)
+        if slow_request_seconds is not None and elapsed >= slow_request_seconds:
+            _log_slow_request(request.method, route, status, elapsed, breakdown)
+
+class ASGIMetricsMiddleware:
+    """
+    instrument_app for ASGI apps (Starlette). Requests routed to a Mount, such
+    as a wrapped Flask app, are left to the mounted app's own instrumentation.
+    """
+
+    def __init__(self, app, slow_request_seconds: Optional[float] = None):
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        breakdown = {}
+        token = _breakdown.set(breakdown)
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            _breakdown.reset(token)
+            matched = scope.get('route')
+            # Routes have methods, Mounts don't
+            if matched is None or getattr(matched, 'methods', None) is not None:
+                route = matched.path if matched is not None else 'unmatched'
+                method = scope['method']
+                HTTP_REQUESTS.labels(method, route, status).inc()
+                HTTP_LATENCY.labels(method, route).observe(elapsed)
+                if self.slow_request_seconds is not None and elapsed >= self.slow_request_seconds:
+                    _log_slow_request(method, route, status, elapsed, breakdown)
+
+def render() -> str:
+    return REGISTRY.render()
@@ -1,30 +1,173 @@
 # parser.py
 
+import io
 import pdfplumber
 import docx
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 
-def extract_text_from_file(file_path: str) -> str:
+from metrics import DOCS_PARSED, PAGES_PARSED
+
+FileSource = Union[str, bytes, BinaryIO]
+
+# Below this many pages the cost of starting workers outweighs parallel extraction
+PARALLEL_MIN_PAGES = 8
+
+
+def _detect_type(source: FileSource, filename: Optional[str]) -> Optional[str]:
+    name = filename or (source if isinstance(source, str) else getattr(source, 'name', None))
+    if isinstance(name, str):
+        if name.lower().endswith('.pdf'):
+            return 'pdf'
+        if name.lower().endswith('.docx'):
+            return 'docx'
+    if isinstance(source, str):
+        return None
+    # No usable extension: sniff the magic bytes (DOCX files are zip archives)
+    position = source.tell()
+    header = source.read(4)
+    source.seek(position)
+    if header.startswith(b'%PDF'):
+        return 'pdf'
+    if header.startswith(b'PK'):
+        return 'docx'
+    return None
+
+def _as_stream(source: FileSource) -> Union[str, BinaryIO]:
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+def _label(source: FileSource, filename: Optional[str]) -> str:
+    return source if isinstance(source, str) else (filename or "upload")
+
+
+def _iter_pdf_pages(source, max_pages: Optional[int], info: Optional[dict] = None) -> Iterator[str]:
+    with pdfplumber.open(source) as pdf:
+        if info is not None:
+            info['total_pages'] = len(pdf.pages)
+        for page in pdf.pages[:max_pages]:
+            page_text = page.extract_text()
+            # Drop the parsed layout objects so memory stays flat on long PDFs
+            page.flush_cache()
+            if page_text:
+                yield page_text
+
+def _extract_pdf_page_range(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    # Runs in a worker process; each worker opens its own copy of the document
+    with pdfplumber.open(_as_stream(source)) as pdf:
+        pages = []
+        for page in pdf.pages[start:stop]:
+            pages.append(page.extract_text() or "")
+            page.flush_cache()
+        return pages
+
+def _extract_pdf_parallel(source, max_pages: Optional[int], workers: int) -> List[str]:
+    if not isinstance(source, str):
+        # Workers need something picklable: hand them the raw bytes
+        source = source.read()
+    with pdfplumber.open(_as_stream(source)) as pdf:
+        page_count = len(pdf.pages[:max_pages])
+    if page_count < PARALLEL_MIN_PAGES:
+        return list(_iter_pdf_pages(_as_stream(source), max_pages))
+
+    chunk = -(-page_count // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_extract_pdf_page_range, source, start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ]
+        return [text for future in futures for text in future.result() if text]
+
+
+def iter_text_pages(source: FileSource, filename: Optional[str] = None, max_pages: Optional[int] = None,
+                    info: Optional[dict] = None) -> Iterator[str]:
     """
-    Extracts raw text from a given file (PDF or DOCX).
+    Yields a document's text one page at a time so callers can start working
+    before the whole file is parsed. DOCX files have no pages and are yielded
+    as a single chunk. Unsupported or unreadable files yield nothing. For a
+    PDF, info (if given) receives the document's 'total_pages'.
     """
-    text = ""
+    source = _as_stream(source)
+    label = _label(source, filename)
     try:
-        if file_path.endswith('.pdf'):
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        elif file_path.endswith('.docx'):
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+        kind = _detect_type(source, filename)
+        if kind == 'pdf':
+            for page_text in _iter_pdf_pages(source, max_pages, info):
+                yield page_text
+        elif kind == 'docx':
+            doc = docx.Document(source)
+            yield "\n".join(para.text for para in doc.paragraphs)
         else:
-            print(f"Unsupported file type: {file_path}")
-            return ""
+            print(f"Unsupported file type: {label}")
     except Exception as e:
-        print(f"Error reading file {file_path}: {e}")
+        print(f"Error reading file {label}: {e}")
+
+def extract_text_from_file(
+    source: FileSource,
+    filename: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    min_chars: Optional[int] = None,
+    workers: int = 1
+) -> str:
+    """
+    Extracts raw text from a PDF or DOCX given a path, raw bytes or a seekable
+    binary file-like object. filename only hints at the type for non-path sources.
+
+    max_pages caps how many PDF pages are read and min_chars stops reading once
+    that much text has been collected. With workers > 1, PDFs of at least
+    PARALLEL_MIN_PAGES pages are split across worker processes; min_chars is
+    not applied in that mode since all pages are extracted at once.
+    """
+    source = _as_stream(source)
+    if workers > 1 and _detect_type(source, filename) == 'pdf':
+        try:
+            pages = _extract_pdf_parallel(source, max_pages, workers)
+        except Exception as e:
+            print(f"Error reading file {_label(source, filename)}: {e}")
+            return ""
+    else:
+        pages = []
+        collected = 0
+        for page_text in iter_text_pages(source, filename, max_pages):
+            pages.append(page_text)
+            collected += len(page_text)
+            if min_chars is not None and collected >= min_chars:
+                break
+    return _joined(pages)
+
+def _joined(pages: List[str]) -> str:
+    # Counted in whichever process parsed the file; pool workers' counts stay there
+    PAGES_PARSED.inc(len(pages))
+    if not pages:
+        DOCS_PARSED.labels('empty').inc()
         return ""
-        
-    return text
-    
\ No newline at end of file
+    DOCS_PARSED.labels('ok').inc()
+    return "\n".join(pages) + "\n"
+
+def extract_text_capped(
+    source: FileSource,
+    filename: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> Tuple[str, List[str]]:
+    """
+    extract_text_from_file for documents of any size: reads at most max_pages
+    PDF pages and stops as soon as max_chars characters are collected, so a
+    200-page upload costs no more than a long resume. Returns the text and the
+    caps that cut it short, a subset of ['pages', 'chars'].
+    """
+    info = {}
+    pages = []
+    collected = 0
+    for page_text in iter_text_pages(source, filename, max_pages, info):
+        pages.append(page_text)
+        collected += len(page_text) + 1
+        if max_chars is not None and collected > max_chars:
+            break
+    truncated_by = []
+    if max_pages is not None and info.get('total_pages', 0) > max_pages:
+        truncated_by.append('pages')
+    text = _joined(pages)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+        truncated_by.append('chars')
+    return text, truncated_by
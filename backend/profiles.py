@@ -0,0 +1,199 @@
+# backend/profiles.py - Normalized, indexed profile skills and preferences
+
+from typing import Callable, List, Sequence, Tuple
+
+from matcher import split_list_field
+from schema import ensure_column, ensure_index, is_mysql, run_migration
+from taxonomy import get_taxonomy
+
+# Quiz answers mirrored into user_preferences, one row per selected value
+PREFERENCE_FIELDS = ['internship_mode', 'commitment', 'preferred_industries', 'preferred_tasks',
+                     'stipend_requirement', 'relocation', 'languages']
+LIST_FIELDS = {'preferred_industries', 'preferred_tasks', 'languages'}
+# Answers shown as preference_tags, in display order
+TAG_FIELDS = ['internship_mode', 'commitment', 'preferred_industries', 'preferred_tasks',
+              'stipend_requirement', 'relocation']
+SOURCE_COLUMNS = ['id', 'skills'] + PREFERENCE_FIELDS
+
+# Column types per dialect: MySQL can't index unbounded TEXT keys
+_TYPES = {
+    False: {'id': 'INTEGER', 'text': 'TEXT', 'short': 'TEXT'},
+    True: {'id': 'INT', 'text': 'VARCHAR(255)', 'short': 'VARCHAR(64)'},
+}
+
+def _schema(mysql: bool) -> List[str]:
+    t = _TYPES[mysql]
+    return [
+        f'''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            user_id {t['id']} NOT NULL,
+            skill {t['text']} NOT NULL,
+            skill_key {t['text']} NOT NULL,
+            PRIMARY KEY (user_id, skill_key),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        ''',
+        f'''
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            user_id {t['id']} NOT NULL,
+            field {t['short']} NOT NULL,
+            value {t['text']} NOT NULL,
+            value_key {t['text']} NOT NULL,
+            PRIMARY KEY (user_id, field, value_key),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        ''',
+    ]
+
+Statements = List[Tuple[str, List[tuple]]]
+
+
+def preference_tags(profile: dict) -> str:
+    tags = []
+    for field in TAG_FIELDS:
+        value = profile.get(field)
+        if not value:
+            continue
+        if field in ('preferred_industries', 'preferred_tasks'):
+            tags.extend([tag.strip().replace('_', '-') for tag in value.split(',')])
+        else:
+            tags.append(value.replace('_', '-'))
+    return ", ".join(filter(None, tags))
+
+def skill_key(skill: str) -> str:
+    """Case-folded canonical name, so "k8s" and "Kubernetes" share one index entry."""
+    return (get_taxonomy().canonical(skill) or skill.strip()).lower()
+
+def _unique(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # First spelling wins when two values share a key ("Python", "python")
+    seen = set()
+    unique = []
+    for value, key in pairs:
+        if key not in seen:
+            seen.add(key)
+            unique.append((value, key))
+    return unique
+
+
+class ProfileIndex:
+    """
+    Keeps user_skills and user_preferences in step with the users row. The
+    comma-joined columns stay as the API's representation; the join tables
+    are what queries use, so "users with skill X" is an index lookup. The
+    users.preference_tags column is computed on write instead of per read.
+
+    Works against SQLite and MySQL: pass the driver's placeholder.
+    """
+
+    def __init__(self, placeholder: str = '?'):
+        self.ph = placeholder
+        self.mysql = is_mysql(placeholder)
+
+    def init_tables(self, get_connection: Callable):
+        """
+        Adds users.preference_tags and creates the join tables and their
+        indexes where missing, so databases from before this schema upgrade
+        on startup. Run backfill() afterwards to fill them in.
+        """
+        def migrate(cursor):
+            ensure_column(cursor, self.mysql, 'users', 'preference_tags', 'TEXT')
+            for statement in _schema(self.mysql):
+                cursor.execute(statement)
+            ensure_index(cursor, self.mysql, 'idx_user_skills_skill_key', 'user_skills', 'skill_key')
+            ensure_index(cursor, self.mysql, 'idx_user_preferences_field_value', 'user_preferences', 'field, value_key')
+        run_migration(get_connection, migrate)
+
+    @property
+    def source_query(self) -> str:
+        return f'SELECT {", ".join(SOURCE_COLUMNS)} FROM users WHERE email = {self.ph}'
+
+    def sync_statements(self, row: Sequence) -> Statements:
+        """
+        Statements that rebuild one user's normalized rows and tags from the
+        result of source_query. Each is (sql, parameter rows) for executemany.
+        """
+        profile = dict(zip(SOURCE_COLUMNS, row))
+        user_id = profile['id']
+        skills = _unique([(skill, skill_key(skill)) for skill in split_list_field(profile['skills'])])
+        preferences = []
+        for field in PREFERENCE_FIELDS:
+            values = split_list_field(profile[field]) if field in LIST_FIELDS else [profile[field]]
+            values = [str(value).strip() for value in values if value is not None and str(value).strip()]
+            preferences.extend(
+                (field, value, key) for value, key in _unique([(value, value.lower()) for value in values])
+            )
+        ph = self.ph
+        return [
+            (f'DELETE FROM user_skills WHERE user_id = {ph}', [(user_id,)]),
+            (f'INSERT INTO user_skills (user_id, skill, skill_key) VALUES ({ph}, {ph}, {ph})',
+             [(user_id, skill, key) for skill, key in skills]),
+            (f'DELETE FROM user_preferences WHERE user_id = {ph}', [(user_id,)]),
+            (f'INSERT INTO user_preferences (user_id, field, value, value_key) VALUES ({ph}, {ph}, {ph}, {ph})',
+             [(user_id, field, value, key) for field, value, key in preferences]),
+            (f'UPDATE users SET preference_tags = {ph} WHERE id = {ph}', [(preference_tags(profile), user_id)]),
+        ]
+
+    def sync(self, cursor, email: str) -> bool:
+        """Re-syncs one user inside the caller's transaction. False if there is no such user."""
+        return self.sync_many(cursor, [email]) == 1
+
+    def sync_many(self, cursor, emails: Sequence[str]) -> int:
+        """Re-syncs several users with one executemany per statement. Returns how many exist."""
+        if not emails:
+            return 0
+        marks = ', '.join([self.ph] * len(emails))
+        cursor.execute(f'SELECT {", ".join(SOURCE_COLUMNS)} FROM users WHERE email IN ({marks})', tuple(emails))
+        found = cursor.fetchall()
+        batched: Statements = []
+        for row in found:
+            statements = self.sync_statements(tuple(row))
+            if not batched:
+                batched = [(sql, list(rows)) for sql, rows in statements]
+            else:
+                for (_, pending), (_, rows) in zip(batched, statements):
+                    pending.extend(rows)
+        for sql, rows in batched:
+            if rows:
+                cursor.executemany(sql, rows)
+        return len(found)
+
+    def backfill(self, get_connection: Callable, batch_size: int = 500) -> int:
+        """
+        Syncs every user whose preference_tags was never computed, i.e. rows
+        written before this schema existed. Safe to run repeatedly.
+        """
+        done = 0
+        while True:
+            conn = get_connection()
+            if conn is None:
+                raise ConnectionError("Database connection failed")
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f'SELECT email FROM users WHERE preference_tags IS NULL LIMIT {int(batch_size)}')
+                emails = [row[0] for row in cursor.fetchall()]
+                self.sync_many(cursor, emails)
+                conn.commit()
+            finally:
+                cursor.close()
+                conn.close()
+            done += len(emails)
+            if len(emails) < batch_size:
+                return done
+
+    # --- Reverse lookups ---
+
+    def emails_with_skill(self, cursor, skill: str) -> List[str]:
+        cursor.execute(
+            f'SELECT u.email FROM user_skills s JOIN users u ON u.id = s.user_id WHERE s.skill_key = {self.ph}',
+            (skill_key(skill),)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def emails_with_preference(self, cursor, field: str, value: str) -> List[str]:
+        """e.g. ('preferred_industries', 'IT / Computers') or ('internship_mode', 'Hybrid')."""
+        cursor.execute(
+            f'SELECT u.email FROM user_preferences p JOIN users u ON u.id = p.user_id '
+            f'WHERE p.field = {self.ph} AND p.value_key = {self.ph}',
+            (field, value.strip().lower())
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,269 @@
+# backend/recommendations.py - Precomputed per-user internship recommendations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional, Tuple
+
+from catalog import InternshipCatalog
+from matcher import get_matching_index
+from schema import ensure_index, is_mysql, run_migration
+
+PROFILE_COLUMNS = ['email', 'skills', 'internship_mode', 'preferred_industries', 'stipend_requirement']
+
+
+class RecommendationStore:
+    """
+    Keeps each user's top-N internships in `user_recommendations`. Writers of
+    profile data call mark_dirty() inside their own transaction; a background
+    refresher recomputes dirty users in batches, and queues every user whose
+    ranking predates the current catalog or skill taxonomy when either changes. Reads are a single
+    primary-key lookup.
+
+    Every process that calls start() runs a refresher thread, but only the
+    holder of a lease row in `recommendation_refresher` does any work, so one
+    process per database refreshes. Another takes over once a holder stops
+    renewing it for lease_seconds.
+
+    Works against SQLite and MySQL: pass the app's get_db_connection and the
+    driver's parameter placeholder ('?' or '%s').
+    """
+
+    def __init__(self, get_connection: Callable, catalog: InternshipCatalog, placeholder: str = '?',
+                 top_n: int = 50, batch_size: int = 200, interval: float = 5.0, lease_seconds: float = 30.0):
+        self.get_connection = get_connection
+        self.catalog = catalog
+        self.ph = placeholder
+        self.mysql = is_mysql(placeholder)
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease_seconds = lease_seconds
+        self._catalog_version = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._owner = self._new_owner()
+        self._start_lock = threading.Lock()
+
+    @staticmethod
+    def _new_owner() -> str:
+        # Unique per store and process, so a forked worker never renews its parent's lease
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def _connect(self):
+        conn = self.get_connection()
+        if conn is None:
+            raise ConnectionError("Database connection failed")
+        return conn
+
+    def init_tables(self):
+        """Creates the tables and their index where missing, on SQLite or MySQL."""
+        if self.mysql:
+            email, version, items, real = 'VARCHAR(255)', 'VARCHAR(64)', 'MEDIUMTEXT', 'DOUBLE'
+        else:
+            email, version, items, real = 'TEXT', 'TEXT', 'TEXT', 'REAL'
+
+        def migrate(cursor):
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS user_recommendations (
+                    email {email} PRIMARY KEY,
+                    catalog_version {version} NOT NULL,
+                    items {items} NOT NULL,
+                    computed_at {real} NOT NULL
+                )
+            ''')
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS recommendation_dirty (
+                    email {email} PRIMARY KEY,
+                    marked_at {real} NOT NULL
+                )
+            ''')
+            ensure_index(cursor, self.mysql, 'idx_recommendation_dirty_marked_at', 'recommendation_dirty', 'marked_at')
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS recommendation_refresher (
+                    name {version} PRIMARY KEY,
+                    owner {email},
+                    expires_at {real} NOT NULL
+                )
+            ''')
+            insert = 'INSERT IGNORE' if self.mysql else 'INSERT OR IGNORE'
+            cursor.execute(f"{insert} INTO recommendation_refresher (name, owner, expires_at) VALUES ('refresher', NULL, 0)")
+        run_migration(self._connect, migrate)
+
+    def dirty_statement(self, email: str) -> Tuple[str, tuple]:
+        """SQL and parameters that mark a user dirty, for callers with their own (async) driver."""
+        return (
+            f'REPLACE INTO recommendation_dirty (email, marked_at) VALUES ({self.ph}, {self.ph})',
+            (email, time.time())
+        )
+
+    def mark_dirty(self, cursor, email: str):
+        """Records that a user's profile changed, using the caller's cursor and transaction."""
+        cursor.execute(*self.dirty_statement(email))
+
+    def get(self, email: str, k: Optional[int] = None) -> Optional[List[dict]]:
+        """
+        Stored recommendations joined with the current catalog, or None when the
+        user has none yet. Entries computed against an older catalog are still
+        served (minus postings that no longer exist) until the refresher catches up.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.items_query, (email,))
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+        return self.resolve(row[0], k) if row else None
+
+    @property
+    def items_query(self) -> str:
+        return f'SELECT items FROM user_recommendations WHERE email = {self.ph}'
+
+    def resolve(self, items: str, k: Optional[int] = None) -> List[dict]:
+        """Joins a stored `items` column with the current catalog."""
+        by_id = self.catalog.snapshot().by_id
+        results = []
+        for entry in json.loads(items)[:k]:
+            internship = by_id.get(entry['id'])
+            if internship is not None:
+                results.append({
+                    **internship,
+                    "matchScore": entry['score'],
+                    "yourSkills": entry['yourSkills'],
+                    "missingSkills": entry['missingSkills']
+                })
+        return results
+
+    def refresh_users(self, emails: List[str]) -> int:
+        """Recomputes and stores recommendations for the given users. Returns how many were written."""
+        if not emails:
+            return 0
+        snapshot = self.catalog.snapshot()
+        index = get_matching_index(snapshot)
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            try:
+                marks = ', '.join([self.ph] * len(emails))
+                cursor.execute(f'SELECT {", ".join(PROFILE_COLUMNS)} FROM users WHERE email IN ({marks})',
+                               tuple(emails))
+                profiles = [dict(zip(PROFILE_COLUMNS, row)) for row in cursor.fetchall()]
+
+                now = time.time()
+                rows = []
+                for profile in profiles:
+                    items = [
+                        {"id": item['id'], "score": item['matchScore'],
+                         "yourSkills": item['yourSkills'], "missingSkills": item['missingSkills']}
+                        for item in index.top_k(profile, k=self.top_n)
+                    ]
+                    rows.append((profile['email'], index.version, json.dumps(items), now))
+                cursor.executemany(
+                    f'REPLACE INTO user_recommendations (email, catalog_version, items, computed_at) '
+                    f'VALUES ({self.ph}, {self.ph}, {self.ph}, {self.ph})',
+                    rows
+                )
+                conn.commit()
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+        return len(rows)
+
+    def refresh_dirty(self) -> int:
+        """Processes one batch of dirty users; returns the number refreshed."""
+        version = get_matching_index(self.catalog.snapshot()).version
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            if version != self._catalog_version:
+                # Catalog or taxonomy changed (or first run): queue users ranked against an older one
+                cursor.execute(
+                    f'REPLACE INTO recommendation_dirty (email, marked_at) '
+                    f'SELECT u.email, {self.ph} FROM users u '
+                    f'LEFT JOIN user_recommendations r ON r.email = u.email '
+                    f'WHERE r.email IS NULL OR r.catalog_version <> {self.ph}',
+                    (time.time(), version)
+                )
+                conn.commit()
+                self._catalog_version = version
+            cursor.execute(
+                f'SELECT email, marked_at FROM recommendation_dirty ORDER BY marked_at LIMIT {int(self.batch_size)}'
+            )
+            batch = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+        if not batch:
+            return 0
+
+        refreshed = self.refresh_users([row[0] for row in batch])
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            # Only clear marks we processed; a newer edit keeps its user dirty
+            cursor.executemany(
+                f'DELETE FROM recommendation_dirty WHERE email = {self.ph} AND marked_at <= {self.ph}',
+                [(row[0], row[1]) for row in batch]
+            )
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        return refreshed
+
+    def hold_lease(self) -> bool:
+        """Takes or renews the refresher lease for this process. False while another live process holds it."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f'UPDATE recommendation_refresher SET owner = {self.ph}, expires_at = {self.ph} '
+                    f'WHERE name = {self.ph} AND (owner = {self.ph} OR expires_at < {self.ph})',
+                    (self._owner, now + self.lease_seconds, 'refresher', self._owner, now)
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # Keep draining while there is a backlog, then sleep
+                if self.hold_lease() and self.refresh_dirty() >= self.batch_size:
+                    continue
+            except Exception as e:
+                print(f"Error refreshing recommendations: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """
+        Starts the refresher thread in this process. The apps call it on each
+        request rather than at import: a thread started before a pre-fork
+        server (gunicorn --preload) forks would not exist in its workers.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._owner = self._new_owner()
+                self._catalog_version = None
+                self._thread = threading.Thread(target=self._run, name='recommendation-refresher', daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,181 @@
+# backend/result_cache.py - Content-addressed cache of resume analysis results
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Optional, Union
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def content_digest(source: Union[str, bytes, BinaryIO]) -> str:
+    """
+    SHA-256 of a path's contents, raw bytes or a seekable stream. Streams are
+    hashed in chunks and rewound to where they started.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray)):
+        digest.update(source)
+    elif isinstance(source, str):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+    else:
+        position = source.tell()
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+        source.seek(position)
+    return digest.hexdigest()
+
+def cache_key(source: Union[str, bytes, BinaryIO], version: str) -> str:
+    """SHA-256 of the uploaded bytes, scoped to the analysis version."""
+    return f"{version}:{content_digest(source)}"
+
+
+class ResumeResultCache:
+    """
+    Two-tier cache: an in-process LRU in front of a SQLite table. The SQLite
+    tier is trimmed by least-recent access once its stored results exceed
+    max_disk_bytes. Results are stored as JSON so callers always get a copy.
+
+    The cache never fails an analysis: if the file is locked for longer than
+    `timeout` or otherwise unusable, a lookup counts as a miss and a store is
+    skipped.
+    """
+
+    # Writes between exact size checks, which also count other processes' writes
+    EVICT_CHECK_EVERY = 100
+
+    def __init__(self, db_path: str, max_memory_entries: int = 256, max_disk_bytes: int = 64 * 1024 * 1024,
+                 timeout: float = 0.5):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.timeout = timeout
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = False
+        # Bytes stored on disk as of the last exact check, plus this process's writes since
+        self._disk_bytes = 0
+        self._writes = 0
+        try:
+            self._init_table()
+        except sqlite3.Error as e:
+            print(f"Resume result cache unavailable, retrying on next use: {e}")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=self.timeout)
+
+    def _init_table(self):
+        conn = self._connect()
+        try:
+            # WAL is a property of the file, so setting it once covers every later connection
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS resume_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_resume_cache_last_access ON resume_cache(last_access)')
+            conn.commit()
+            self._disk_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM resume_cache').fetchone()[0]
+        finally:
+            conn.close()
+        self._ready = True
+
+    def _remember(self, key: str, payload: str):
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[str]:
+        if not self._ready:
+            self._init_table()
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT result FROM resume_cache WHERE key = ?', (key,)).fetchone()
+            if row:
+                try:
+                    conn.execute('UPDATE resume_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+                    conn.commit()
+                except sqlite3.OperationalError:
+                    pass  # another writer holds the lock; the hit counts, its recency can wait
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+        if payload is None:
+            try:
+                payload = self._load(key)
+            except sqlite3.Error as e:
+                print(f"Resume result cache lookup failed, treating as a miss: {e}")
+                return None
+            if payload is None:
+                return None
+            self._remember(key, payload)
+        return json.loads(payload)
+
+    def put(self, key: str, result: dict):
+        payload = json.dumps(result)
+        self._remember(key, payload)
+        try:
+            self._store(key, payload)
+        except sqlite3.Error as e:
+            print(f"Resume result cache store failed, skipping: {e}")
+
+    def _store(self, key: str, payload: str):
+        if not self._ready:
+            self._init_table()
+        conn = self._connect()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO resume_cache (key, result, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, len(payload), time.time())
+            )
+            with self._lock:
+                self._disk_bytes += len(payload)
+                self._writes += 1
+                check = self._disk_bytes > self.max_disk_bytes or self._writes % self.EVICT_CHECK_EVERY == 0
+            if check:
+                self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM resume_cache').fetchone()[0]
+        if total > self.max_disk_bytes:
+            rows = conn.execute('SELECT key, size FROM resume_cache ORDER BY last_access').fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.max_disk_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            conn.executemany('DELETE FROM resume_cache WHERE key = ?', stale)
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM resume_cache')
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,52 @@
+# backend/schema.py - Idempotent schema changes that run at startup on SQLite and MySQL
+#
+# MySQL has no CREATE INDEX IF NOT EXISTS or ADD COLUMN IF NOT EXISTS, so
+# both are checked against information_schema first. Each store's
+# init_tables uses these, which lets an existing database be upgraded by
+# starting the app instead of re-running setup_database.sql.
+
+
+def is_mysql(placeholder: str) -> bool:
+    # The stores only know their driver by its parameter placeholder
+    return placeholder == '%s'
+
+def column_exists(cursor, mysql: bool, table: str, column: str) -> bool:
+    if mysql:
+        cursor.execute(
+            'SELECT 1 FROM information_schema.columns '
+            'WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1',
+            (table, column)
+        )
+        return cursor.fetchone() is not None
+    cursor.execute(f'PRAGMA table_info({table})')
+    return any(row[1] == column for row in cursor.fetchall())
+
+def ensure_column(cursor, mysql: bool, table: str, column: str, definition: str):
+    """ALTER TABLE table ADD COLUMN column definition, unless it is already there."""
+    if not column_exists(cursor, mysql, table, column):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+def ensure_index(cursor, mysql: bool, name: str, table: str, columns: str):
+    if not mysql:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})')
+        return
+    cursor.execute(
+        'SELECT 1 FROM information_schema.statistics '
+        'WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1',
+        (table, name)
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(f'CREATE INDEX {name} ON {table}({columns})')
+
+def run_migration(get_connection, migrate):
+    """Runs migrate(cursor) in its own transaction on a connection from get_connection."""
+    conn = get_connection()
+    if conn is None:
+        raise ConnectionError("Database connection failed")
+    cursor = conn.cursor()
+    try:
+        migrate(cursor)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,309 @@
+# backend/search.py - BM25 full-text search over the internship catalog
+
+import bisect
+import math
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from catalog import CatalogSnapshot, internship_skills, query_from_args
+from metrics import stage
+
+DEFAULT_PER_PAGE = 20
+
+# Searchable fields and how much a term occurrence in each one counts
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'company': 2.0,
+    'skills': 2.0,
+    'description': 1.0,
+    'responsibilities': 1.0,
+    'qualifications': 1.0,
+    'companyInfo': 1.0,
+}
+K1 = 1.2
+B = 0.75
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 50   # most frequent completions of a typed prefix that are scored
+STATS_DRIFT = 0.01           # recompute every term's weights once N or the average length moves this much
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it', 'of', 'on', 'or',
+    'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your'
+}
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    # Keeps "c++" and "c#" whole; "node.js" becomes "node", "js"
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+def _field_text(internship: dict, field: str) -> str:
+    if field == 'skills':
+        return ' '.join(internship_skills(internship))
+    value = internship.get(field)
+    if isinstance(value, list):
+        return ' '.join(str(item) for item in value)
+    return str(value) if value else ''
+
+def document_terms(internship: dict) -> Dict[str, float]:
+    """Field-weighted term frequencies for one posting."""
+    terms: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(_field_text(internship, field)):
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+class SearchIndex:
+    """
+    An inverted index over postings, keyed by posting id and updated in
+    place: syncing to a new catalog snapshot re-indexes only postings that
+    were added, changed or removed. Each posting gets a stable slot; a term's
+    postings are compiled to numpy arrays of slots and BM25 weights when first
+    queried, so scoring a query is one scatter-add per term and top-k is an
+    argpartition. Updates recompile the terms they touch that had been
+    queried before, so the first searches after a reload stay fast.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.last_sync: dict = {}
+        self._items: Dict[object, dict] = {}          # posting id -> posting, as indexed
+        self._slots: Dict[object, int] = {}           # posting id -> slot
+        self._ids: List[object] = []                  # slot -> posting id (None when free)
+        self._free: List[int] = []
+        self._doc_terms: List[Optional[Dict[str, float]]] = []
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._total_length = 0.0
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._stats: Optional[Tuple[int, float]] = None  # (postings, average length) behind compiled weights
+        self._stale: Set[str] = set()                    # compiled terms invalidated by the current update
+        self._vocabulary: List[str] = []              # sorted, for prefix lookups
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # --- Updates ---
+
+    def _add(self, posting_id, item: dict):
+        terms = document_terms(item)
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = posting_id
+            self._doc_terms[slot] = terms
+        else:
+            slot = len(self._ids)
+            self._ids.append(posting_id)
+            self._doc_terms.append(terms)
+            if slot >= len(self._lengths):
+                grown = np.zeros(max(16, 2 * len(self._lengths)), dtype=np.float64)
+                grown[:len(self._lengths)] = self._lengths
+                self._lengths = grown
+        length = sum(terms.values())
+        self._lengths[slot] = length
+        self._total_length += length
+        self._slots[posting_id] = slot
+        self._items[posting_id] = item
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            postings[slot] = frequency
+            self._invalidate(term)
+
+    def _invalidate(self, term: str):
+        if self._compiled.pop(term, None) is not None:
+            self._stale.add(term)
+
+    def _remove(self, posting_id):
+        slot = self._slots.pop(posting_id)
+        del self._items[posting_id]
+        for term in self._doc_terms[slot]:
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+            self._invalidate(term)
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0.0
+        self._ids[slot] = None
+        self._doc_terms[slot] = None
+        self._free.append(slot)
+
+    def update(self, items: Iterable[dict]) -> dict:
+        """
+        Makes the index match `items`: postings whose id is new are added,
+        postings that differ from the indexed version are re-indexed and ids
+        no longer present are dropped. Returns the counts.
+        """
+        started = time.perf_counter()
+        current = {item.get('id'): item for item in items if item.get('id') is not None}
+        added = updated = removed = 0
+        with self._lock:
+            for posting_id in [posting_id for posting_id in self._items if posting_id not in current]:
+                self._remove(posting_id)
+                removed += 1
+            for posting_id, item in current.items():
+                indexed = self._items.get(posting_id)
+                if indexed is None:
+                    self._add(posting_id, item)
+                    added += 1
+                elif indexed != item:
+                    self._remove(posting_id)
+                    self._add(posting_id, item)
+                    updated += 1
+                else:
+                    # Equal content; keep the new object so results come from the current snapshot
+                    self._items[posting_id] = item
+            self._refresh_compiled()
+        self.last_sync = {"added": added, "updated": updated, "removed": removed,
+                          "seconds": round(time.perf_counter() - started, 4)}
+        return self.last_sync
+
+    def sync(self, snapshot: CatalogSnapshot):
+        if self.snapshot is snapshot:
+            return
+        self.update(snapshot.internships)
+        self.snapshot = snapshot
+
+    # --- Queries ---
+
+    def _current_stats(self) -> Tuple[int, float]:
+        documents = len(self._slots)
+        return documents, (self._total_length / documents if documents else 0.0) or 1.0
+
+    def _refresh_compiled(self):
+        stale, self._stale = self._stale, set()
+        documents, average_length = self._current_stats()
+        if self._stats is not None:
+            old_documents, old_average = self._stats
+            if (abs(documents - old_documents) > STATS_DRIFT * old_documents or
+                    abs(average_length - old_average) > STATS_DRIFT * old_average):
+                stale.update(self._compiled)
+                self._compiled.clear()
+        self._stats = (documents, average_length)
+        for term in stale:
+            self._term_weights(term)
+
+    def _term_weights(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Slots containing term and each one's BM25 contribution."""
+        compiled = self._compiled.get(term)
+        if compiled is not None:
+            return compiled
+        postings = self._postings.get(term)
+        if not postings:
+            return None
+        if self._stats is None:
+            self._stats = self._current_stats()
+        documents, average_length = self._stats
+        slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+        frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+        idf = math.log(1 + (documents - len(slots) + 0.5) / (len(slots) + 0.5))
+        norm = K1 * (1 - B + B * self._lengths[slots] / average_length)
+        compiled = self._compiled[term] = (slots, idf * frequencies * (K1 + 1) / (frequencies + norm))
+        return compiled
+
+    def completions(self, prefix: str, limit: int = MAX_PREFIX_EXPANSIONS) -> List[str]:
+        """Indexed terms starting with prefix, most frequent first."""
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff', start)
+        terms = self._vocabulary[start:end]
+        if len(terms) > limit:
+            terms = sorted(terms, key=lambda term: -len(self._postings[term]))[:limit]
+        return terms
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, prefix: bool = False,
+               allowed_ids: Optional[Set] = None) -> Tuple[List[Tuple[dict, float]], int]:
+        """
+        Postings matching any query term, best BM25 score first, as
+        (posting, score) pairs for the requested page plus the total number of
+        matches. With prefix=True the last term also matches longer terms
+        ("pyt" -> python, pytorch), for search-as-you-type, unless the query
+        ends in whitespace: "pyt " means the user finished typing the word.
+        """
+        terms = tokenize(query)
+        typed = None
+        if prefix and terms and len(terms[-1]) >= MIN_PREFIX_LENGTH and not query[-1:].isspace():
+            typed = terms.pop()
+        terms = list(dict.fromkeys(terms))
+
+        with self._lock:
+            if not self._slots:
+                return [], 0
+            scores = np.zeros(len(self._ids), dtype=np.float64)
+            for term in terms:
+                weights = self._term_weights(term)
+                if weights is not None:
+                    scores[weights[0]] += weights[1]
+            if typed is not None:
+                # A document matching several completions counts its best one, not their sum
+                best = np.zeros(len(self._ids), dtype=np.float64)
+                for term in self.completions(typed):
+                    slots, weights = self._term_weights(term)
+                    best[slots] = np.maximum(best[slots], weights)
+                scores += best
+
+            if allowed_ids is not None:
+                mask = np.zeros(len(self._ids), dtype=bool)
+                mask[[self._slots[i] for i in allowed_ids if i in self._slots]] = True
+                scores[~mask] = 0.0
+            matched = np.flatnonzero(scores > 0)
+            total = len(matched)
+            wanted = min(offset + limit, total)
+            if wanted <= 0:
+                return [], total
+            if wanted < total:
+                matched = matched[np.argpartition(-scores[matched], wanted - 1)[:wanted]]
+            # Ties break on slot so pages are stable
+            ranked = matched[np.lexsort((matched, -scores[matched]))][offset:wanted]
+            return [(self._items[self._ids[slot]], float(scores[slot])) for slot in ranked], total
+
+
+_index = SearchIndex()
+_index_lock = threading.Lock()
+
+def get_search_index(snapshot: CatalogSnapshot) -> SearchIndex:
+    """
+    The shared index, brought up to date with this catalog snapshot. The
+    first call indexes every posting; after a reload only the postings that
+    changed are re-indexed. A request still holding the snapshot a reload
+    replaced gets the newer index rather than rolling it back.
+    """
+    if _index.snapshot is snapshot:
+        return _index
+    with _index_lock:
+        current = _index.snapshot
+        if current is not snapshot and (current is None or snapshot.loaded_at >= current.loaded_at):
+            _index.sync(snapshot)
+    return _index
+
+def search_from_args(snapshot: CatalogSnapshot, args) -> Tuple[List[dict], int]:
+    """
+    Runs /api/internships/search: `q`, optional `prefix`, the /api/internships
+    filters and page/per_page. Returns the page of postings, each with its
+    searchScore, and the total number of matches. Raises ValueError on bad
+    parameters.
+    """
+    # Not stripped: a trailing space tells prefix search the last word is complete
+    text = args.get('q') or ''
+    if not text.strip():
+        raise ValueError("q is required")
+    query = query_from_args(args) or {}
+    offset = query.pop('offset', 0)
+    limit = query.pop('limit', DEFAULT_PER_PAGE)
+    prefix = (args.get('prefix') or '').lower() in ('1', 'true', 'yes')
+
+    # The catalog filters narrow the candidates; ranking is by text alone
+    allowed_ids = {item.get('id') for item in snapshot.query(**query)[0]} if query else None
+    with stage('search'):
+        results, total = get_search_index(snapshot).search(text, limit=limit, offset=offset, prefix=prefix,
+                                                            allowed_ids=allowed_ids)
+    return [dict(item, searchScore=round(score, 4)) for item, score in results], total
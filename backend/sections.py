@@ -0,0 +1,83 @@
+# backend/sections.py - Rule-based resume section segmentation
+
+import re
+from typing import Dict, List
+
+# Bump when the rules change: cached analyses are keyed on it (see extractor.analysis_version)
+SEGMENTER_VERSION = '1'
+
+SECTIONS = ('header', 'education', 'experience', 'skills', 'projects', 'other')
+
+# Normalized heading line -> section. Headings that aren't one of the labeled
+# sections still end the previous section, so they map to 'other'.
+SECTION_HEADINGS = {
+    'education': ['education', 'educational background', 'academic background', 'academics', 'academic details',
+                  'academic qualifications', 'educational qualifications', 'qualifications',
+                  'education and training', 'education and certifications'],
+    'experience': ['experience', 'work experience', 'professional experience', 'relevant experience',
+                   'employment', 'employment history', 'work history', 'career history', 'internships',
+                   'internship', 'internship experience', 'experience and internships'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset', 'competencies',
+               'core competencies', 'technologies', 'tools', 'tools and technologies', 'technical proficiency',
+               'skills and tools', 'skills and interests'],
+    'projects': ['projects', 'academic projects', 'personal projects', 'key projects', 'major projects',
+                 'project experience', 'project work', 'projects undertaken'],
+    'other': ['summary', 'professional summary', 'career summary', 'objective', 'career objective', 'profile',
+              'about me', 'certifications', 'certificates', 'courses', 'coursework', 'relevant coursework',
+              'training', 'achievements', 'awards', 'honors', 'honours', 'awards and achievements', 'publications',
+              'languages', 'interests', 'hobbies', 'hobbies and interests', 'activities',
+              'extracurricular activities', 'extra curricular activities', 'positions of responsibility',
+              'leadership', 'volunteering', 'volunteer experience', 'references', 'declaration',
+              'personal details', 'personal information'],
+}
+_HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+MAX_HEADING_WORDS = 5
+# "Skills: Python, SQL" - a heading with its first line of content after it
+_INLINE_HEADING = re.compile(r'^\s*([^:|\-–—]{2,40}?)\s*[:|\-–—]\s*(\S.*)$')
+_NON_LETTERS = re.compile(r'[^a-z ]+')
+
+
+def _normalize(line: str) -> str:
+    line = _NON_LETTERS.sub(' ', line.lower().replace('&', ' and '))
+    return ' '.join(line.split())
+
+def heading_section(line: str):
+    """The section a heading line starts, or None for a content line."""
+    normalized = _normalize(line)
+    if not normalized or len(normalized.split()) > MAX_HEADING_WORDS:
+        return None
+    return _HEADING_SECTION.get(normalized)
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """
+    Splits resume text into labeled sections by its heading lines. Lines before
+    the first heading are the 'header' (name, contact details). A section that
+    appears more than once is joined. Returns an empty dict when no heading is
+    recognized, meaning callers should use the whole text.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = 'header'
+    found = False
+    for line in text.splitlines():
+        section = heading_section(line)
+        content = None
+        if section is None:
+            match = _INLINE_HEADING.match(line)
+            if match:
+                section = heading_section(match.group(1))
+                content = match.group(2)
+        if section is not None:
+            current = section
+            found = True
+            if content:
+                sections.setdefault(current, []).append(content)
+        elif line.strip():
+            sections.setdefault(current, []).append(line)
+    if not found:
+        return {}
+    return {section: '\n'.join(lines) for section, lines in sections.items()}
+
+def section_text(sections: Dict[str, str], text: str, section: str) -> str:
+    """One section's text, or the whole text when the resume has no such section."""
+    return sections.get(section) or text
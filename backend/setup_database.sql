@@ -26,10 +26,62 @@ CREATE TABLE IF NOT EXISTS users (
     special_support TEXT,
     document_readiness VARCHAR(255),
     contact_consent VARCHAR(255),
+    preference_tags TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
--- Create indexes for better performance
-CREATE INDEX idx_email ON users(email);
-CREATE INDEX idx_profile_complete ON users(profile_complete);
+-- Indexes (idx_email, idx_profile_complete and those of the tables below) are
+-- created by app.py on startup when missing: MySQL has no CREATE INDEX IF NOT
+-- EXISTS, and this script must stay safe to re-run on an existing database.
+
+-- Normalized copies of the comma-joined profile columns, kept in sync on every
+-- profile write (see profiles.py). app.py also creates these tables, their
+-- indexes and users.preference_tags on startup if they are missing, then
+-- backfills existing users, so older databases need no manual migration.
+CREATE TABLE IF NOT EXISTS user_skills (
+    user_id INT NOT NULL,
+    skill VARCHAR(255) NOT NULL,
+    skill_key VARCHAR(255) NOT NULL,
+    PRIMARY KEY (user_id, skill_key),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS user_preferences (
+    user_id INT NOT NULL,
+    field VARCHAR(64) NOT NULL,
+    value VARCHAR(255) NOT NULL,
+    value_key VARCHAR(255) NOT NULL,
+    PRIMARY KEY (user_id, field, value_key),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Precomputed recommendations: each user's top-N internships as JSON
+CREATE TABLE IF NOT EXISTS user_recommendations (
+    email VARCHAR(255) PRIMARY KEY,
+    catalog_version VARCHAR(64) NOT NULL,
+    items MEDIUMTEXT NOT NULL,
+    computed_at DOUBLE NOT NULL
+);
+
+-- Users whose recommendations need recomputing (written by profile updates)
+CREATE TABLE IF NOT EXISTS recommendation_dirty (
+    email VARCHAR(255) PRIMARY KEY,
+    marked_at DOUBLE NOT NULL
+);
+
+-- Lease deciding which app process runs the recommendation refresher
+CREATE TABLE IF NOT EXISTS recommendation_refresher (
+    name VARCHAR(64) PRIMARY KEY,
+    owner VARCHAR(255),
+    expires_at DOUBLE NOT NULL
+);
+INSERT IGNORE INTO recommendation_refresher (name, owner, expires_at) VALUES ('refresher', NULL, 0);
+
+-- Login sessions; only a SHA-256 digest of each bearer token is stored
+CREATE TABLE IF NOT EXISTS user_sessions (
+    token_hash CHAR(64) PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,
+    created_at DOUBLE NOT NULL,
+    expires_at DOUBLE NOT NULL
+);
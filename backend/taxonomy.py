@@ -0,0 +1,81 @@
+# backend/taxonomy.py - Versioned, hot-reloadable skill taxonomy
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+
+
+class SkillTaxonomy:
+    """
+    Canonical skill names plus their aliases, e.g. "k8s" -> "Kubernetes".
+    Lookups are a single dict access on the lowercased term.
+    """
+
+    def __init__(self, data: dict):
+        self.version = str(data.get('version', ''))
+        self.names: List[str] = []
+        self.terms: Dict[str, List[str]] = {}
+        self._canonical: Dict[str, str] = {}
+        for entry in data.get('skills', []):
+            # Entries may be a bare name or {"name": ..., "aliases": [...]}
+            name = entry if isinstance(entry, str) else entry['name']
+            aliases = [] if isinstance(entry, str) else entry.get('aliases', [])
+            if name.lower() in self._canonical:
+                continue
+            self.names.append(name)
+            self.terms[name] = [name] + [alias for alias in aliases if alias.lower() not in self._canonical]
+            for term in self.terms[name]:
+                self._canonical[term.lower()] = name
+        self.digest = hashlib.sha256(json.dumps(self.terms, sort_keys=True).encode()).hexdigest()[:16]
+
+    def canonical(self, term: str) -> Optional[str]:
+        return self._canonical.get(term.strip().lower())
+
+    def __len__(self):
+        return len(self.names)
+
+
+class TaxonomyLoader:
+    """
+    Loads the taxonomy file and reloads it when its mtime or size changes,
+    checking at most once per check_interval seconds. A file that fails to
+    parse is reported and the previous taxonomy stays in service.
+    """
+
+    def __init__(self, path: str = TAXONOMY_PATH, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._taxonomy: Optional[SkillTaxonomy] = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> SkillTaxonomy:
+        now = time.monotonic()
+        if self._taxonomy is not None and now - self._checked_at < self.check_interval:
+            return self._taxonomy
+        with self._lock:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._taxonomy = SkillTaxonomy(json.load(f))
+                    self._signature = signature
+                except (ValueError, KeyError) as e:
+                    if self._taxonomy is None:
+                        raise
+                    print(f"Error reloading skill taxonomy {self.path}: {e}")
+            self._checked_at = now
+            return self._taxonomy
+
+
+_loader = TaxonomyLoader()
+
+def get_taxonomy() -> SkillTaxonomy:
+    return _loader.current()
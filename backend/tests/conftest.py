@@ -0,0 +1,47 @@
+# backend/tests/conftest.py - Makes the flat backend modules importable and provides a throwaway app_sqlite
+import os
+import shutil
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope='session')
+def sqlite_app(tmp_path_factory):
+    """
+    app_sqlite imported in a scratch directory, so its database, uploads/ and
+    job files are throwaway. The working directory stays there for the
+    session because the pool opens the relative database path lazily.
+    """
+    workdir = tmp_path_factory.mktemp('app_sqlite')
+    shutil.copy(os.path.join(BACKEND_DIR, 'internships.json'), workdir)
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import app_sqlite
+        app_sqlite.app.config['PROPAGATE_EXCEPTIONS'] = False
+        yield app_sqlite
+    finally:
+        os.chdir(previous)
+
+@pytest.fixture
+def client(sqlite_app):
+    from admission import MemoryBucketStore
+
+    # Every test starts with full rate limit buckets
+    sqlite_app.admission.store = MemoryBucketStore()
+    return sqlite_app.app.test_client()
+
+@pytest.fixture
+def async_client(sqlite_app):
+    """app_async without its lifespan, so no analysis process pool is started."""
+    from admission import MemoryBucketStore
+    from starlette.testclient import TestClient
+
+    import app_async
+
+    sqlite_app.admission.store = MemoryBucketStore()
+    return TestClient(app_async.app)
@@ -0,0 +1,73 @@
+import pytest
+
+from admission import (AdmissionController, ConcurrencyLimit, MemoryBucketStore, OverloadedError, RateLimit,
+                       RateLimitedError, RequestTooLargeError, SQLiteBucketStore)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBucketStore()
+    return SQLiteBucketStore(str(tmp_path / "buckets.db"))
+
+def test_burst_then_refill(store):
+    limit = RateLimit(per_minute=60, burst=3)   # one token a second
+    assert [store.take("login:ip:1", limit, now=100.0) for _ in range(3)] == [0, 0, 0]
+    assert store.take("login:ip:1", limit, now=100.0) == pytest.approx(1.0)
+    assert store.take("login:ip:1", limit, now=100.5) == pytest.approx(0.5)
+    assert store.take("login:ip:1", limit, now=101.0) == 0
+
+def test_clients_have_separate_buckets(store):
+    limit = RateLimit(per_minute=60, burst=1)
+    assert store.take("login:ip:1", limit, now=0.0) == 0
+    assert store.take("login:ip:2", limit, now=0.0) == 0
+    assert store.take("login:ip:1", limit, now=0.0) > 0
+
+def test_refill_is_capped_at_burst(store):
+    limit = RateLimit(per_minute=60, burst=2)
+    store.take("k", limit, now=0.0)
+    results = [store.take("k", limit, now=3600.0) for _ in range(3)]
+    assert results[:2] == [0, 0] and results[2] > 0
+
+def test_memory_store_forgets_least_recent_clients():
+    store = MemoryBucketStore(max_keys=2)
+    limit = RateLimit(per_minute=1, burst=1)
+    for key in ("a", "b", "c"):
+        store.take(key, limit, now=0.0)
+    assert store.take("a", limit, now=0.0) == 0   # dropped, so full again
+    assert store.take("c", limit, now=0.0) > 0
+
+def test_concurrency_limit():
+    slots = ConcurrencyLimit(2, name='analysis')
+    assert slots.try_acquire() and slots.try_acquire()
+    assert not slots.try_acquire()
+    assert slots.in_flight == 2
+    slots.release()
+    assert slots.try_acquire()
+
+def test_controller_checks_size_rate_and_concurrency():
+    slots = ConcurrencyLimit(1, name='analysis')
+    controller = AdmissionController(
+        rate_limits={'login': RateLimit(per_minute=60, burst=1)},
+        concurrency={'upload': slots},
+        max_body_bytes={'upload': 100},
+    )
+    assert controller.admit('login', 'ip:1') is None
+    with pytest.raises(RateLimitedError) as rate_limited:
+        controller.admit('login', 'ip:1')
+    assert controller.rejection(rate_limited.value)[1:] == (429, {"Retry-After": "1"})
+
+    with pytest.raises(RequestTooLargeError):
+        controller.admit('upload', 'ip:1', content_length=101)
+    slot = controller.admit('upload', 'ip:1', content_length=100)
+    assert slot is slots
+    with pytest.raises(OverloadedError) as busy:
+        controller.admit('upload', 'ip:2')
+    assert controller.rejection(busy.value)[1] == 503
+    slot.release()
+    assert controller.stats() == {'analysis': {'limit': 1, 'in_flight': 0}}
+
+def test_disabled_controller_admits_everything():
+    controller = AdmissionController(rate_limits={'login': RateLimit(per_minute=1, burst=1)}, enabled=False)
+    for _ in range(5):
+        assert controller.admit('login', 'ip:1') is None
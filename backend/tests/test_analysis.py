@@ -0,0 +1,42 @@
+import spacy
+
+from extractor import extract_education, extract_email, extract_name, extract_phone
+from main import ALL_FIELDS, _build_resume_data
+
+TEXT = "Jane Doe\njane@example.com +1 555 123 4567\nStanford University, Acme Corp"
+
+
+def _doc():
+    # One Doc shared by every extractor, as analyze_resume builds it
+    nlp = spacy.blank('en')
+    ruler = nlp.add_pipe('entity_ruler')
+    ruler.add_patterns([
+        {"label": "PERSON", "pattern": "Jane Doe"},
+        {"label": "ORG", "pattern": "Stanford University"},
+        {"label": "ORG", "pattern": "Acme Corp"},
+    ])
+    return nlp(TEXT)
+
+def test_extractors_share_one_doc():
+    doc = _doc()
+    assert extract_name(doc) == 'Jane Doe'
+    assert extract_education(doc) == ['Stanford University']
+    assert extract_email(doc) == 'jane@example.com'
+    assert extract_phone(doc) == '+1 555 123 4567'
+
+def test_extractors_accept_merged_entities():
+    entities = [('ORG', 'Acme Corp'), ('PERSON', 'Jane Doe'), ('ORG', 'Stanford University')]
+    assert extract_name(entities) == 'Jane Doe'
+    assert extract_education(entities) == ['Stanford University']
+    assert extract_name([('ORG', 'Acme Corp')]) is None
+
+def test_build_resume_data_from_found_entities():
+    doc = _doc()
+    entities = [(ent.label_, ent.text) for ent in doc.ents]
+    data = _build_resume_data(TEXT, ALL_FIELDS, {'name': entities, 'education': entities}, skills=['Python'])
+    assert data == {
+        "name": 'Jane Doe',
+        "contact": {"email": 'jane@example.com', "phone": '+1 555 123 4567'},
+        "education": [{"university": 'Stanford University', "degree": None, "major": None}],
+        "skills": ['Python'],
+    }
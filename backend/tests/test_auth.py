@@ -0,0 +1,107 @@
+import hashlib
+import sqlite3
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from auth import PasswordHasher, SessionStore, bearer_token, is_password_hash
+
+FAST_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def connect(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    return lambda: sqlite3.connect(path)
+
+def _login(store, connect, email='jane@example.com'):
+    token, expires_at, sql, params = store.new_session(email)
+    conn = connect()
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+    store.remember(token, (email, expires_at))
+    return token
+
+def test_new_session_is_found(connect):
+    store = SessionStore(connect)
+    store.init_tables()
+    token = _login(store, connect)
+    assert store.email_for(token) == 'jane@example.com'
+    # Another process has an empty cache and reads the table
+    assert SessionStore(connect).email_for(token) == 'jane@example.com'
+    assert store.email_for('not-a-token') is None
+
+def test_only_a_digest_of_the_token_is_stored(connect):
+    store = SessionStore(connect)
+    store.init_tables()
+    token = _login(store, connect)
+    stored = connect().execute('SELECT token_hash FROM user_sessions').fetchone()[0]
+    assert stored == hashlib.sha256(token.encode()).hexdigest() != token
+
+def test_expired_session_is_rejected_and_purged(connect):
+    store = SessionStore(connect, ttl=-1)
+    store.init_tables()
+    token = _login(store, connect)
+    assert store.email_for(token) is None
+    assert SessionStore(connect).email_for(token) is None
+    assert store.purge_expired() == 1
+
+def test_revoke(connect):
+    store = SessionStore(connect)
+    store.init_tables()
+    token = _login(store, connect)
+    other = _login(store, connect)
+    store.revoke(token)
+    assert store.email_for(token) is None
+    assert SessionStore(connect).email_for(token) is None
+    assert store.email_for(other) == 'jane@example.com'
+
+def test_init_tables_is_idempotent(connect):
+    store = SessionStore(connect)
+    store.init_tables()
+    store.init_tables()
+
+def test_bearer_token():
+    assert bearer_token('Bearer abc') == 'abc'
+    assert bearer_token('Basic abc') is None
+    assert bearer_token(None) is None
+
+def test_legacy_sha256_hash_is_upgraded_on_login():
+    hasher = PasswordHasher(method=FAST_METHOD)
+    legacy = hashlib.sha256(b'secret123').hexdigest()
+    assert is_password_hash(legacy)
+    valid, new_hash = hasher.verify(legacy, 'secret123')
+    assert valid
+    assert new_hash.startswith(FAST_METHOD + '$')
+    assert hasher.verify(new_hash, 'secret123') == (True, None)
+
+def test_wrong_password_is_not_upgraded():
+    hasher = PasswordHasher(method=FAST_METHOD)
+    assert hasher.verify(hashlib.sha256(b'secret123').hexdigest(), 'wrong') == (False, None)
+
+def test_outdated_parameters_are_upgraded():
+    hasher = PasswordHasher(method=FAST_METHOD)
+    old = generate_password_hash('secret123', method='pbkdf2:sha256:500')
+    valid, new_hash = hasher.verify(old, 'secret123')
+    assert valid and new_hash.startswith(FAST_METHOD + '$')
+
+def test_is_password_hash():
+    assert is_password_hash(generate_password_hash('x', method=FAST_METHOD))
+    assert not is_password_hash('secret123')
+
+def test_unknown_tokens_do_not_evict_live_sessions(connect):
+    store = SessionStore(connect, cache_size=2, miss_cache_size=2)
+    store.init_tables()
+    tokens = [_login(store, connect, f'user{i}@example.com') for i in range(2)]
+    for i in range(50):
+        assert store.email_for(f'random-{i}') is None
+    for i, token in enumerate(tokens):
+        assert store.cached(token) == (True, f'user{i}@example.com')
+    # The most recent misses are cached, bounded by miss_cache_size
+    assert store.cached('random-49') == (True, None)
+    assert store.cached('random-0') == (False, None)
+
+@pytest.mark.parametrize('stored', ['foo$bar$baz', 'scrypt:x$salt$ab', 'scrypt:1:1:1$salt$zz', 'garbage', ''])
+def test_malformed_stored_hash_fails_verification(stored):
+    assert PasswordHasher(method=FAST_METHOD).verify(stored, 'secret123') == (False, None)
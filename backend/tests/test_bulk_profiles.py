@@ -0,0 +1,137 @@
+import hashlib
+import io
+import json
+import sqlite3
+
+import pytest
+
+from auth import PasswordHasher
+from bulk_profiles import PROFILE_COLUMNS, ImportReport, ProfileImporter, read_rows, validate_row
+from profiles import ProfileIndex
+from recommendations import RecommendationStore
+
+HASH = hashlib.sha256(b'secret123').hexdigest()
+
+
+def _row(**overrides):
+    row = {'name': 'Jane', 'email': 'jane@example.com', 'password_hash': HASH}
+    row.update(overrides)
+    return {key: value for key, value in row.items() if value is not None}
+
+def _jsonl(*lines) -> io.BytesIO:
+    return io.BytesIO('\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode())
+
+
+@pytest.mark.parametrize('row, error', [
+    (_row(name=None), "Missing required fields: name and email"),
+    (_row(email=''), "Missing required fields: name and email"),
+    (_row(email='not-an-email'), "Invalid email address"),
+    (_row(password='secret123'), "Exactly one of password or password_hash is required"),
+    (_row(password_hash=None), "Exactly one of password or password_hash is required"),
+    (_row(password_hash='plaintext'), "password_hash is not a supported hash format"),
+    (_row(profile_complete='maybe'), "profile_complete must be true or false"),
+    (_row(favourite_colour='blue'), "Unknown column(s): favourite_colour"),
+    (['Jane'], "Row must be an object"),
+])
+def test_validate_row_errors(row, error):
+    assert validate_row(row) == (None, error)
+
+def test_validate_row_cleans_values():
+    record, error = validate_row(_row(name='  Jane ', skills=['Python', ' SQL ', ''], profile_complete='yes'))
+    assert error is None
+    assert record['name'] == 'Jane'
+    assert record['skills'] == 'Python, SQL'
+    assert record['profile_complete'] is True
+    assert set(PROFILE_COLUMNS) <= set(record)
+
+def test_profile_complete_defaults_from_quiz_answers():
+    assert validate_row(_row(skills='Python'))[0]['profile_complete'] is False
+    assert validate_row(_row(internship_mode='Remote'))[0]['profile_complete'] is True
+
+def test_report_caps_listed_errors():
+    report = ImportReport(max_errors=1)
+    report.add_error(1, 'a@example.com', 'bad')
+    report.add_error(2, 'b@example.com', 'bad')
+    result = report.finish().to_dict()
+    assert result['failed'] == 2
+    assert len(result['errors']) == 1
+    assert result['errors_truncated']
+
+
+@pytest.fixture
+def connect(tmp_path):
+    path = str(tmp_path / "users.db")
+    connect = lambda: sqlite3.connect(path)
+    conn = connect()
+    conn.execute(f'''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            profile_complete BOOLEAN DEFAULT FALSE,
+            {', '.join(f'{column} TEXT' for column in PROFILE_COLUMNS)}
+        )
+    ''')
+    conn.execute("INSERT INTO users (name, email, password_hash) VALUES ('Old', 'old@example.com', 'x')")
+    conn.commit()
+    conn.close()
+    return connect
+
+def _importer(connect, hasher=None, chunk_size=500):
+    index = ProfileIndex()
+    index.init_tables(connect)
+    store = RecommendationStore(connect, catalog=None)
+    store.init_tables()
+    return ProfileImporter(connect, hasher, index, store, chunk_size=chunk_size)
+
+def test_import_reports_each_bad_row(connect):
+    stream = _jsonl(
+        _row(email='a@example.com', skills='Python, SQL'),
+        '{"name": "Broken"',
+        _row(email='a@example.com'),
+        _row(email='old@example.com'),
+        _row(email='b@example.com', password_hash=None, password='secret123'),
+        '',
+        _row(email='c@example.com', name=None),
+        _row(email='d@example.com'),
+    )
+    report = _importer(connect, chunk_size=2).import_rows(read_rows(stream, 'jsonl')).to_dict()
+
+    assert report['imported'] == 2
+    assert report['failed'] == 5
+    errors = {error['line']: error for error in report['errors']}
+    assert errors[2]['error'].startswith("Invalid JSON")
+    assert errors[2]['email'] is None
+    assert errors[3]['error'] == "Duplicate email in file"
+    assert errors[4] == {"line": 4, "email": 'old@example.com', "error": "User with this email already exists"}
+    assert errors[5]['error'].startswith("Plaintext passwords are only accepted by the command line import")
+    assert errors[7]['error'] == "Missing required fields: name and email"
+
+    conn = connect()
+    emails = {row[0] for row in conn.execute('SELECT email FROM users')}
+    assert emails == {'old@example.com', 'a@example.com', 'd@example.com'}
+    dirty = {row[0] for row in conn.execute('SELECT email FROM recommendation_dirty')}
+    assert dirty == {'a@example.com', 'd@example.com'}
+    skills = [row[0] for row in conn.execute('SELECT skill FROM user_skills ORDER BY skill')]
+    assert skills == ['Python', 'SQL']
+
+def test_csv_rows_with_extra_values_are_reported(connect):
+    stream = io.BytesIO(b'name,email,password_hash\n'
+                        b'Jane,jane@example.com,' + HASH.encode() + b'\n'
+                        b'Joe,joe@example.com,' + HASH.encode() + b',extra\n')
+    report = _importer(connect).import_rows(read_rows(stream, 'csv')).to_dict()
+    assert report['imported'] == 1
+    assert report['errors'] == [{"line": 3, "email": None, "error": "More values than header columns"}]
+
+def test_unknown_csv_header_rejects_the_file():
+    with pytest.raises(ValueError):
+        list(read_rows(io.BytesIO(b'name,email,favourite_colour\n'), 'csv'))
+
+def test_command_line_importer_hashes_plaintext_passwords(connect):
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000')
+    stream = _jsonl(_row(password_hash=None, password='secret123'))
+    report = _importer(connect, hasher=hasher).import_rows(read_rows(stream, 'jsonl'))
+    assert report.imported == 1
+    stored = connect().execute("SELECT password_hash FROM users WHERE email = 'jane@example.com'").fetchone()[0]
+    assert hasher.verify(stored, 'secret123') == (True, None)
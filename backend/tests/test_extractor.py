@@ -0,0 +1,41 @@
+import spacy
+
+from extractor import owned_entities, text_windows
+
+
+def _ruler_nlp():
+    nlp = spacy.blank('en')
+    ruler = nlp.add_pipe('entity_ruler')
+    ruler.add_patterns([{"label": "ORG", "pattern": "Acme Corp"}])
+    return nlp
+
+def test_short_text_is_one_window():
+    assert text_windows("short text", size=100, overlap=10) == [(0, 10, 0, 10)]
+
+def test_windows_cover_text_and_overlap():
+    text = " ".join(f"word{i}" for i in range(400))
+    windows = text_windows(text, size=300, overlap=40)
+    assert len(windows) > 1
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    for (_, end, _, _), (start, _, _, _) in zip(windows, windows[1:]):
+        assert start < end  # consecutive windows overlap
+
+def test_every_position_is_owned_once():
+    text = "\n".join(f"line number {i} of the resume" for i in range(300))
+    windows = text_windows(text, size=500, overlap=60)
+    assert windows[0][2] == 0 and windows[-1][3] == len(text)
+    for (_, _, _, own_end), (_, _, own_start, _) in zip(windows, windows[1:]):
+        assert own_end == own_start
+    for start, end, own_start, own_end in windows:
+        assert start <= own_start < own_end <= end
+
+def test_entity_in_an_overlap_is_counted_once():
+    nlp = _ruler_nlp()
+    text = ("filler " * 60) + "Acme Corp " + ("filler " * 60)
+    windows = text_windows(text, size=450, overlap=120)
+    # Two windows see the mention, only one owns it
+    assert sum('Acme Corp' in text[start:end] for start, end, _, _ in windows) == 2
+    found = []
+    for window in windows:
+        found.extend(owned_entities(nlp(text[window[0]:window[1]]), window))
+    assert found == [('ORG', 'Acme Corp')]
@@ -0,0 +1,43 @@
+import sqlite3
+import threading
+
+from jobs import QueueFullError, ResumeJobQueue
+
+
+def test_queue_starts_on_first_use(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = ResumeJobQueue(path, max_workers=1)
+    # Creating the queue starts no worker pool and touches no files
+    assert queue._executor is None
+    assert not (tmp_path / "jobs.db").exists()
+    assert queue.get('missing') is None
+    assert queue._executor is not None
+    executor = queue._executor
+    queue.pending_count()
+    assert queue._executor is executor
+    assert sqlite3.connect(path).execute('SELECT COUNT(*) FROM resume_jobs').fetchone()[0] == 0
+    queue._executor.shutdown()
+
+def test_concurrent_submits_respect_max_pending(tmp_path, monkeypatch):
+    queue = ResumeJobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=5)
+    queue.start()
+    monkeypatch.setattr(queue, '_dispatch', lambda job_id, filepath: None)
+    accepted, rejected = [], []
+    barrier = threading.Barrier(20)
+
+    def submit(i):
+        barrier.wait()
+        try:
+            accepted.append(queue.submit(f"/tmp/upload-{i}.pdf", f"{i}.pdf"))
+        except QueueFullError:
+            rejected.append(i)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(accepted) == 5 and len(rejected) == 15
+    assert queue.pending_count() == 5
+    assert queue.get(accepted[0])['status'] == 'running'
+    queue._executor.shutdown()
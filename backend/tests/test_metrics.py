@@ -0,0 +1,19 @@
+import logging
+
+from flask import Flask
+
+from metrics import instrument_app
+
+
+def test_slow_requests_are_logged(caplog):
+    app = Flask(__name__)
+    instrument_app(app, slow_request_seconds=0)
+
+    @app.route('/slow')
+    def slow():
+        return 'ok'
+
+    with caplog.at_level(logging.WARNING, logger='metrics'):
+        assert app.test_client().get('/slow').status_code == 200
+    [record] = [record for record in caplog.records if record.name == 'metrics']
+    assert record.getMessage().startswith('Slow request: GET /slow 200 took ')
@@ -0,0 +1,56 @@
+import io
+
+import docx
+
+from bench_resume import write_pdf
+from parser import _detect_type, extract_text_capped
+
+
+def _docx_bytes(paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+def _pdf_bytes(tmp_path, pages):
+    path = tmp_path / "resume.pdf"
+    write_pdf(pages, str(path))
+    return path.read_bytes()
+
+def test_extension_decides_type():
+    assert _detect_type(io.BytesIO(b'%PDF-1.4'), 'resume.DOCX') == 'docx'
+    assert _detect_type('/uploads/resume.pdf', None) == 'pdf'
+    assert _detect_type('/uploads/resume.txt', None) is None
+
+def test_magic_bytes_sniffed_without_extension(tmp_path):
+    # Sniffed from the current position, which is left where it was
+    pdf = io.BytesIO(b'---' + _pdf_bytes(tmp_path, [["Jane Doe"]]))
+    pdf.seek(3)
+    assert _detect_type(pdf, None) == 'pdf'
+    assert pdf.tell() == 3
+    assert _detect_type(io.BytesIO(_docx_bytes(["Jane Doe"])), 'upload') == 'docx'
+    assert _detect_type(io.BytesIO(b'plain text'), None) is None
+
+def test_unsniffable_upload_extracts_nothing():
+    assert extract_text_capped(b'plain text resume', 'upload') == ("", [])
+
+def test_capped_extraction_under_the_caps(tmp_path):
+    text, truncated_by = extract_text_capped(_pdf_bytes(tmp_path, [["Jane Doe"], ["Python"]]), max_pages=5,
+                                             max_chars=1000)
+    assert "Jane Doe" in text and "Python" in text
+    assert truncated_by == []
+
+def test_page_cap(tmp_path):
+    pages = [[f"Page {number}"] for number in range(1, 6)]
+    text, truncated_by = extract_text_capped(_pdf_bytes(tmp_path, pages), 'resume.pdf', max_pages=2)
+    assert "Page 2" in text and "Page 3" not in text
+    assert truncated_by == ['pages']
+
+def test_char_cap():
+    source = _docx_bytes([f"Paragraph {number} " + "x" * 50 for number in range(100)])
+    text, truncated_by = extract_text_capped(source, 'resume.docx', max_chars=300)
+    assert len(text) == 300
+    assert text.startswith("Paragraph 0 ")
+    assert truncated_by == ['chars']
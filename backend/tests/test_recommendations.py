@@ -0,0 +1,65 @@
+import os
+import sqlite3
+
+import pytest
+
+from catalog import InternshipCatalog
+from db_pool import SQLiteConnectionPool
+from recommendations import RecommendationStore
+
+INTERNSHIPS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'internships.json')
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return SQLiteConnectionPool(str(tmp_path / "recommendations.db"), pool_size=2, timeout=0.1)
+
+@pytest.fixture
+def store(pool):
+    store = RecommendationStore(pool.get_connection, InternshipCatalog(INTERNSHIPS))
+    store.init_tables()
+    return store
+
+def test_failed_refresh_returns_its_connection(pool, store):
+    # No users table, so the profile query fails
+    for _ in range(pool.pool_size + 1):
+        with pytest.raises(sqlite3.OperationalError):
+            store.refresh_users(['jane@example.com'])
+    assert pool.metrics.snapshot()['in_use'] == 0
+
+def test_refresh_and_get(pool, store):
+    with pool.get_connection() as conn:
+        conn.execute('CREATE TABLE users (email TEXT, skills TEXT, internship_mode TEXT, '
+                     'preferred_industries TEXT, stipend_requirement TEXT)')
+        conn.execute("INSERT INTO users VALUES ('jane@example.com', 'Python, SQL', 'Remote', NULL, NULL)")
+        conn.commit()
+    assert store.get('jane@example.com') is None
+    assert store.refresh_users(['jane@example.com', 'nobody@example.com']) == 1
+    stored = store.get('jane@example.com', k=3)
+    assert 0 < len(stored) <= 3
+    assert all('matchScore' in item for item in stored)
+    assert pool.metrics.snapshot()['in_use'] == 0
+
+def test_one_store_holds_the_refresher_lease(pool, store):
+    other = RecommendationStore(pool.get_connection, store.catalog)
+    other.init_tables()
+    assert store.hold_lease()
+    assert store.hold_lease()  # renewing
+    assert not other.hold_lease()
+    store.lease_seconds = -1  # the holder stops renewing in time
+    assert store.hold_lease()
+    assert other.hold_lease()
+    assert not store.hold_lease()
+
+def test_refresher_starts_once_per_process(store):
+    assert store._thread is None
+    store.interval = 60
+    store.start()
+    first = store._thread
+    store.start()
+    assert store._thread is first and first.is_alive()
+    # As in a forked worker, where the parent's thread does not exist
+    store._pid = -1
+    store.start()
+    assert store._thread is not first and store._thread.is_alive()
+    store.stop()
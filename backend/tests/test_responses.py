@@ -0,0 +1,18 @@
+import pytest
+
+from responses import SUMMARY_FIELDS, parse_fields, select_fields
+
+
+def test_parse_fields_expands_named_sets_in_order():
+    expected = ('title',) + tuple(field for field in SUMMARY_FIELDS if field != 'title')
+    assert parse_fields('title,summary', {'id', 'title'}) == expected
+    assert parse_fields('', {'id'}) is None
+
+def test_parse_fields_rejects_unknown_names():
+    with pytest.raises(ValueError, match='nope'):
+        parse_fields('id,nope', {'id'})
+
+def test_selected_objects_share_one_shape():
+    items = [{"id": 1, "title": "A", "logo": "a.png"}, {"id": 2, "title": "B"}]
+    selected = select_fields(items, ('id', 'logo'))
+    assert selected == [{"id": 1, "logo": "a.png"}, {"id": 2, "logo": None}]
@@ -0,0 +1,79 @@
+import io
+import sqlite3
+
+from result_cache import ResumeResultCache, cache_key, content_digest
+
+
+def test_digest_is_the_same_for_path_bytes_and_stream(tmp_path):
+    data = b"%PDF-1.4 resume bytes" * 1000
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(data)
+    assert content_digest(str(path)) == content_digest(data) == content_digest(io.BytesIO(data))
+
+def test_stream_is_rewound_to_where_it_started():
+    stream = io.BytesIO(b"header|body")
+    stream.seek(7)
+    digest = content_digest(stream)
+    assert stream.tell() == 7
+    assert digest == content_digest(b"body")
+    assert stream.read() == b"body"
+
+def test_key_is_scoped_to_analysis_version():
+    assert cache_key(b"resume", "v1") != cache_key(b"resume", "v2")
+    assert cache_key(b"resume", "v1").startswith("v1:")
+
+def test_results_survive_a_new_instance(tmp_path):
+    db = str(tmp_path / "cache.db")
+    ResumeResultCache(db).put("k", {"name": "Jane", "skills": ["Python"]})
+    assert ResumeResultCache(db).get("k") == {"name": "Jane", "skills": ["Python"]}
+    assert ResumeResultCache(db).get("missing") is None
+
+def test_callers_get_a_copy(tmp_path):
+    cache = ResumeResultCache(str(tmp_path / "cache.db"))
+    cache.put("k", {"skills": ["Python"]})
+    cache.get("k")["skills"].append("SQL")
+    assert cache.get("k") == {"skills": ["Python"]}
+
+def test_disk_tier_drops_least_recently_used(tmp_path):
+    cache = ResumeResultCache(str(tmp_path / "cache.db"), max_memory_entries=1, max_disk_bytes=100)
+    cache.put("old", {"text": "a" * 40})
+    cache.put("new", {"text": "b" * 40})
+    cache.put("newest", {"text": "c" * 40})
+    fresh = ResumeResultCache(cache.db_path)
+    assert fresh.get("old") is None
+    assert fresh.get("newest") == {"text": "c" * 40}
+
+def test_locked_database_does_not_fail_callers(tmp_path):
+    db = str(tmp_path / "cache.db")
+    ResumeResultCache(db).put("k", {"name": "Jane"})
+    writer = sqlite3.connect(db)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        cache = ResumeResultCache(db, timeout=0.01)
+        assert cache.get("k") == {"name": "Jane"}  # reads still work under WAL
+        cache.put("other", {"name": "Joe"})        # the store is skipped
+        assert cache.get("other") == {"name": "Joe"}
+    finally:
+        writer.rollback()
+        writer.close()
+    assert ResumeResultCache(db).get("other") is None
+
+def test_unreadable_database_counts_as_a_miss(tmp_path):
+    path = tmp_path / "cache.db"
+    path.write_bytes(b"not a database" * 100)
+    cache = ResumeResultCache(str(path))
+    assert cache.get("k") is None
+    cache.put("k", {"name": "Jane"})
+    assert cache.get("k") == {"name": "Jane"}  # still served from memory
+
+def test_size_is_checked_only_when_needed(tmp_path, monkeypatch):
+    cache = ResumeResultCache(str(tmp_path / "cache.db"), max_disk_bytes=10_000)
+    checks = []
+    evict = cache._evict
+    monkeypatch.setattr(cache, '_evict', lambda conn: checks.append(1) or evict(conn))
+    for i in range(cache.EVICT_CHECK_EVERY - 1):
+        cache.put(f"k{i}", {"n": i})
+    assert checks == []
+    cache.put("big", {"text": "x" * 10_000})
+    assert checks == [1]
+    assert cache._disk_bytes <= cache.max_disk_bytes
@@ -0,0 +1,117 @@
+import asyncio
+
+from admission import MemoryBucketStore
+from responses import SUMMARY_FIELDS
+
+
+def _pool_in_use(app_module):
+    return app_module.db_pool.metrics.snapshot()['in_use']
+
+
+def test_failed_request_returns_its_connection(sqlite_app, client):
+    # A dict email makes the SELECT raise; every connection must still go back
+    for _ in range(sqlite_app.db_pool.pool_size):
+        response = client.post('/api/login', json={"email": {"x": 1}, "password": "pw"})
+        assert response.status_code == 500
+    assert _pool_in_use(sqlite_app) == 0
+    sqlite_app.admission.store = MemoryBucketStore()  # the loop used up the login burst
+    response = client.post('/api/login', json={"email": "nobody@example.com", "password": "pw"})
+    assert response.status_code == 401
+    assert _pool_in_use(sqlite_app) == 0
+
+def test_unknown_bearer_token_is_rejected(client):
+    response = client.get('/api/internships', headers={"Authorization": "Bearer not-a-session"})
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "Invalid or expired token"}
+    response = client.get('/api/internships', headers={"Authorization": "Basic abc"})
+    assert response.status_code == 401
+
+def test_rate_limited_requests_get_retry_after(client):
+    for _ in range(10):  # the login burst
+        assert client.post('/api/login', json={}).status_code == 400
+    response = client.post('/api/login', json={})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+def test_busy_analysis_gets_retry_after(sqlite_app, client):
+    slots = sqlite_app.analysis_slots
+    taken = 0
+    while slots.try_acquire():
+        taken += 1
+    try:
+        response = client.post('/api/resume/upload', data={})
+    finally:
+        for _ in range(taken):
+            slots.release()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(sqlite_app.app.config['ANALYSIS_RETRY_AFTER'])
+
+def test_exhausted_pool_gets_retry_after(sqlite_app, client):
+    pool = sqlite_app.db_pool
+    held = [pool.get_connection() for _ in range(pool.pool_size)]
+    timeout, pool.timeout = pool.timeout, 0.05
+    try:
+        response = client.post('/api/login', json={"email": "jane@example.com", "password": "pw"})
+    finally:
+        pool.timeout = timeout
+        for conn in held:
+            conn.close()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+def test_oversized_body_is_rejected_before_reading(sqlite_app, client):
+    limit = sqlite_app.app.config['MAX_BODY_BYTES']['login']
+    response = client.post('/api/login', data=b'x' * (limit + 1), content_type='application/json')
+    assert response.status_code == 413
+
+def test_malformed_stored_hash_is_invalid_credentials(sqlite_app, client):
+    with sqlite_app.get_db_connection() as conn:
+        conn.execute("INSERT OR REPLACE INTO users (name, email, password_hash) "
+                     "VALUES ('Broken', 'broken@example.com', 'foo$bar$baz')")
+        conn.commit()
+    response = client.post('/api/login', json={"email": "broken@example.com", "password": "pw"})
+    assert response.status_code == 401
+
+def _login(client, email):
+    client.post('/api/signup', json={"name": "Jane", "email": email, "password": "pw"})
+    response = client.post('/api/login', json={"email": email, "password": "pw"})
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+def test_async_body_errors_match_flask(client, async_client):
+    headers = _login(client, 'async-body@example.com')
+    for path, method in (('/api/profile', 'put'), ('/api/quiz/submit', 'post')):
+        for body, content_type, status in ((None, None, 415), (b'{bad', 'application/json', 400),
+                                           (b'', 'application/json', 400)):
+            kwargs = {"data": body} if body is not None else {}
+            flask_response = getattr(client, method)(
+                path, headers=headers, content_type=content_type, **kwargs)
+            async_headers = dict(headers, **({"Content-Type": content_type} if content_type else {}))
+            async_response = async_client.request(method.upper(), path, headers=async_headers, content=body)
+            assert flask_response.status_code == async_response.status_code == status
+
+def test_async_app_takes_shared_buckets_off_the_event_loop(sqlite_app, async_client):
+    class RecordingStore(MemoryBucketStore):
+        blocking = True
+        on_loop = []
+
+        def take(self, key, limit, now=None):
+            try:
+                asyncio.get_running_loop()
+                self.on_loop.append(True)
+            except RuntimeError:
+                self.on_loop.append(False)
+            return super().take(key, limit, now)
+
+    sqlite_app.admission.store = RecordingStore()
+    assert async_client.post('/api/login', json={}).status_code == 400
+    assert RecordingStore.on_loop == [False]
+
+def test_fields_projection_returns_only_requested_fields(client):
+    headers = _login(client, 'fields@example.com')
+    response = client.get('/api/internships?fields=id,title', headers=headers)
+    assert response.status_code == 200
+    items = response.get_json()
+    assert items and all(list(item) == ['id', 'title'] for item in items)
+    response = client.get('/api/internships?fields=summary', headers=headers)
+    assert all(list(item) == list(SUMMARY_FIELDS) for item in response.get_json())
+    assert client.get('/api/internships?fields=id,nope', headers=headers).status_code == 400
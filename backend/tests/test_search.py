@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+
+import search
+from catalog import CatalogSnapshot
+from search import SearchIndex, get_search_index, tokenize
+
+POSTINGS = [
+    {"id": 1, "title": "Python Developer Intern", "company": "Acme", "description": "Build APIs in Python."},
+    {"id": 2, "title": "Data Analyst Intern", "company": "Globex", "description": "SQL dashboards and Python."},
+    {"id": 3, "title": "Graphic Design Intern", "company": "Initech", "description": "Posters and branding."},
+]
+
+
+def _ids(results):
+    return [posting['id'] for posting, _ in results]
+
+def _index(items=POSTINGS):
+    index = SearchIndex()
+    index.update(items)
+    return index
+
+def test_tokenize_keeps_language_names_and_drops_stop_words():
+    assert tokenize("The C++ and C# developer for Node.js") == ['c++', 'c#', 'developer', 'node', 'js']
+
+def test_title_match_ranks_first():
+    results, total = _index().search("python")
+    assert total == 2
+    assert _ids(results) == [1, 2]
+    assert results[0][1] > results[1][1] > 0
+
+def test_no_match():
+    assert _index().search("kubernetes") == ([], 0)
+
+def test_paging_and_allowed_ids():
+    index = _index()
+    results, total = index.search("intern", limit=1, offset=1)
+    assert total == 3 and len(results) == 1
+    results, total = index.search("python", allowed_ids={2})
+    assert (_ids(results), total) == ([2], 1)
+
+def test_prefix_matches_the_word_being_typed():
+    index = _index()
+    assert _ids(index.search("pyt", prefix=True)[0]) == [1, 2]
+    assert index.search("pyt ", prefix=True) == ([], 0)
+    assert index.search("pyt") == ([], 0)
+
+def test_update_reindexes_only_what_changed():
+    index = _index()
+    index.search("branding")  # compile the term before it changes
+    edited = dict(POSTINGS[2], description="Posters, branding and Figma.")
+    added = {"id": 4, "title": "Figma Intern", "company": "Hooli"}
+    counts = index.update([POSTINGS[0], POSTINGS[1], edited, added])
+    assert (counts['added'], counts['updated'], counts['removed']) == (1, 1, 0)
+    assert _ids(index.search("figma")[0]) == [4, 3]
+    assert _ids(index.search("branding")[0]) == [3]
+
+    counts = index.update([POSTINGS[0], added])
+    assert (counts['added'], counts['updated'], counts['removed']) == (0, 0, 2)
+    assert len(index) == 2
+    assert index.search("sql") == ([], 0)
+    assert _ids(index.search("python")[0]) == [1]
+
+def test_update_matches_a_fresh_build():
+    index = _index()
+    changed = [dict(POSTINGS[0], title="Senior Python Intern"), POSTINGS[2]]
+    index.update(changed)
+    fresh = _index(changed)
+    for query in ("python", "intern", "branding"):
+        assert index.search(query) == fresh.search(query)
+
+def test_concurrent_callers_sync_a_snapshot_once(monkeypatch):
+    index = SearchIndex()
+    updates = []
+    update = index.update
+
+    def slow_update(items):
+        updates.append(1)
+        time.sleep(0.05)
+        return update(items)
+
+    monkeypatch.setattr(index, 'update', slow_update)
+    monkeypatch.setattr(search, '_index', index)
+    snapshot = CatalogSnapshot(json.dumps(POSTINGS).encode(), 1.0)
+    threads = [threading.Thread(target=get_search_index, args=(snapshot,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(updates) == 1
+
+def test_stale_snapshot_does_not_roll_the_index_back(monkeypatch):
+    monkeypatch.setattr(search, '_index', SearchIndex())
+    old = CatalogSnapshot(json.dumps(POSTINGS).encode(), 2.0)
+    new = CatalogSnapshot(json.dumps(POSTINGS[:1]).encode(), 1.0)  # reloaded later, older mtime
+    get_search_index(new)
+    index = get_search_index(old)
+    assert index.snapshot is new
+    assert _ids(index.search("intern")[0]) == [1]
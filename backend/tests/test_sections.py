@@ -0,0 +1,49 @@
+from sections import heading_section, section_text, segment_resume
+
+RESUME = """Jane Doe
+jane@example.com | +91 98765 43210
+
+EDUCATION
+B.Tech, Indian Institute of Technology Delhi
+
+Work Experience
+Intern at Acme Corp
+
+Skills: Python, SQL
+Docker
+
+Education & Training
+Coursera Machine Learning
+"""
+
+
+def test_heading_section_matches_normalized_headings():
+    assert heading_section('EDUCATION') == 'education'
+    assert heading_section('  Work Experience:') == 'experience'
+    assert heading_section('Hobbies & Interests') == 'other'
+    assert heading_section('Built a Python service for five teams') is None
+    assert heading_section('') is None
+
+def test_segment_resume_splits_on_headings():
+    sections = segment_resume(RESUME)
+    assert sections['header'] == "Jane Doe\njane@example.com | +91 98765 43210"
+    assert sections['experience'] == "Intern at Acme Corp"
+
+def test_inline_heading_keeps_its_content():
+    assert segment_resume(RESUME)['skills'] == "Python, SQL\nDocker"
+
+def test_repeated_section_is_joined():
+    assert segment_resume(RESUME)['education'] == (
+        "B.Tech, Indian Institute of Technology Delhi\nCoursera Machine Learning"
+    )
+
+def test_text_without_headings_is_not_segmented():
+    text = "Jane Doe\nPython developer with three years of experience"
+    sections = segment_resume(text)
+    assert sections == {}
+    assert section_text(sections, text, 'education') == text
+
+def test_section_text_falls_back_to_whole_text():
+    sections = segment_resume(RESUME)
+    assert section_text(sections, RESUME, 'projects') == RESUME
+    assert section_text(sections, RESUME, 'experience') == "Intern at Acme Corp"
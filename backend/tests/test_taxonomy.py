@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from taxonomy import SkillTaxonomy, TaxonomyLoader
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+def test_aliases_resolve_to_canonical_name():
+    taxonomy = SkillTaxonomy({"version": "1", "skills": [
+        "Python",
+        {"name": "Kubernetes", "aliases": ["k8s", "kube"]},
+    ]})
+    assert taxonomy.canonical("K8S") == "Kubernetes"
+    assert taxonomy.canonical(" python ") == "Python"
+    assert taxonomy.canonical("docker") is None
+    assert len(taxonomy) == 2
+
+def test_first_entry_wins_on_duplicates():
+    taxonomy = SkillTaxonomy({"skills": [
+        {"name": "JavaScript", "aliases": ["js"]},
+        {"name": "javascript"},
+        {"name": "JSON", "aliases": ["js"]},
+    ]})
+    assert taxonomy.names == ["JavaScript", "JSON"]
+    assert taxonomy.canonical("js") == "JavaScript"
+    assert taxonomy.terms["JSON"] == ["JSON"]
+
+def test_digest_follows_content():
+    a = SkillTaxonomy({"skills": ["Python"]})
+    b = SkillTaxonomy({"skills": ["Python"]})
+    c = SkillTaxonomy({"skills": [{"name": "Python", "aliases": ["py"]}]})
+    assert a.digest == b.digest != c.digest
+
+def test_loader_reloads_changed_file(tmp_path):
+    path = tmp_path / "skills.json"
+    _write(path, {"version": "1", "skills": ["Python"]})
+    loader = TaxonomyLoader(str(path), check_interval=0)
+    assert loader.current().version == "1"
+    _write(path, {"version": "2", "skills": ["Python", {"name": "Kubernetes", "aliases": ["k8s"]}]})
+    taxonomy = loader.current()
+    assert taxonomy.version == "2"
+    assert taxonomy.canonical("k8s") == "Kubernetes"
+
+def test_loader_keeps_previous_taxonomy_on_bad_file(tmp_path):
+    path = tmp_path / "skills.json"
+    _write(path, {"version": "1", "skills": ["Python"]})
+    loader = TaxonomyLoader(str(path), check_interval=0)
+    loader.current()
+    path.write_text('{"version": "2", "skills": [', encoding='utf-8')
+    assert loader.current().version == "1"
+
+def test_loader_raises_when_first_load_fails(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text('not json', encoding='utf-8')
+    with pytest.raises(ValueError):
+        TaxonomyLoader(str(path), check_interval=0).current()
@@ -30,14 +30,15 @@ export default function OnboardingModal({ show, onComplete, onSkip }) {
         uploadData.append('resume', resumeFile);
         try {
             const token = localStorage.getItem('authToken');
-            const response = await fetch('http://127.0.0.1:5001/api/resume/upload', {
+            // Autofill only needs skills, which skips the slower name/education NER
+            const response = await fetch('http://127.0.0.1:5001/api/resume/upload?fields=skills', {
                 method: 'POST',
                 headers: { 'Authorization': `Bearer ${token}` },
                 body: uploadData,
             });
             const data = await response.json();
             if (!response.ok) throw new Error(data.error || "Failed to scan resume.");
-            setFormData(prev => ({ ...prev, skills: data.extracted_skills.join(', ') }));
+            setFormData(prev => ({ ...prev, skills: data.skills.join(', ') }));
         } catch (err) { setError(err.message); } finally { setIsUploading(false); }
     };
     